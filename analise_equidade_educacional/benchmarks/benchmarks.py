@@ -0,0 +1,200 @@
+import sys
+import pickle
+import shutil
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from data_processing.data_processor import DataProcessor, create_sample_data
+
+SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+XLSX_MAX_ROWS = 100_000
+
+def _clean_sample(n_students):
+
+    data_processor = DataProcessor("benchmark.xlsx")
+    data_processor.raw_data = create_sample_data(n_students)
+    return data_processor.clean_data()
+
+class DataLoading:
+
+    params = [SIZES]
+    param_names = ['n_alunos']
+
+    def setup(self, n_students):
+
+        self.tmp_dir = Path(tempfile.mkdtemp())
+
+        self.checkpoint_path = self.tmp_dir / "dados.pkl"
+        with open(self.checkpoint_path, 'wb') as f:
+            pickle.dump(create_sample_data(n_students), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def teardown(self, n_students):
+
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def time_load_cached(self, n_students):
+
+        with open(self.checkpoint_path, 'rb') as f:
+            pickle.load(f)
+
+class XlsxLoading:
+
+    params = [SIZES]
+    param_names = ['n_alunos']
+
+    def setup(self, n_students):
+
+        if n_students > XLSX_MAX_ROWS:
+            raise NotImplementedError("xlsx limitado a 100 mil linhas")
+
+        self.tmp_dir = Path(tempfile.mkdtemp())
+        self.xlsx_path = self.tmp_dir / "dados.xlsx"
+        create_sample_data(n_students).to_excel(self.xlsx_path, index=False)
+
+    def teardown(self, n_students):
+
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def time_load_xlsx(self, n_students):
+
+        DataProcessor(str(self.xlsx_path)).load_data()
+
+class DataCleaning:
+
+    params = [SIZES]
+    param_names = ['n_alunos']
+
+    def setup(self, n_students):
+
+        self.raw_data = create_sample_data(n_students)
+
+    def time_clean_data(self, n_students):
+
+        data_processor = DataProcessor("benchmark.xlsx")
+        data_processor.raw_data = self.raw_data
+        data_processor.clean_data()
+
+    def peakmem_clean_data(self, n_students):
+
+        self.time_clean_data(n_students)
+
+class Hypotheses:
+
+    params = [SIZES]
+    param_names = ['n_alunos']
+
+    def setup(self, n_students):
+
+        from analysis.hypothesis_tester import HypothesisTester
+
+        self.tester_class = HypothesisTester
+        self.data = _clean_sample(n_students)
+
+    def _tester(self):
+
+        return self.tester_class(self.data)
+
+    def time_hypothesis_1(self, n_students):
+
+        self._tester().test_hypothesis_1_segregation()
+
+    def time_hypothesis_2(self, n_students):
+
+        self._tester().test_hypothesis_2_teacher_quality()
+
+    def time_hypothesis_3(self, n_students):
+
+        self._tester().test_hypothesis_3_cultural_capital()
+
+    def time_hypothesis_4(self, n_students):
+
+        self._tester().test_hypothesis_4_peer_effect()
+
+    def peakmem_run_all_tests(self, n_students):
+
+        self._tester().run_all_tests()
+
+class Figures:
+
+    params = [SIZES, ['overview_dashboard', 'hypothesis_1', 'hypothesis_2', 'hypothesis_3',
+                      'hypothesis_4', 'statistical_summary', 'school_minority_ranking']]
+    param_names = ['n_alunos', 'figura']
+
+    def setup(self, n_students, figure):
+
+        from analysis.hypothesis_tester import HypothesisTester
+        from visualization.visualizer import Visualizer
+
+        data = _clean_sample(n_students)
+        self.visualizer = Visualizer(data, HypothesisTester(data).run_all_tests(), scatter_mode='auto',
+                                     aggregate_traces=True, max_cached_figures=0)
+
+    def time_build_figure(self, n_students, figure):
+
+        self.visualizer.get_figure(figure)
+
+class FigureExport:
+
+    params = [SIZES]
+    param_names = ['n_alunos']
+
+    def setup(self, n_students):
+
+        from analysis.hypothesis_tester import HypothesisTester
+        from visualization.visualizer import Visualizer
+
+        data = _clean_sample(n_students)
+        self.visualizer = Visualizer(data, HypothesisTester(data).run_all_tests(), scatter_mode='auto',
+                                     aggregate_traces=True)
+        self.output_dir = tempfile.mkdtemp()
+
+    def teardown(self, n_students):
+
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    def time_save_all_figures(self, n_students):
+
+        self.visualizer.save_all_figures(self.output_dir, mode='shared', combined=True,
+                                         names=self.visualizer.available_figures())
+
+class Presentation:
+
+    params = [SIZES]
+    param_names = ['n_alunos']
+
+    def setup(self, n_students):
+
+        from analysis.hypothesis_tester import HypothesisTester
+
+        self.data = _clean_sample(n_students)
+        self.results = HypothesisTester(self.data).run_all_tests()
+
+    def time_create_presentation(self, n_students):
+
+        from reporting.powerpoint_reporter import PowerPointReporter
+
+        PowerPointReporter(self.data, self.results).create_presentation()
+
+class Startup:
+
+    params = [['main.py --help', 'data_processing.data_processor', 'analysis.hypothesis_tester',
+               'visualization.visualizer', 'reporting.powerpoint_reporter']]
+    param_names = ['alvo']
+
+    def setup(self, target):
+
+        from import_time import PROJECT_DIR, measure_imports
+
+        if target.endswith('.py') or ' ' in target:
+            self.command, self.cwd = target.split(), PROJECT_DIR
+        else:
+            self.command, self.cwd = ['-c', f"import {target}"], PROJECT_DIR / "src"
+        self.measure_imports = measure_imports
+
+    def time_startup(self, target):
+
+        report = self.measure_imports(self.command, self.cwd)
+        if report['returncode'] != 0:
+            raise RuntimeError(f"{target} terminou com código {report['returncode']}")
@@ -0,0 +1,56 @@
+import sys
+import time
+import argparse
+import subprocess
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+def measure_imports(command, cwd=PROJECT_DIR):
+
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, '-X', 'importtime', *command], cwd=cwd,
+                               capture_output=True, text=True)
+    wall_seconds = time.perf_counter() - started
+
+    modules = {}
+    total_us = 0
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+        if not name[1:].startswith(' '):
+            total_us += int(cumulative_us)
+
+    return {
+        'command': command,
+        'returncode': completed.returncode,
+        'wall_seconds': wall_seconds,
+        'import_seconds': total_us / 1e6,
+        'modules': modules
+    }
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Tempo de importação (python -X importtime) de um comando")
+    parser.add_argument('comando', nargs=argparse.REMAINDER,
+                        help="Script e argumentos a medir (padrão: main.py --help)")
+    parser.add_argument('--top', type=int, default=15, help="Módulos mais lentos a listar")
+    parser.add_argument('--diretorio', default=str(PROJECT_DIR),
+                        help="Diretório onde o comando é executado (padrão: o projeto)")
+    args = parser.parse_args(argv)
+
+    report = measure_imports(args.comando or ['main.py', '--help'], args.diretorio)
+
+    print(f"Comando: {' '.join(report['command'])}")
+    print(f"Tempo total: {report['wall_seconds']:.3f}s, importações: {report['import_seconds']:.3f}s")
+    print("\nMódulos com maior tempo acumulado:")
+    slowest = sorted(report['modules'].items(), key=lambda item: item[1][1], reverse=True)
+    for name, (self_us, cumulative_us) in slowest[:args.top]:
+        print(f"  {cumulative_us / 1e3:9.1f} ms  {name}")
+
+    return report['returncode']
+
+if __name__ == "__main__":
+    sys.exit(main())
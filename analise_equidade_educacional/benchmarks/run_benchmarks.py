@@ -0,0 +1,172 @@
+import re
+import sys
+import json
+import time
+import inspect
+import argparse
+import platform
+import itertools
+import statistics
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent))
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+import benchmarks
+from pipeline.instrumentation import peak_rss_bytes, current_rss_bytes, open_memory_window, close_memory_window
+
+HISTORY_PATH = Path(__file__).resolve().parent / "resultados" / "historico.jsonl"
+BENCHMARK_PREFIXES = ('time_', 'peakmem_')
+
+def discover(pattern=None):
+
+    found = []
+    for class_name, cls in inspect.getmembers(benchmarks, inspect.isclass):
+        if cls.__module__ != benchmarks.__name__:
+            continue
+        for method_name, _ in inspect.getmembers(cls, inspect.isfunction):
+            name = f"{class_name}.{method_name}"
+            if method_name.startswith(BENCHMARK_PREFIXES) and (pattern is None or re.search(pattern, name)):
+                found.append((class_name, method_name))
+    return found
+
+def _run_benchmark(class_name, method_name, params, repeat):
+
+    instance = getattr(benchmarks, class_name)()
+    method = getattr(instance, method_name)
+
+    try:
+        if hasattr(instance, 'setup'):
+            instance.setup(*params)
+    except NotImplementedError as e:
+        return {'status': 'pulado', 'motivo': str(e)}
+    except Exception as e:
+        return {'status': 'erro', 'motivo': f"{type(e).__name__}: {e}"}
+
+    rss_after_setup = current_rss_bytes()
+    window = open_memory_window()
+
+    try:
+        timings = []
+        for _ in range(1 if method_name.startswith('peakmem_') else repeat):
+            started = time.perf_counter()
+            method(*params)
+            timings.append(time.perf_counter() - started)
+    except Exception as e:
+        return {'status': 'erro', 'motivo': f"{type(e).__name__}: {e}"}
+    finally:
+        stage_peak = close_memory_window(window)
+        if hasattr(instance, 'teardown'):
+            instance.teardown(*params)
+
+    return {
+        'status': 'ok',
+        'seconds_min': min(timings),
+        'seconds_median': statistics.median(timings),
+        'peak_rss_bytes': peak_rss_bytes(),
+        'stage_peak_rss_bytes': stage_peak,
+        'rss_growth_bytes': (max(stage_peak - rss_after_setup, 0)
+                             if stage_peak is not None and rss_after_setup is not None else None)
+    }
+
+def run(pattern=None, sizes=None, repeat=3):
+
+    results = []
+
+    with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as executor:
+        for class_name, method_name in discover(pattern):
+            cls = getattr(benchmarks, class_name)
+            param_grid = [list(values) for values in getattr(cls, 'params', [])]
+            param_names = getattr(cls, 'param_names', [])
+            if sizes is not None and 'n_alunos' in param_names:
+                index = param_names.index('n_alunos')
+                param_grid[index] = [size for size in param_grid[index] if size in sizes]
+
+            for params in itertools.product(*param_grid):
+                name = f"{class_name}.{method_name}"
+                result = executor.submit(_run_benchmark, class_name, method_name, params, repeat).result()
+                result.update(benchmark=name, params=dict(zip(param_names, params)))
+                results.append(result)
+
+                if result['status'] == 'ok':
+                    print(f"{name} {result['params']}: {result['seconds_median']:.4f}s, "
+                          f"pico {result['peak_rss_bytes'] / 2**20:.0f} MiB")
+                else:
+                    print(f"{name} {result['params']}: {result['status']} ({result['motivo']})")
+
+    return results
+
+def _commit():
+
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def load_history(path=HISTORY_PATH):
+
+    if not Path(path).exists():
+        return []
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def save_run(results, path=HISTORY_PATH):
+
+    entry = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': _commit(),
+        'machine': platform.node(),
+        'python': platform.python_version(),
+        'results': results
+    }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    return entry
+
+def compare(previous, current, threshold=0.2):
+
+    def key(result):
+        return result['benchmark'], json.dumps(result['params'], sort_keys=True)
+
+    baseline = {key(result): result for result in previous['results'] if result['status'] == 'ok'}
+    regressions = []
+
+    print(f"\nComparação com {previous['timestamp']} (commit {previous['commit']}):")
+    for result in current['results']:
+        reference = baseline.get(key(result))
+        if result['status'] != 'ok' or reference is None:
+            continue
+        ratio = result['seconds_median'] / reference['seconds_median']
+        flag = " <- REGRESSÃO" if ratio > 1 + threshold else ""
+        print(f"  {result['benchmark']} {result['params']}: {ratio:.2f}x{flag}")
+        if flag:
+            regressions.append(result)
+
+    return regressions
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description="Benchmarks do pipeline de análise de equidade")
+    parser.add_argument('--filtro', help="Expressão regular aplicada a Classe.metodo")
+    parser.add_argument('--tamanhos', nargs='+', type=int, default=[10_000, 100_000],
+                        help=f"Tamanhos de amostra a executar (disponíveis: {benchmarks.SIZES})")
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--historico', default=str(HISTORY_PATH))
+    parser.add_argument('--limite', type=float, default=0.2,
+                        help="Aumento relativo de tempo considerado regressão")
+    args = parser.parse_args(argv)
+
+    history = [entry for entry in load_history(args.historico) if entry['machine'] == platform.node()]
+    entry = save_run(run(args.filtro, set(args.tamanhos), args.repeticoes), args.historico)
+
+    if history:
+        return 1 if compare(history[-1], entry, args.limite) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,19 @@
 
 import sys
 import os
+import json
+import argparse
 from pathlib import Path
 import logging
-import pandas as pd
 
 sys.path.append(str(Path(__file__).parent / "src"))
 
-from data_processing.data_processor import DataProcessor, create_sample_data
-from analysis.hypothesis_tester import HypothesisTester
-from visualization.visualizer import Visualizer
-from reporting.powerpoint_reporter import PowerPointReporter
+from visualization.figure_registry import FIGURE_BUILDERS
+from reporting.report_writer import REPORT_FORMATS, REPORT_EXTENSIONS
+from pipeline.artifacts import ArtifactGraph, code_version
+from pipeline.runner import PipelineRunner
+from pipeline.instrumentation import INSTRUMENTATION
+from data_processing.fingerprint import fingerprint_files
 vasco_config = True
 vasco_debug = False
 vasco_version = '1.0'
@@ -27,62 +30,218 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-def main():
-    
-    logger.info("Iniciando análise de equidade educacional")
+DATA_PATH = "basededados.xlsx"
+REGION_INDEX_PATH = "reports/regioes/indice.json"
+PIPELINE_STAGES = ['load', 'clean', 'aggregate', 'test', 'visualise', 'report']
+
+def parse_args(argv=None):
     
-    try:
+    parser = argparse.ArgumentParser(description="Análise de equidade educacional - SAEB")
+    parser.add_argument('--figuras', nargs='+', default=['todas'],
+                        choices=['todas', 'nenhuma'] + list(FIGURE_BUILDERS),
+                        help="Figuras a serem geradas (padrão: todas)")
+    parser.add_argument('--modo-dispersao', default='auto', choices=['markers', 'webgl', 'density', 'auto'],
+                        help="Renderização dos gráficos de dispersão")
+    parser.add_argument('--max-figuras-cache', type=int, default=2,
+                        help="Número máximo de figuras mantidas em memória")
+    parser.add_argument('--forcar', action='store_true',
+                        help="Reexecuta todas as etapas e reconstrói todos os artefatos mesmo sem mudanças")
+    parser.add_argument('--formato-relatorio', default='text', choices=list(REPORT_FORMATS),
+                        help="Formato do relatório detalhado")
+    parser.add_argument('--tabela-resultados', default="reports/resultados.jsonl",
+                        help="Tabela de resultados (.jsonl ou .parquet) onde cada execução é acrescentada")
+    parser.add_argument('--por-regiao', metavar='COLUNA',
+                        help="Gera uma apresentação e um relatório por valor da coluna (ex.: NO_UF)")
+    parser.add_argument('--metricas', default="reports/metricas",
+                        help="Prefixo dos arquivos de métricas de desempenho (.json e .prom); vazio desativa")
+    parser.add_argument('--servidor', action='store_true',
+                        help="Inicia o servidor de análise em localhost com os dados limpos em memória")
+    parser.add_argument('--porta', type=int, default=8765,
+                        help="Porta do servidor de análise (padrão: 8765)")
+    parser.add_argument('--etapa', choices=PIPELINE_STAGES,
+                        help="Executa somente esta etapa, usando os checkpoints das anteriores")
+    parser.add_argument('--de', choices=PIPELINE_STAGES,
+                        help="Primeira etapa a executar (as anteriores vêm dos checkpoints)")
+    parser.add_argument('--ate', choices=PIPELINE_STAGES,
+                        help="Última etapa a executar")
+    return parser.parse_args(argv)
 
-        logger.info("Etapa 1: Processamento de dados")
-        data_processor = DataProcessor("basededados.xlsx")
+def build_pipeline(args) -> PipelineRunner:
+    
+    runner = PipelineRunner()
+    
+    def load_stage():
+        from data_processing.data_processor import DataProcessor
+        
+        logger.info("Etapa 1: Carregamento dos dados")
+        data_processor = DataProcessor(DATA_PATH)
         
         try:
-
-            raw_vasco_data = data_processor.load_data()
-            processed_vasco_data = data_processor.clean_data()
-            logger.info("Dados reais carregados com sucesso")
+            return data_processor.load_data()
         except Exception as e:
             logger.warning(f"Erro ao carregar dados reais: {e}")
+            return None
+    
+    def clean_stage(raw_data):
+        from data_processing.data_processor import DataProcessor, create_sample_data
+        
+        logger.info("Etapa 2: Limpeza dos dados")
+        data_processor = DataProcessor(DATA_PATH)
+        data_processor.raw_data = raw_data
+        
+        try:
+            processed_data = data_processor.clean_data()
+            logger.info("Dados reais carregados com sucesso")
+        except Exception as e:
+            logger.warning(f"Erro ao processar dados reais: {e}")
             logger.info("Criando dados de exemplo para demonstração")
-
-            data_processor.raw_vasco_data = sample_data
-            processed_vasco_data = data_processor.clean_data()
+            data_processor.raw_data = create_sample_data()
+            processed_data = data_processor.clean_data()
+        
+        return processed_data
+    
+    def aggregate_stage(processed_data):
+        from data_processing.data_processor import DataProcessor
         
-        vasco_summary = data_processor.get_summary_statistics()
+        logger.info("Etapa 3: Agregação dos dados")
+        data_processor = DataProcessor(DATA_PATH)
+        data_processor.processed_data = processed_data
+        
+        summary = data_processor.get_summary_statistics()
         logger.info("Estatísticas dos dados:")
         for key, value in summary.items():
             logger.info(f"  {key}: {value:.2f}" if isinstance(value, float) else f"  {key}: {value}")
         
-        logger.info("Etapa 2: Análise estatística das hipóteses")
-        hypothesis_tester = HypothesisTester(processed_data)
-        results = hypothesis_tester.run_all_tests()
+        return summary
+    
+    def test_stage(processed_data):
+        from analysis.hypothesis_tester import HypothesisTester
+        from analysis.result_cache import ResultCache
+        
+        logger.info("Etapa 4: Análise estatística das hipóteses")
+        hypothesis_tester = HypothesisTester(processed_data, cache=ResultCache())
+        hypothesis_tester.run_all_tests()
+        results = hypothesis_tester.apply_multiple_testing_correction(method='fdr_bh')
         
-        summary_report = hypothesis_tester.get_summary_report()
         logger.info("Resumo dos resultados:")
-        print(summary_report)
+        hypothesis_tester.get_summary_report(sys.stdout)
         
-        logger.info("Etapa 3: Criação de visualizações")
-        visualizer = Visualizer(processed_data, results)
+        return results
+    
+    def build_figures():
+        from visualization.visualizer import Visualizer
         
-        dashboard = visualizer.create_overview_dashboard()
+        visualizer = Visualizer(runner.load('clean'), runner.load('test'), scatter_mode=args.modo_dispersao,
+                                max_cached_figures=args.max_figuras_cache)
+        visualizer.save_all_figures("reports/figures", mode='shared', combined=True, names=figure_names)
+    
+    def build_presentation():
+        from reporting.powerpoint_reporter import PowerPointReporter
         
-        hypothesis_visualizations = visualizer.create_hypothesis_visualizations()
+        reporter = PowerPointReporter(runner.load('clean'), runner.load('test'))
+        reporter.create_presentation()
+        reporter.save_presentation("reports/relatorio_equidade_educacional.pptx")
+    
+    def build_detailed_report():
+        from reporting.powerpoint_reporter import PowerPointReporter
         
-        summary_plot = visualizer.create_statistical_summary_plot()
+        reporter = PowerPointReporter(runner.load('clean'), runner.load('test'), charts=False)
+        with open(detailed_report_path, "w", encoding="utf-8") as f:
+            reporter.create_detailed_report(f, fmt=args.formato_relatorio)
+    
+    def build_results_table():
+        from reporting.results_export import export_results
         
-        os.makedirs("reports/figures", exist_ok=True)
-        visualizer.save_all_figures("reports/figures")
+        export_results(runner.load('test'), args.tabela_resultados)
+    
+    def build_region_reports():
+        from reporting.batch_reporter import generate_region_reports
         
-        logger.info("Etapa 4: Geração de relatórios")
-        reporter = PowerPointReporter(processed_data, results)
+        outputs = generate_region_reports(runner.load('clean'), str(Path(REGION_INDEX_PATH).parent),
+                                          region_column=args.por_regiao, fmt=args.formato_relatorio)
+        Path(REGION_INDEX_PATH).write_text(json.dumps({str(region): paths for region, paths in outputs.items()},
+                                                      indent=2, ensure_ascii=False), encoding='utf-8')
+    
+    def visualise_stage():
+        logger.info("Etapa 5: Criação de visualizações")
+        if figure_names:
+            graph.build_scheduled(['figuras'], force=args.forcar)
+    
+    def report_stage():
+        logger.info("Etapa 6: Geração de relatórios")
+        targets = [name for name in graph.artifacts if name != 'figuras']
+        if any(args.forcar or graph.is_stale(name) for name in targets):
+            runner.load('clean')
+            runner.load('test')
+        graph.build_scheduled(targets, force=args.forcar)
+    
+    detailed_report_path = f"reports/relatorio_detalhado{REPORT_EXTENSIONS[args.formato_relatorio]}"
+    
+    if 'todas' in args.figuras:
+        figure_names = list(FIGURE_BUILDERS)
+    else:
+        figure_names = [name for name in args.figuras if name != 'nenhuma']
+    
+    runner.add_stage('load', load_stage, inputs={'dados': fingerprint_files([DATA_PATH]),
+                                                 'codigo': code_version('data_processing')})
+    runner.add_stage('clean', clean_stage, deps=['load'])
+    runner.add_stage('aggregate', aggregate_stage, deps=['clean'])
+    runner.add_stage('test', test_stage, deps=['clean'], inputs={'codigo': code_version('analysis')})
+    runner.add_stage('visualise', visualise_stage, checkpoint=False)
+    runner.add_stage('report', report_stage, checkpoint=False)
+    
+    data_inputs = {'dados': runner.signature('clean'), 'resultados': runner.signature('test')}
+    reporting_inputs = {**data_inputs, 'codigo_relatorio': code_version('reporting', 'visualization')}
+    
+    graph = ArtifactGraph()
+    
+    if figure_names:
+        figure_outputs = [f"reports/figures/{name}.html" for name in figure_names] + ["reports/figures/painel.html"]
+        graph.add('figuras', figure_outputs, build_figures,
+                  inputs={**data_inputs, 'codigo_visualizacao': code_version('visualization'),
+                          'figuras': figure_names, 'modo_dispersao': args.modo_dispersao})
+    
+    graph.add('apresentacao', ["reports/relatorio_equidade_educacional.pptx"], build_presentation,
+              inputs=reporting_inputs)
+    graph.add('relatorio_detalhado', [detailed_report_path], build_detailed_report,
+              inputs={**reporting_inputs, 'formato': args.formato_relatorio})
+    graph.add('tabela_resultados', [args.tabela_resultados], build_results_table,
+              inputs={'resultados': runner.signature('test'), 'codigo_exportacao': code_version('reporting')})
+    
+    if args.por_regiao:
+        graph.add('relatorios_regionais', [REGION_INDEX_PATH], build_region_reports,
+                  inputs={**reporting_inputs, 'coluna_regiao': args.por_regiao,
+                          'formato': args.formato_relatorio})
+    
+    return runner
+
+def main(argv=None):
+    
+    args = parse_args(argv)
+    logger.info("Iniciando análise de equidade educacional")
+    
+    try:
         
-        presentation = reporter.create_presentation()
-        reporter.save_presentation("reports/relatorio_equidade_educacional.pptx")
+        runner = build_pipeline(args)
+        
+        if args.servidor:
+            from server.analysis_server import serve
+            
+            runner.run(end='clean', force=args.forcar)
+            serve(runner.load('clean'), port=args.porta)
+            return
+        
+        start, end = (args.etapa, args.etapa) if args.etapa else (args.de, args.ate)
+        runner.run(start=start, end=end, force=args.forcar)
+        
+        if not (runner.is_current('aggregate') and runner.is_current('test')):
+            logger.info("Resumo final indisponível: execute as etapas 'aggregate' e 'test'")
+            return
         
-        detailed_report = reporter.create_detailed_report()
+        from analysis.multiple_testing import hypothesis_confirmed
         
-        with open("reports/relatorio_detalhado.txt", "w", encoding="utf-8") as f:
-            f.write(detailed_report)
+        results = runner.load('test')
+        processed_data_summary = runner.load('aggregate')
         
         logger.info("Etapa 5: Resumo final")
         print("\n" + "="*60)
@@ -90,16 +249,14 @@ def main():
         print("="*60)
         
         print(f"\n📊 DADOS PROCESSADOS:")
-        print(f"   • Total de alunos: {len(processed_data):,}")
-        print(f"   • Total de escolas: {processed_data['CODIGO_ESCOLA'].nunique() if 'CODIGO_ESCOLA' in processed_data.columns else 'N/A'}")
-        print(f"   • Percentual de minorias: {processed_data['MINORIA'].mean()*100:.1f}%")
+        print(f"   • Total de alunos: {processed_data_summary['total_alunos']:,}")
+        print(f"   • Total de escolas: {processed_data_summary['total_escolas']}")
+        print(f"   • Percentual de minorias: {processed_data_summary['percentual_minorias']:.1f}%")
         
         print(f"\n🔬 HIPÓTESES TESTADAS:")
         confirmed_hypotheses = []
         for key, result in results.items():
-            has_significant = any(test.get('significant', False) 
-                               for test in result['tests'].values() 
-                               if isinstance(test, dict))
+            has_significant = hypothesis_confirmed(result)
             status = "✅ CONFIRMADA" if has_significant else "❌ REJEITADA"
             print(f"   • {result['hypothesis']}: {status}")
             if has_significant:
@@ -111,8 +268,11 @@ def main():
         
         print(f"\n📁 ARQUIVOS GERADOS:")
         print(f"   • Apresentação PowerPoint: reports/relatorio_equidade_educacional.pptx")
-        print(f"   • Relatório detalhado: reports/relatorio_detalhado.txt")
+        print(f"   • Relatório detalhado: reports/relatorio_detalhado{REPORT_EXTENSIONS[args.formato_relatorio]}")
         print(f"   • Visualizações: reports/figures/")
+        print(f"   • Tabela de resultados: {args.tabela_resultados}")
+        if args.por_regiao:
+            print(f"   • Relatórios por região ({args.por_regiao}): reports/regioes/")
         print(f"   • Log da análise: analise_equidade.log")
         
         print(f"\n🎯 PRINCIPAIS CONCLUSÕES:")
@@ -126,6 +286,10 @@ def main():
     except Exception as e:
         logger.error(f"Erro durante a análise: {e}")
         raise
+    finally:
+        if args.metricas:
+            INSTRUMENTATION.write_json(f"{args.metricas}.json")
+            INSTRUMENTATION.write_prometheus(f"{args.metricas}.prom")
 
 if __name__ == "__main__":
     main()
@@ -6,18 +6,31 @@ from scipy.stats import ttest_ind, chi2_contingency, mannwhitneyu
 from sklearn.linear_model import LinearRegression
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import r2_score
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Optional, TextIO
 import logging
+from io import StringIO
+from analysis.multiple_testing import annotate_results
+from analysis.precision import CompactLinearRegression, design_matrix
+from analysis.school_tests import segregation_test, teacher_quality_test
+from reporting.report_writer import ReportWriter
+from pipeline.instrumentation import instrumented
 
 logger = logging.getLogger(__name__)
 
 class HypothesisTester:
     
-    def __init__(self, data: pd.DataFrame):
+    def __init__(self, data: pd.DataFrame, cache: Optional['ResultCache'] = None, compact: bool = False):
         
-        self.vasco_data = data
+        self.data = data
         self.results = {}
+        self.cache = cache
+        self.compact = compact
     
+    def _regression(self):
+        
+        return CompactLinearRegression() if self.compact else LinearRegression()
+    
+    @instrumented('HypothesisTester.test_hypothesis_1_segregation', rows=lambda result, self: len(self.data))
     def test_hypothesis_1_segregation(self) -> Dict[str, Any]:
         
         logger.info("Testando Hipótese 1: Segregação Socioespacial")
@@ -29,66 +42,12 @@ class HypothesisTester:
             'NOTA_PORTUGUES': 'mean'
         }).reset_index()
         
-        median_minority = school_minority_pct['MINORIA'].median()
-        high_minority_schools = school_minority_pct[school_minority_pct['MINORIA'] >= median_minority]
-        low_minority_schools = school_minority_pct[school_minority_pct['MINORIA'] < median_minority]
-        
-        t_stat_infra, p_value_infra = ttest_ind(
-            high_minority_schools['INFRA_BOA'], 
-            low_minority_schools['INFRA_BOA']
-        )
-        
-        t_stat_math, p_value_math = ttest_ind(
-            high_minority_schools['NOTA_MATEMATICA'], 
-            low_minority_schools['NOTA_MATEMATICA']
-        )
-        
-        t_stat_port, p_value_port = ttest_ind(
-            high_minority_schools['NOTA_PORTUGUES'], 
-            low_minority_schools['NOTA_PORTUGUES']
-        )
-        
-        correlation_infra = stats.pearsonr(school_minority_pct['MINORIA'], 
-                                          school_minority_pct['INFRA_BOA'])[0]
-        
-        vasco_result = {
-            'hypothesis': 'Segregação Socioespacial',
-            'description': 'Alunos minoritários concentrados em escolas com menor infraestrutura',
-            'tests': {
-                'infrastructure_difference': {
-                    't_statistic': t_stat_infra,
-                    'p_value': p_value_infra,
-                    'significant': p_value_infra < 0.05,
-                    'effect_size': (high_minority_schools['INFRA_BOA'].mean() - 
-                                  low_minority_schools['INFRA_BOA'].mean())
-                },
-                'math_score_difference': {
-                    't_statistic': t_stat_math,
-                    'p_value': p_value_math,
-                    'significant': p_value_math < 0.05,
-                    'effect_size': (high_minority_schools['NOTA_MATEMATICA'].mean() - 
-                                  low_minority_schools['NOTA_MATEMATICA'].mean())
-                },
-                'portuguese_score_difference': {
-                    't_statistic': t_stat_port,
-                    'p_value': p_value_port,
-                    'significant': p_value_port < 0.05,
-                    'effect_size': (high_minority_schools['NOTA_PORTUGUES'].mean() - 
-                                  low_minority_schools['NOTA_PORTUGUES'].mean())
-                },
-                'correlation_minority_infra': correlation_infra
-            },
-            'summary_stats': {
-                'high_minority_schools': len(high_minority_schools),
-                'low_minority_schools': len(low_minority_schools),
-                'avg_infra_high_minority': high_minority_schools['INFRA_BOA'].mean(),
-                'avg_infra_low_minority': low_minority_schools['INFRA_BOA'].mean()
-            }
-        }
+        result = segregation_test(school_minority_pct)
         
         self.results['hypothesis_1'] = result
         return result
     
+    @instrumented('HypothesisTester.test_hypothesis_2_teacher_quality', rows=lambda result, self: len(self.data))
     def test_hypothesis_2_teacher_quality(self) -> Dict[str, Any]:
         
         logger.info("Testando Hipótese 2: Qualidade Docente")
@@ -100,57 +59,12 @@ class HypothesisTester:
             'NOTA_PORTUGUES': 'mean'
         }).reset_index()
         
-        median_minority = school_minority_pct['MINORIA'].median()
-        high_minority_schools = school_minority_pct[school_minority_pct['MINORIA'] >= median_minority]
-        low_minority_schools = school_minority_pct[school_minority_pct['MINORIA'] < median_minority]
-        
-        t_stat_teacher, p_value_teacher = ttest_ind(
-            high_minority_schools['DOCENTE_QUALIFICADO'], 
-            low_minority_schools['DOCENTE_QUALIFICADO']
-        )
-        
-        correlation_teacher = stats.pearsonr(school_minority_pct['MINORIA'], 
-                                           school_minority_pct['DOCENTE_QUALIFICADO'])[0]
-        
-        X = school_minority_pct[['DOCENTE_QUALIFICADO', 'MINORIA']].values
-        y_math = school_minority_pct['NOTA_MATEMATICA'].values
-        y_port = school_minority_pct['NOTA_PORTUGUES'].values
-        
-        reg_math = LinearRegression().fit(X, y_math)
-        reg_port = LinearRegression().fit(X, y_port)
-        
-        vasco_result = {
-            'hypothesis': 'Qualidade Docente',
-            'description': 'Professores menos qualificados em escolas com maior concentração de minorias',
-            'tests': {
-                'teacher_quality_difference': {
-                    't_statistic': t_stat_teacher,
-                    'p_value': p_value_teacher,
-                    'significant': p_value_teacher < 0.05,
-                    'effect_size': (high_minority_schools['DOCENTE_QUALIFICADO'].mean() - 
-                                  low_minority_schools['DOCENTE_QUALIFICADO'].mean())
-                },
-                'correlation_minority_teacher': correlation_teacher,
-                'regression_math': {
-                    'coefficient_teacher': reg_math.coef_[0],
-                    'coefficient_minority': reg_math.coef_[1],
-                    'r_squared': reg_math.score(X, y_math)
-                },
-                'regression_portuguese': {
-                    'coefficient_teacher': reg_port.coef_[0],
-                    'coefficient_minority': reg_port.coef_[1],
-                    'r_squared': reg_port.score(X, y_port)
-                }
-            },
-            'summary_stats': {
-                'avg_teacher_quality_high_minority': high_minority_schools['DOCENTE_QUALIFICADO'].mean(),
-                'avg_teacher_quality_low_minority': low_minority_schools['DOCENTE_QUALIFICADO'].mean()
-            }
-        }
+        result = teacher_quality_test(school_minority_pct, self.compact)
         
         self.results['hypothesis_2'] = result
         return result
     
+    @instrumented('HypothesisTester.test_hypothesis_3_cultural_capital', rows=lambda result, self: len(self.data))
     def test_hypothesis_3_cultural_capital(self) -> Dict[str, Any]:
         
         logger.info("Testando Hipótese 3: Capital Cultural")
@@ -173,14 +87,14 @@ class HypothesisTester:
         correlation_capital_port = stats.pearsonr(self.data['CAPITAL_CULTURAL'], 
                                                 self.data['NOTA_PORTUGUES'])[0]
         
-        X = self.data[['CAPITAL_CULTURAL', 'NSE', 'MINORIA']].values
+        X = design_matrix(self.data, ['CAPITAL_CULTURAL', 'NSE', 'MINORIA'], self.compact)
         y_math = self.data['NOTA_MATEMATICA'].values
         y_port = self.data['NOTA_PORTUGUES'].values
         
-        reg_math = LinearRegression().fit(X, y_math)
-        reg_port = LinearRegression().fit(X, y_port)
+        reg_math = self._regression().fit(X, y_math)
+        reg_port = self._regression().fit(X, y_port)
         
-        vasco_result = {
+        result = {
             'hypothesis': 'Capital Cultural',
             'description': 'Diferenças no ambiente familiar e recursos educacionais domésticos',
             'tests': {
@@ -224,6 +138,7 @@ class HypothesisTester:
         self.results['hypothesis_3'] = result
         return result
     
+    @instrumented('HypothesisTester.test_hypothesis_4_peer_effect', rows=lambda result, self: len(self.data))
     def test_hypothesis_4_peer_effect(self) -> Dict[str, Any]:
         
         logger.info("Testando Hipótese 4: Efeito de Pares")
@@ -235,7 +150,7 @@ class HypothesisTester:
             'NSE': 'mean'
         }).reset_index()
         
-        self.vasco_data = self.data.merge(
+        self.data = self.data.merge(
             school_minority_pct[['CODIGO_ESCOLA', 'MINORIA']], 
             on='CODIGO_ESCOLA', 
             suffixes=('', '_ESCOLA')
@@ -248,12 +163,12 @@ class HypothesisTester:
         correlation_peer_port = stats.pearsonr(self.data['PERCENTUAL_MINORIAS_ESCOLA'], 
                                              self.data['NOTA_PORTUGUES'])[0]
         
-        X = self.data[['PERCENTUAL_MINORIAS_ESCOLA', 'NSE', 'CAPITAL_CULTURAL', 'MINORIA']].values
+        X = design_matrix(self.data, ['PERCENTUAL_MINORIAS_ESCOLA', 'NSE', 'CAPITAL_CULTURAL', 'MINORIA'], self.compact)
         y_math = self.data['NOTA_MATEMATICA'].values
         y_port = self.data['NOTA_PORTUGUES'].values
         
-        reg_math = LinearRegression().fit(X, y_math)
-        reg_port = LinearRegression().fit(X, y_port)
+        reg_math = self._regression().fit(X, y_math)
+        reg_port = self._regression().fit(X, y_port)
         
         quartiles = self.data['PERCENTUAL_MINORIAS_ESCOLA'].quantile([0.25, 0.5, 0.75])
         
@@ -270,7 +185,7 @@ class HypothesisTester:
             q4_students['NOTA_PORTUGUES']
         )
         
-        vasco_result = {
+        result = {
             'hypothesis': 'Efeito de Pares',
             'description': 'Impacto negativo da composição socioeconômica da turma',
             'tests': {
@@ -320,36 +235,48 @@ class HypothesisTester:
         
         logger.info("Iniciando todos os testes de hipóteses")
         
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(self.data, {'alpha': 0.05, 'compact': self.compact})
+            cached_results = self.cache.get(cache_key)
+            if cached_results is not None:
+                self.results = cached_results
+                return self.results
+        
         self.test_hypothesis_1_segregation()
         self.test_hypothesis_2_teacher_quality()
         self.test_hypothesis_3_cultural_capital()
         self.test_hypothesis_4_peer_effect()
         
+        if cache_key is not None:
+            self.cache.set(cache_key, self.results)
+        
         return self.results
     
-    def get_summary_report(self) -> str:
+    def apply_multiple_testing_correction(self, method: str = 'fdr_bh', alpha: float = 0.05) -> Dict[str, Any]:
         
         if not self.results:
-            return "Nenhum teste foi executado ainda."
+            raise ValueError("Nenhum teste foi executado ainda. Execute run_all_tests() primeiro.")
         
-        report = "RELATÓRIO DE ANÁLISE DE EQUIDADE EDUCACIONAL\n"
-        report += "=" * 50 + "\n\n"
+        return annotate_results(self.results, method=method, alpha=alpha)
+    
+    def get_summary_report(self, stream: Optional[TextIO] = None, fmt: str = 'text') -> Optional[str]:
+        
+        buffer = StringIO() if stream is None else None
+        writer = ReportWriter(stream if stream is not None else buffer, fmt)
+        
+        if not self.results:
+            if buffer is not None:
+                return "Nenhum teste foi executado ainda."
+            writer.line("Nenhum teste foi executado ainda.")
+            return None
+        
+        writer.title("RELATÓRIO DE ANÁLISE DE EQUIDADE EDUCACIONAL", 50)
         
         for key, result in self.results.items():
-            report += f"HIPÓTESE: {result['hypothesis']}\n"
-            report += f"Descrição: {result['description']}\n"
-            report += "-" * 30 + "\n"
-            
-            for test_name, test_result in result['tests'].items():
-                if isinstance(test_result, dict) and 'significant' in test_result:
-                    significance = "SIGNIFICATIVO" if test_result['significant'] else "NÃO SIGNIFICATIVO"
-                    report += f"{test_name}: {significance} (p = {test_result['p_value']:.4f})\n"
-                elif isinstance(test_result, (int, float)):
-                    report += f"{test_name}: {test_result:.4f}\n"
-            
-            report += "\n"
-        
-        return report
+            writer.hypothesis(f"HIPÓTESE: {result['hypothesis']}", result, effect_size=False)
+        
+        return buffer.getvalue() if buffer is not None else None
 
 if __name__ == "__main__":
 
@@ -0,0 +1,368 @@
+import pandas as pd
+import numpy as np
+from scipy.stats import ttest_ind_from_stats
+from typing import Dict, List, Tuple, Any, Optional
+import logging
+
+from analysis.multiple_testing import annotate_results
+from analysis.school_tests import segregation_test, teacher_quality_test
+
+logger = logging.getLogger(__name__)
+
+SCHOOL_COLUMNS = ['MINORIA', 'INFRA_BOA', 'DOCENTE_QUALIFICADO', 'NSE', 'CAPITAL_CULTURAL',
+                  'NOTA_MATEMATICA', 'NOTA_PORTUGUES']
+SCHOOL_SQUARED_COLUMNS = ['NOTA_MATEMATICA', 'NOTA_PORTUGUES']
+GRAM_COLUMNS = ['CONSTANTE', 'CAPITAL_CULTURAL', 'NSE', 'MINORIA', 'NOTA_MATEMATICA', 'NOTA_PORTUGUES']
+GROUP_COLUMNS = ['CAPITAL_CULTURAL', 'NSE']
+
+class IncrementalHypothesisTester:
+
+    def __init__(self, initial_capacity: int = 1024):
+
+        self.n_students = 0
+        self.school_index: Dict[Any, int] = {}
+        self.school_codes = np.empty(initial_capacity, dtype=object)
+        self.school_counts = np.zeros(initial_capacity)
+        self.school_sums = np.zeros((initial_capacity, len(SCHOOL_COLUMNS) + len(SCHOOL_SQUARED_COLUMNS)))
+        self.gram = np.zeros((len(GRAM_COLUMNS), len(GRAM_COLUMNS)))
+        self.group_moments = np.zeros((2, 1 + 2 * len(GROUP_COLUMNS)))
+        self.results = {}
+
+    @classmethod
+    def from_frame(cls, data: pd.DataFrame) -> 'IncrementalHypothesisTester':
+
+        tester = cls()
+        tester.partial_fit(data)
+        return tester
+
+    def partial_fit(self, batch: pd.DataFrame) -> 'IncrementalHypothesisTester':
+
+        if len(batch) == 0:
+            return self
+
+        logger.info(f"Incorporando lote de {len(batch)} alunos")
+
+        values = batch[SCHOOL_COLUMNS].to_numpy(dtype=np.float64)
+        squared = batch[SCHOOL_SQUARED_COLUMNS].to_numpy(dtype=np.float64) ** 2
+        row_values = np.hstack([values, squared])
+
+        batch_codes, inverse = np.unique(batch['CODIGO_ESCOLA'].to_numpy(), return_inverse=True)
+        rows = self._school_rows(batch_codes)
+
+        batch_counts = np.bincount(inverse, minlength=len(batch_codes))
+        batch_sums = np.zeros((len(batch_codes), row_values.shape[1]))
+        for column in range(row_values.shape[1]):
+            batch_sums[:, column] = np.bincount(inverse, weights=row_values[:, column],
+                                                minlength=len(batch_codes))
+
+        self.school_counts[rows] += batch_counts
+        self.school_sums[rows] += batch_sums
+
+        design = np.column_stack([np.ones(len(batch)), batch[GRAM_COLUMNS[1:]].to_numpy(dtype=np.float64)])
+        self.gram += design.T @ design
+
+        minority = batch['MINORIA'].to_numpy(dtype=bool)
+        group_values = batch[GROUP_COLUMNS].to_numpy(dtype=np.float64)
+        for group, mask in ((0, ~minority), (1, minority)):
+            selected = group_values[mask]
+            self.group_moments[group] += np.concatenate([[mask.sum()], selected.sum(axis=0),
+                                                         (selected ** 2).sum(axis=0)])
+
+        self.n_students += len(batch)
+        return self
+
+    def _school_rows(self, codes: np.ndarray) -> np.ndarray:
+
+        rows = np.empty(len(codes), dtype=np.int64)
+
+        for position, code in enumerate(codes.tolist()):
+            row = self.school_index.get(code)
+            if row is None:
+                row = len(self.school_index)
+                if row >= len(self.school_counts):
+                    self._grow(2 * len(self.school_counts))
+                self.school_index[code] = row
+                self.school_codes[row] = code
+            rows[position] = row
+
+        return rows
+
+    def _grow(self, capacity: int) -> None:
+
+        n_schools = len(self.school_index)
+
+        codes = np.empty(capacity, dtype=object)
+        codes[:n_schools] = self.school_codes[:n_schools]
+        counts = np.zeros(capacity)
+        counts[:n_schools] = self.school_counts[:n_schools]
+        sums = np.zeros((capacity, self.school_sums.shape[1]))
+        sums[:n_schools] = self.school_sums[:n_schools]
+
+        self.school_codes, self.school_counts, self.school_sums = codes, counts, sums
+
+    def _school_table(self) -> Tuple[np.ndarray, pd.DataFrame]:
+
+        n_schools = len(self.school_index)
+        counts = self.school_counts[:n_schools]
+        sums = self.school_sums[:n_schools]
+
+        means = pd.DataFrame(sums[:, :len(SCHOOL_COLUMNS)] / counts[:, None], columns=SCHOOL_COLUMNS)
+        return counts, means
+
+    def _regression_from_gram(self, gram: np.ndarray, features: List[int], target: int) -> Tuple[np.ndarray, float]:
+
+        n = gram[0, 0]
+        means = gram[0] / n
+        centered = gram - n * np.outer(means, means)
+
+        sxx = centered[np.ix_(features, features)]
+        sxy = centered[features, target]
+        coefficients = np.linalg.solve(sxx, sxy)
+        r_squared = coefficients @ sxy / centered[target, target]
+
+        return coefficients, r_squared
+
+    def _correlation_from_gram(self, gram: np.ndarray, first: int, second: int) -> float:
+
+        n = gram[0, 0]
+        means = gram[0] / n
+        covariance = gram[first, second] - n * means[first] * means[second]
+        variance_first = gram[first, first] - n * means[first] ** 2
+        variance_second = gram[second, second] - n * means[second] ** 2
+
+        return covariance / np.sqrt(variance_first * variance_second)
+
+    def _peer_gram(self) -> np.ndarray:
+
+        counts, means = self._school_table()
+        n_schools = len(self.school_index)
+        share = means['MINORIA'].to_numpy()
+        sums = self.school_sums[:n_schools, :len(SCHOOL_COLUMNS)]
+
+        columns = ['CONSTANTE', 'PERCENTUAL_MINORIAS_ESCOLA'] + GRAM_COLUMNS[1:]
+        gram = np.zeros((len(columns), len(columns)))
+
+        student_positions = [0] + list(range(2, len(columns)))
+        gram[np.ix_(student_positions, student_positions)] = self.gram
+
+        peer_row = np.empty(len(columns))
+        peer_row[0] = counts @ share
+        peer_row[1] = counts @ share ** 2
+        for position, column in enumerate(GRAM_COLUMNS[1:], start=2):
+            peer_row[position] = share @ sums[:, SCHOOL_COLUMNS.index(column)]
+
+        gram[1, :] = peer_row
+        gram[:, 1] = peer_row
+
+        return gram
+
+    def _weighted_quantile(self, values: np.ndarray, weights: np.ndarray, q: float) -> float:
+
+        order = np.argsort(values, kind='stable')
+        sorted_values = values[order]
+        cumulative = np.cumsum(weights[order])
+
+        position = q * (cumulative[-1] - 1)
+        lower = np.floor(position)
+        lower_value = sorted_values[np.searchsorted(cumulative, lower, side='right')]
+        upper_value = sorted_values[np.searchsorted(cumulative, np.ceil(position), side='right')]
+
+        return lower_value + (position - lower) * (upper_value - lower_value)
+
+    def _pooled_group(self, mask: np.ndarray, column: str) -> Tuple[float, float, float]:
+
+        n = self.school_counts[:len(self.school_index)][mask].sum()
+        total = self.school_sums[:len(self.school_index), SCHOOL_COLUMNS.index(column)][mask].sum()
+        squared_position = len(SCHOOL_COLUMNS) + SCHOOL_SQUARED_COLUMNS.index(column)
+        total_squared = self.school_sums[:len(self.school_index), squared_position][mask].sum()
+
+        mean = total / n
+        std = np.sqrt((total_squared - n * mean ** 2) / (n - 1))
+        return mean, std, n
+
+    def _group_statistics(self, group: int, column: str) -> Tuple[float, float, float]:
+
+        moments = self.group_moments[group]
+        position = GROUP_COLUMNS.index(column)
+        n = moments[0]
+        mean = moments[1 + position] / n
+        std = np.sqrt((moments[1 + len(GROUP_COLUMNS) + position] - n * mean ** 2) / (n - 1))
+
+        return mean, std, n
+
+    def test_hypothesis_1_segregation(self) -> Dict[str, Any]:
+
+        logger.info("Atualizando Hipótese 1: Segregação Socioespacial")
+
+        _, school_minority_pct = self._school_table()
+        result = segregation_test(school_minority_pct)
+
+        self.results['hypothesis_1'] = result
+        return result
+
+    def test_hypothesis_2_teacher_quality(self) -> Dict[str, Any]:
+
+        logger.info("Atualizando Hipótese 2: Qualidade Docente")
+
+        _, school_minority_pct = self._school_table()
+        result = teacher_quality_test(school_minority_pct)
+
+        self.results['hypothesis_2'] = result
+        return result
+
+    def test_hypothesis_3_cultural_capital(self) -> Dict[str, Any]:
+
+        logger.info("Atualizando Hipótese 3: Capital Cultural")
+
+        capital_minority = self._group_statistics(1, 'CAPITAL_CULTURAL')
+        capital_non_minority = self._group_statistics(0, 'CAPITAL_CULTURAL')
+        nse_minority = self._group_statistics(1, 'NSE')
+        nse_non_minority = self._group_statistics(0, 'NSE')
+
+        t_stat_capital, p_value_capital = ttest_ind_from_stats(*capital_minority, *capital_non_minority)
+        t_stat_nse, p_value_nse = ttest_ind_from_stats(*nse_minority, *nse_non_minority)
+
+        capital, nse, minority, math, port = (GRAM_COLUMNS.index(c) for c in GRAM_COLUMNS[1:])
+
+        correlation_capital_math = self._correlation_from_gram(self.gram, capital, math)
+        correlation_capital_port = self._correlation_from_gram(self.gram, capital, port)
+
+        coef_math, r2_math = self._regression_from_gram(self.gram, [capital, nse, minority], math)
+        coef_port, r2_port = self._regression_from_gram(self.gram, [capital, nse, minority], port)
+
+        result = {
+            'hypothesis': 'Capital Cultural',
+            'description': 'Diferenças no ambiente familiar e recursos educacionais domésticos',
+            'tests': {
+                'cultural_capital_difference': {
+                    't_statistic': t_stat_capital,
+                    'p_value': p_value_capital,
+                    'significant': p_value_capital < 0.05,
+                    'effect_size': capital_minority[0] - capital_non_minority[0]
+                },
+                'nse_difference': {
+                    't_statistic': t_stat_nse,
+                    'p_value': p_value_nse,
+                    'significant': p_value_nse < 0.05,
+                    'effect_size': nse_minority[0] - nse_non_minority[0]
+                },
+                'correlation_capital_math': correlation_capital_math,
+                'correlation_capital_portuguese': correlation_capital_port,
+                'regression_math': {
+                    'coefficient_capital': coef_math[0],
+                    'coefficient_nse': coef_math[1],
+                    'coefficient_minority': coef_math[2],
+                    'r_squared': r2_math
+                },
+                'regression_portuguese': {
+                    'coefficient_capital': coef_port[0],
+                    'coefficient_nse': coef_port[1],
+                    'coefficient_minority': coef_port[2],
+                    'r_squared': r2_port
+                }
+            },
+            'summary_stats': {
+                'avg_capital_minority': capital_minority[0],
+                'avg_capital_non_minority': capital_non_minority[0],
+                'avg_nse_minority': nse_minority[0],
+                'avg_nse_non_minority': nse_non_minority[0]
+            }
+        }
+
+        self.results['hypothesis_3'] = result
+        return result
+
+    def test_hypothesis_4_peer_effect(self) -> Dict[str, Any]:
+
+        logger.info("Atualizando Hipótese 4: Efeito de Pares")
+
+        counts, school_minority_pct = self._school_table()
+        share = school_minority_pct['MINORIA'].to_numpy()
+        gram = self._peer_gram()
+
+        peer, capital, nse, minority, math, port = range(1, 7)
+
+        correlation_peer_math = self._correlation_from_gram(gram, peer, math)
+        correlation_peer_port = self._correlation_from_gram(gram, peer, port)
+
+        coef_math, r2_math = self._regression_from_gram(gram, [peer, nse, capital, minority], math)
+        coef_port, r2_port = self._regression_from_gram(gram, [peer, nse, capital, minority], port)
+
+        q1_limit = self._weighted_quantile(share, counts, 0.25)
+        q4_limit = self._weighted_quantile(share, counts, 0.75)
+        q1_schools = share <= q1_limit
+        q4_schools = share >= q4_limit
+
+        q1_math = self._pooled_group(q1_schools, 'NOTA_MATEMATICA')
+        q4_math = self._pooled_group(q4_schools, 'NOTA_MATEMATICA')
+        q1_port = self._pooled_group(q1_schools, 'NOTA_PORTUGUES')
+        q4_port = self._pooled_group(q4_schools, 'NOTA_PORTUGUES')
+
+        t_stat_peer_math, p_value_peer_math = ttest_ind_from_stats(*q1_math, *q4_math)
+        t_stat_peer_port, p_value_peer_port = ttest_ind_from_stats(*q1_port, *q4_port)
+
+        result = {
+            'hypothesis': 'Efeito de Pares',
+            'description': 'Impacto negativo da composição socioeconômica da turma',
+            'tests': {
+                'peer_effect_math': {
+                    't_statistic': t_stat_peer_math,
+                    'p_value': p_value_peer_math,
+                    'significant': p_value_peer_math < 0.05,
+                    'effect_size': q1_math[0] - q4_math[0]
+                },
+                'peer_effect_portuguese': {
+                    't_statistic': t_stat_peer_port,
+                    'p_value': p_value_peer_port,
+                    'significant': p_value_peer_port < 0.05,
+                    'effect_size': q1_port[0] - q4_port[0]
+                },
+                'correlation_peer_math': correlation_peer_math,
+                'correlation_peer_portuguese': correlation_peer_port,
+                'regression_math': {
+                    'coefficient_peer': coef_math[0],
+                    'coefficient_nse': coef_math[1],
+                    'coefficient_capital': coef_math[2],
+                    'coefficient_minority': coef_math[3],
+                    'r_squared': r2_math
+                },
+                'regression_portuguese': {
+                    'coefficient_peer': coef_port[0],
+                    'coefficient_nse': coef_port[1],
+                    'coefficient_capital': coef_port[2],
+                    'coefficient_minority': coef_port[3],
+                    'r_squared': r2_port
+                }
+            },
+            'summary_stats': {
+                'avg_score_q1_math': q1_math[0],
+                'avg_score_q4_math': q4_math[0],
+                'avg_score_q1_portuguese': q1_port[0],
+                'avg_score_q4_portuguese': q4_port[0]
+            }
+        }
+
+        self.results['hypothesis_4'] = result
+        return result
+
+    def run_all_tests(self) -> Dict[str, Any]:
+
+        if self.n_students == 0:
+            raise ValueError("Nenhum aluno foi incorporado. Execute partial_fit() primeiro.")
+
+        logger.info(f"Atualizando todos os testes de hipóteses ({self.n_students} alunos, "
+                    f"{len(self.school_index)} escolas)")
+
+        self.test_hypothesis_1_segregation()
+        self.test_hypothesis_2_teacher_quality()
+        self.test_hypothesis_3_cultural_capital()
+        self.test_hypothesis_4_peer_effect()
+
+        return self.results
+
+    def apply_multiple_testing_correction(self, method: str = 'fdr_bh', alpha: float = 0.05) -> Dict[str, Any]:
+
+        if not self.results:
+            raise ValueError("Nenhum teste foi executado ainda. Execute run_all_tests() primeiro.")
+
+        return annotate_results(self.results, method=method, alpha=alpha)
@@ -0,0 +1,104 @@
+import numpy as np
+from typing import Dict, List, Tuple, Any
+import logging
+
+logger = logging.getLogger(__name__)
+
+CORRECTION_METHODS = ('bonferroni', 'holm', 'fdr_bh', 'fdr_by')
+
+def adjust_p_values(p_values, method: str = 'fdr_bh') -> np.ndarray:
+
+    if method not in CORRECTION_METHODS:
+        raise ValueError(f"Método de correção desconhecido: {method}. Use um de {CORRECTION_METHODS}")
+
+    p_values = np.asarray(p_values, dtype=np.float64)
+    adjusted = np.full(p_values.shape, np.nan)
+
+    valid = np.isfinite(p_values)
+    valid_p = p_values[valid]
+    n_tests = valid_p.size
+
+    if n_tests == 0:
+        return adjusted
+
+    if method == 'bonferroni':
+        adjusted[valid] = np.minimum(valid_p * n_tests, 1.0)
+        return adjusted
+
+    order = np.argsort(valid_p, kind='stable')
+    sorted_p = valid_p[order]
+    del valid_p
+
+    if method == 'holm':
+        sorted_p *= np.arange(n_tests, 0, -1, dtype=np.float64)
+        np.maximum.accumulate(sorted_p, out=sorted_p)
+    else:
+        ranks = np.arange(1, n_tests + 1, dtype=np.float64)
+        sorted_p *= n_tests
+        sorted_p /= ranks
+        if method == 'fdr_by':
+            sorted_p *= np.sum(1.0 / ranks)
+        del ranks
+        reversed_p = sorted_p[::-1]
+        np.minimum.accumulate(reversed_p, out=reversed_p)
+
+    np.minimum(sorted_p, 1.0, out=sorted_p)
+
+    valid_adjusted = np.empty(n_tests, dtype=np.float64)
+    valid_adjusted[order] = sorted_p
+    adjusted[valid] = valid_adjusted
+
+    return adjusted
+
+def is_significant(test: Dict[str, Any]) -> bool:
+
+    return bool(test.get('significant_adjusted', test.get('significant', False)))
+
+def format_p_values(test: Dict[str, Any]) -> str:
+
+    if 'significant_adjusted' in test:
+        return (f"p ajustado ({test['correction_method']}) = {test['p_value_adjusted']:.4f}; "
+                f"p = {test['p_value']:.4f}")
+    return f"p = {test['p_value']:.4f}"
+
+def hypothesis_confirmed(result: Dict[str, Any]) -> bool:
+
+    return any(is_significant(test) for test in result['tests'].values() if isinstance(test, dict))
+
+def collect_p_values(results: Dict[str, Any], field: str = 'p_value') -> Tuple[List[Tuple[str, ...]], np.ndarray]:
+
+    paths = []
+    p_values = []
+    stack = [((), results)]
+
+    while stack:
+        path, node = stack.pop()
+        if 'p_value' in node:
+            paths.append(path)
+            p_values.append(node[field])
+            continue
+        for key in reversed(list(node.keys())):
+            value = node[key]
+            if isinstance(value, dict):
+                stack.append((path + (key,), value))
+
+    return paths, np.asarray(p_values, dtype=np.float64)
+
+def annotate_results(results: Dict[str, Any], method: str = 'fdr_bh',
+                     alpha: float = 0.05) -> Dict[str, Any]:
+
+    paths, p_values = collect_p_values(results)
+    adjusted = adjust_p_values(p_values, method)
+    rejected = adjusted < alpha
+
+    for path, p_adjusted, is_rejected in zip(paths, adjusted.tolist(), rejected.tolist()):
+        node = results
+        for key in path:
+            node = node[key]
+        node['p_value_adjusted'] = p_adjusted
+        node['significant_adjusted'] = is_rejected
+        node['correction_method'] = method
+
+    logger.info(f"Correção {method}: {int(rejected.sum())} de {len(paths)} testes significativos (α = {alpha})")
+
+    return results
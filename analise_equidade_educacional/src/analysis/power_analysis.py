@@ -0,0 +1,115 @@
+import os
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional
+import logging
+
+from analysis.hypothesis_tester import HypothesisTester
+from analysis.multiple_testing import annotate_results, collect_p_values
+from data_processing.data_processor import generate_synthetic_data, SAMPLE_EFFECTS
+
+logger = logging.getLogger(__name__)
+
+def _init_worker() -> None:
+
+    logging.getLogger('analysis').setLevel(logging.WARNING)
+
+def _simulate_batch(seeds: List[np.random.SeedSequence], n_students: int, n_schools: Optional[int],
+                    effects: Dict[str, float], alpha: float, correction: Optional[str]) -> Dict[str, int]:
+
+    rejections = {}
+
+    for seed in seeds:
+        data = generate_synthetic_data(n_students, n_schools, effects, np.random.default_rng(seed))
+        results = HypothesisTester(data).run_all_tests()
+
+        field = 'p_value'
+        if correction is not None:
+            annotate_results(results, method=correction, alpha=alpha)
+            field = 'p_value_adjusted'
+
+        paths, p_values = collect_p_values(results, field)
+
+        for path, rejected in zip(paths, (p_values < alpha).tolist()):
+            name = '.'.join((path[0], path[-1]))
+            rejections[name] = rejections.get(name, 0) + int(rejected)
+
+    return rejections
+
+class PowerAnalysis:
+
+    def __init__(self, n_students: int = 50000, n_schools: Optional[int] = None,
+                 effects: Optional[Dict[str, float]] = None, alpha: float = 0.05,
+                 correction: Optional[str] = None):
+
+        self.n_students = n_students
+        self.n_schools = n_schools
+        self.effects = {**SAMPLE_EFFECTS, **(effects or {})}
+        self.alpha = alpha
+        self.correction = correction
+
+    def run(self, n_simulations: int = 1000, batch_size: int = 25,
+            n_workers: Optional[int] = None, seed: int = 42) -> pd.DataFrame:
+
+        logger.info(f"Análise de poder: {n_simulations} simulações com {self.n_students} alunos "
+                    f"(efeitos: {self.effects})")
+
+        seeds = np.random.SeedSequence(seed).spawn(n_simulations)
+        batches = [seeds[start:start + batch_size] for start in range(0, n_simulations, batch_size)]
+        n_workers = n_workers or os.cpu_count() or 1
+
+        rejections = {}
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker) as executor:
+            futures = [executor.submit(_simulate_batch, batch, self.n_students, self.n_schools,
+                                       self.effects, self.alpha, self.correction)
+                       for batch in batches]
+            for completed, future in enumerate(futures, start=1):
+                for name, count in future.result().items():
+                    rejections[name] = rejections.get(name, 0) + count
+                logger.info(f"Lote {completed}/{len(batches)} concluído")
+
+        return self._summarize(rejections, n_simulations)
+
+    def _summarize(self, rejections: Dict[str, int], n_simulations: int) -> pd.DataFrame:
+
+        rows = []
+        for name, count in rejections.items():
+            hypothesis, test = name.split('.', 1)
+            rate = count / n_simulations
+            margin = 1.96 * np.sqrt(rate * (1 - rate) / n_simulations)
+            rows.append({
+                'hypothesis': hypothesis,
+                'test': test,
+                'rejections': count,
+                'rejection_rate': rate,
+                'ci_lower': max(rate - margin, 0.0),
+                'ci_upper': min(rate + margin, 1.0),
+                'n_simulations': n_simulations
+            })
+
+        return pd.DataFrame(rows).sort_values(['hypothesis', 'test']).reset_index(drop=True)
+
+    def power_curve(self, effect: str, values: List[float], **run_kwargs) -> pd.DataFrame:
+
+        if effect not in SAMPLE_EFFECTS:
+            raise ValueError(f"Efeito desconhecido: {effect}. Use um de {list(SAMPLE_EFFECTS)}")
+
+        base_effects = dict(self.effects)
+        curves = []
+
+        try:
+            for value in values:
+                self.effects = {**base_effects, effect: value}
+                summary = self.run(**run_kwargs)
+                summary.insert(0, effect, value)
+                curves.append(summary)
+        finally:
+            self.effects = base_effects
+
+        return pd.concat(curves, ignore_index=True)
+
+if __name__ == "__main__":
+
+    analysis = PowerAnalysis(n_students=50000, n_schools=2000)
+    print(analysis.run(n_simulations=100).to_string(index=False))
@@ -0,0 +1,132 @@
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Any, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+CHUNK_ROWS = 65536
+DEFAULT_TOLERANCE = 1e-3
+
+def to_compact_frame(data: pd.DataFrame) -> pd.DataFrame:
+
+    compact = data.copy()
+
+    for column in compact.columns:
+        dtype = compact[column].dtype
+        if dtype == bool:
+            compact[column] = compact[column].astype(np.int8)
+        elif pd.api.types.is_float_dtype(dtype):
+            compact[column] = compact[column].astype(np.float32)
+        elif pd.api.types.is_integer_dtype(dtype):
+            compact[column] = pd.to_numeric(compact[column], downcast='integer')
+
+    logger.info(f"Dados compactados: {data.memory_usage(deep=True).sum() / 1e6:.1f} MB -> "
+                f"{compact.memory_usage(deep=True).sum() / 1e6:.1f} MB")
+    return compact
+
+def design_matrix(data: pd.DataFrame, columns: List[str], compact: bool = False) -> np.ndarray:
+
+    if compact:
+        return data[columns].to_numpy(dtype=np.float32)
+    return data[columns].values
+
+def centered_cross_products(X: np.ndarray, y: np.ndarray) -> tuple:
+
+    x_means = X.mean(axis=0, dtype=np.float64)
+    y_mean = y.mean(dtype=np.float64)
+    x_shift = x_means.astype(X.dtype)
+    y_shift = X.dtype.type(y_mean)
+
+    sxx = np.zeros((X.shape[1], X.shape[1]), dtype=np.float64)
+    sxy = np.zeros(X.shape[1], dtype=np.float64)
+
+    for start in range(0, X.shape[0], CHUNK_ROWS):
+        X_chunk = X[start:start + CHUNK_ROWS] - x_shift
+        y_chunk = y[start:start + CHUNK_ROWS].astype(X.dtype, copy=False) - y_shift
+        sxx += X_chunk.T @ X_chunk
+        sxy += X_chunk.T @ y_chunk
+
+    return x_means, y_mean, sxx, sxy
+
+class CompactLinearRegression:
+
+    def fit(self, X: np.ndarray, y: np.ndarray) -> 'CompactLinearRegression':
+
+        x_means, y_mean, sxx, sxy = centered_cross_products(X, y)
+
+        self.coef_ = np.linalg.solve(sxx, sxy)
+        self.intercept_ = y_mean - x_means @ self.coef_
+        return self
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+
+        return X @ self.coef_.astype(X.dtype) + X.dtype.type(self.intercept_)
+
+    def score(self, X: np.ndarray, y: np.ndarray) -> float:
+
+        y_mean = y.mean(dtype=np.float64)
+        residual = 0.0
+        total = 0.0
+
+        for start in range(0, X.shape[0], CHUNK_ROWS):
+            y_chunk = y[start:start + CHUNK_ROWS].astype(np.float64)
+            errors = y_chunk - self.predict(X[start:start + CHUNK_ROWS])
+            residual += float(errors @ errors)
+            total += float(((y_chunk - y_mean) ** 2).sum())
+
+        return 1 - residual / total
+
+def _flatten_numeric(results: Dict[str, Any], prefix: str = '') -> Dict[str, float]:
+
+    flat = {}
+
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else str(key)
+        if isinstance(value, dict):
+            flat.update(_flatten_numeric(value, name))
+        elif isinstance(value, (bool, np.bool_)):
+            continue
+        elif isinstance(value, (int, float, np.number)):
+            flat[name] = float(value)
+
+    return flat
+
+def compare_results(reference: Dict[str, Any], candidate: Dict[str, Any],
+                    tolerance: float = DEFAULT_TOLERANCE) -> Dict[str, float]:
+
+    reference_flat = _flatten_numeric(reference)
+    candidate_flat = _flatten_numeric(candidate)
+
+    missing = sorted(set(reference_flat) - set(candidate_flat))
+    if missing:
+        raise ValueError(f"Estatísticas ausentes no modo compacto: {missing}")
+
+    deviations = {}
+    for name, expected in reference_flat.items():
+        actual = candidate_flat[name]
+        if np.isnan(expected) and np.isnan(actual):
+            deviations[name] = 0.0
+            continue
+        deviations[name] = abs(actual - expected) / max(abs(expected), 1.0)
+
+    failures = {name: deviation for name, deviation in deviations.items()
+                if not deviation <= tolerance}
+    if failures:
+        details = "\n".join(f"  {name}: desvio relativo {deviation:.2e}"
+                            for name, deviation in sorted(failures.items()))
+        raise ValueError(f"Modo compacto excedeu a tolerância de {tolerance:.0e} em "
+                         f"{len(failures)} estatística(s):\n{details}")
+
+    logger.info(f"Modo compacto validado: {len(deviations)} estatísticas, desvio máximo "
+                f"{max(deviations.values(), default=0.0):.2e}")
+    return deviations
+
+def validate_compact_mode(data: pd.DataFrame, tolerance: float = DEFAULT_TOLERANCE) -> Dict[str, float]:
+
+    from analysis.hypothesis_tester import HypothesisTester
+
+    reference = HypothesisTester(data.copy()).run_all_tests()
+    candidate = HypothesisTester(to_compact_frame(data), compact=True).run_all_tests()
+
+    return compare_results(reference, candidate, tolerance)
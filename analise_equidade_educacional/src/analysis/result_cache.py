@@ -0,0 +1,88 @@
+import os
+import json
+import pickle
+import pandas as pd
+from typing import Dict, Any, Optional
+import logging
+from pathlib import Path
+
+from data_processing.fingerprint import HASH_ALGORITHM, fingerprint_dataframe, fingerprint_files, fingerprint_text
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_SOURCES = [
+    Path(__file__).parent / 'hypothesis_tester.py',
+    Path(__file__).parent / 'school_tests.py',
+    Path(__file__).parent / 'precision.py',
+    Path(__file__).parent / 'multiple_testing.py',
+]
+
+class ResultCache:
+    
+    def __init__(self, cache_dir: str = ".cache/resultados", max_entries: int = 64,
+                 max_bytes: int = 256 * 1024 * 1024):
+        
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.code_version = fingerprint_files(ANALYSIS_SOURCES)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    def make_key(self, data: pd.DataFrame, params: Optional[Dict[str, Any]] = None) -> str:
+        
+        key_parts = {
+            'data': fingerprint_dataframe(data),
+            'params': params or {},
+            'code': self.code_version,
+            'hash': HASH_ALGORITHM
+        }
+        return fingerprint_text(json.dumps(key_parts, sort_keys=True, default=str))
+    
+    def _entry_path(self, key: str) -> Path:
+        
+        return self.cache_dir / f"{key}.pkl"
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        
+        path = self._entry_path(key)
+        
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Entrada de cache corrompida {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+        
+        os.utime(path)
+        logger.info(f"Resultados recuperados do cache ({key[:12]})")
+        return value
+    
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        
+        path = self._entry_path(key)
+        tmp_path = path.with_suffix('.tmp')
+        
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        
+        self._evict()
+    
+    def _evict(self) -> None:
+        
+        entries = sorted(self.cache_dir.glob('*.pkl'), key=lambda p: p.stat().st_mtime, reverse=True)
+        
+        total_bytes = 0
+        for index, path in enumerate(entries):
+            total_bytes += path.stat().st_size
+            if index >= self.max_entries or total_bytes > self.max_bytes:
+                path.unlink(missing_ok=True)
+                logger.info(f"Entrada removida do cache: {path.name}")
+    
+    def clear(self) -> None:
+        
+        for path in self.cache_dir.glob('*.pkl'):
+            path.unlink(missing_ok=True)
@@ -0,0 +1,86 @@
+import pandas as pd
+from scipy import stats
+from scipy.stats import ttest_ind
+from sklearn.linear_model import LinearRegression
+from typing import Dict, Tuple, Any
+
+from analysis.precision import CompactLinearRegression, design_matrix
+
+def split_by_minority(schools: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+
+    median_minority = schools['MINORIA'].median()
+    return schools[schools['MINORIA'] >= median_minority], schools[schools['MINORIA'] < median_minority]
+
+def difference_test(high: pd.DataFrame, low: pd.DataFrame, column: str) -> Dict[str, Any]:
+
+    t_statistic, p_value = ttest_ind(high[column], low[column])
+
+    return {
+        't_statistic': t_statistic,
+        'p_value': p_value,
+        'significant': p_value < 0.05,
+        'effect_size': high[column].mean() - low[column].mean()
+    }
+
+def segregation_test(schools: pd.DataFrame) -> Dict[str, Any]:
+
+    high_minority_schools, low_minority_schools = split_by_minority(schools)
+
+    correlation_infra = stats.pearsonr(schools['MINORIA'], schools['INFRA_BOA'])[0]
+
+    return {
+        'hypothesis': 'Segregação Socioespacial',
+        'description': 'Alunos minoritários concentrados em escolas com menor infraestrutura',
+        'tests': {
+            'infrastructure_difference': difference_test(high_minority_schools, low_minority_schools, 'INFRA_BOA'),
+            'math_score_difference': difference_test(high_minority_schools, low_minority_schools,
+                                                     'NOTA_MATEMATICA'),
+            'portuguese_score_difference': difference_test(high_minority_schools, low_minority_schools,
+                                                           'NOTA_PORTUGUES'),
+            'correlation_minority_infra': correlation_infra
+        },
+        'summary_stats': {
+            'high_minority_schools': len(high_minority_schools),
+            'low_minority_schools': len(low_minority_schools),
+            'avg_infra_high_minority': high_minority_schools['INFRA_BOA'].mean(),
+            'avg_infra_low_minority': low_minority_schools['INFRA_BOA'].mean()
+        }
+    }
+
+def teacher_quality_test(schools: pd.DataFrame, compact: bool = False) -> Dict[str, Any]:
+
+    high_minority_schools, low_minority_schools = split_by_minority(schools)
+
+    correlation_teacher = stats.pearsonr(schools['MINORIA'], schools['DOCENTE_QUALIFICADO'])[0]
+
+    X = design_matrix(schools, ['DOCENTE_QUALIFICADO', 'MINORIA'], compact)
+    y_math = schools['NOTA_MATEMATICA'].values
+    y_port = schools['NOTA_PORTUGUES'].values
+
+    regression = CompactLinearRegression if compact else LinearRegression
+    reg_math = regression().fit(X, y_math)
+    reg_port = regression().fit(X, y_port)
+
+    return {
+        'hypothesis': 'Qualidade Docente',
+        'description': 'Professores menos qualificados em escolas com maior concentração de minorias',
+        'tests': {
+            'teacher_quality_difference': difference_test(high_minority_schools, low_minority_schools,
+                                                          'DOCENTE_QUALIFICADO'),
+            'correlation_minority_teacher': correlation_teacher,
+            'regression_math': {
+                'coefficient_teacher': reg_math.coef_[0],
+                'coefficient_minority': reg_math.coef_[1],
+                'r_squared': reg_math.score(X, y_math)
+            },
+            'regression_portuguese': {
+                'coefficient_teacher': reg_port.coef_[0],
+                'coefficient_minority': reg_port.coef_[1],
+                'r_squared': reg_port.score(X, y_port)
+            }
+        },
+        'summary_stats': {
+            'avg_teacher_quality_high_minority': high_minority_schools['DOCENTE_QUALIFICADO'].mean(),
+            'avg_teacher_quality_low_minority': low_minority_schools['DOCENTE_QUALIFICADO'].mean()
+        }
+    }
@@ -3,6 +3,8 @@ import numpy as np
 from typing import Dict, List, Tuple, Optional
 import logging
 from pathlib import Path
+
+from pipeline.instrumentation import instrumented
 vasco_config = True
 vasco_debug = False
 vasco_version = '1.0'
@@ -18,6 +20,7 @@ class DataProcessor:
         self.processed_data = None
         self.vasco_config = True
         
+    @instrumented('DataProcessor.load_data', rows=lambda result, self: len(result))
     def load_data(self) -> pd.DataFrame:
         try:
             logger.info(f"Carregando dados de {self.data_path}")
@@ -28,6 +31,7 @@ class DataProcessor:
             logger.error(f"Erro ao carregar dados: {e}")
             raise
     
+    @instrumented('DataProcessor.clean_data', rows=lambda result, self: len(result))
     def clean_data(self) -> pd.DataFrame:
         
         if self.raw_data is None:
@@ -99,7 +103,7 @@ class DataProcessor:
         
         vasco_df = self.processed_data
         
-        vasco_summary = {
+        summary = {
             'total_alunos': len(vasco_df),
             'total_escolas': vasco_df['CODIGO_ESCOLA'].nunique() if 'CODIGO_ESCOLA' in vasco_df.columns else 'N/A',
             'media_matematica': vasco_df['NOTA_MATEMATICA'].mean(),
@@ -120,42 +124,52 @@ class DataProcessor:
         self.processed_data.to_csv(output_path, index=False)
         logger.info(f"Dados processados salvos em {output_path}")
 
-def create_sample_data(n_students: int = 10000) -> pd.DataFrame:
-    
-    np.random.seed(42)
-    
-    vasco_data = {
-        'CODIGO_ESCOLA': np.random.randint(1000, 9999, n_students),
-        'COR_RACA': np.random.choice(['BRANCA', 'PRETA', 'PARDA', 'AMARELA', 'INDIGENA'], 
-                                    n_students, p=[0.4, 0.1, 0.4, 0.05, 0.05]),
-        'NSE': np.random.normal(0, 1, n_students),
-        'INFRAESTRUTURA': np.random.uniform(0, 10, n_students),
-        'QUALIFICACAO_DOCENTE': np.random.uniform(0, 10, n_students),
-        'CAPITAL_CULTURAL': np.random.uniform(0, 10, n_students),
-        'TAMANHO_TURMA': np.random.randint(15, 35, n_students),
-        'PERCENTUAL_MINORIAS_TURMA': np.random.uniform(0, 1, n_students)
-    }
-    
-    vasco_df = pd.DataFrame(vasco_data)
+SAMPLE_EFFECTS = {
+    'minority': -50,
+    'nse': 20,
+    'infrastructure': 5,
+    'teacher': 3,
+    'cultural_capital': 4,
+    'peer': -30,
+    'noise': 30
+}
+
+def generate_synthetic_data(n_students: int = 10000, n_schools: Optional[int] = None,
+                            effects: Optional[Dict[str, float]] = None,
+                            rng: Optional[np.random.Generator] = None) -> pd.DataFrame:
+    
+    rng = rng if rng is not None else np.random.default_rng()
+    effects = {**SAMPLE_EFFECTS, **(effects or {})}
+    
+    if n_schools is None:
+        school_codes = rng.integers(1000, 9999, n_students)
+    else:
+        school_codes = 1000 + rng.integers(0, n_schools, n_students)
+    
+    vasco_df = pd.DataFrame({
+        'CODIGO_ESCOLA': school_codes,
+        'COR_RACA': rng.choice(['BRANCA', 'PRETA', 'PARDA', 'AMARELA', 'INDIGENA'],
+                               n_students, p=[0.4, 0.1, 0.4, 0.05, 0.05]),
+        'NSE': rng.normal(0, 1, n_students),
+        'INFRAESTRUTURA': rng.uniform(0, 10, n_students),
+        'QUALIFICACAO_DOCENTE': rng.uniform(0, 10, n_students),
+        'CAPITAL_CULTURAL': rng.uniform(0, 10, n_students),
+        'TAMANHO_TURMA': rng.integers(15, 35, n_students),
+        'PERCENTUAL_MINORIAS_TURMA': rng.uniform(0, 1, n_students)
+    })
     
     minority_mask = vasco_df['COR_RACA'].isin(['PRETA', 'PARDA', 'INDIGENA'])
-    minority_effect = np.where(minority_mask, -50, 0)
-    nse_effect = vasco_df['NSE'] * 20
-    infra_effect = vasco_df['INFRAESTRUTURA'] * 5
-    docente_effect = vasco_df['QUALIFICACAO_DOCENTE'] * 3
-    capital_effect = vasco_df['CAPITAL_CULTURAL'] * 4
-    peer_effect = vasco_df['PERCENTUAL_MINORIAS_TURMA'] * -30
-    
-    base_score = 200
-    noise = np.random.normal(0, 30, n_students)
     
-    vasco_df['NOTA_MATEMATICA'] = (base_score + minority_effect + nse_effect + 
-                            infra_effect + docente_effect + capital_effect + 
-                            peer_effect + noise).clip(0, 500)
+    score = (200 + np.where(minority_mask, effects['minority'], 0) +
+             vasco_df['NSE'] * effects['nse'] +
+             vasco_df['INFRAESTRUTURA'] * effects['infrastructure'] +
+             vasco_df['QUALIFICACAO_DOCENTE'] * effects['teacher'] +
+             vasco_df['CAPITAL_CULTURAL'] * effects['cultural_capital'] +
+             vasco_df['PERCENTUAL_MINORIAS_TURMA'] * effects['peer'] +
+             rng.normal(0, effects['noise'], n_students))
     
-    vasco_df['NOTA_PORTUGUES'] = (base_score + minority_effect + nse_effect + 
-                           infra_effect + docente_effect + capital_effect + 
-                           peer_effect + noise).clip(0, 500)
+    vasco_df['NOTA_MATEMATICA'] = score.clip(0, 500)
+    vasco_df['NOTA_PORTUGUES'] = score.clip(0, 500)
     
     vasco_df['MINORIA'] = minority_mask
     vasco_df['NSE_ALTO'] = vasco_df['NSE'] >= vasco_df['NSE'].quantile(0.7)
@@ -164,6 +178,10 @@ def create_sample_data(n_students: int = 10000) -> pd.DataFrame:
     
     return vasco_df
 
+def create_sample_data(n_students: int = 10000) -> pd.DataFrame:
+    
+    return generate_synthetic_data(n_students, effects=SAMPLE_EFFECTS, rng=np.random.default_rng(42))
+
 if __name__ == "__main__":
 
     processor = DataProcessor("basededados.xlsx")
@@ -175,10 +193,10 @@ if __name__ == "__main__":
     except:
 
         logger.info("Criando dados de exemplo para demonstração")
-        processor.raw_data = sample_data
+        processor.raw_data = create_sample_data()
         processed_data = processor.clean_data()
     
-    vasco_summary = processor.get_summary_statistics()
+    summary = processor.get_summary_statistics()
     print("Estatísticas Resumidas:")
     for key, value in summary.items():
         print(f"{key}: {value:.2f}" if isinstance(value, float) else f"{key}: {value}")
@@ -0,0 +1,71 @@
+import hashlib
+from typing import Iterable, Union
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+try:
+    import xxhash
+    HASH_ALGORITHM = 'xxh3_128'
+except ImportError:
+    xxhash = None
+    HASH_ALGORITHM = 'blake2b'
+    logger.debug("xxhash não instalado; impressões digitais usam blake2b")
+
+HASHABLE_KINDS = 'biufc'
+DATETIME_KINDS = 'mM'
+
+def _new_hasher():
+    
+    if xxhash is not None:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+def fingerprint_column(series: 'pd.Series') -> str:
+    
+    import numpy as np
+    import pandas as pd
+    
+    hasher = _new_hasher()
+    hasher.update(f"{series.name}|{series.dtype}|{len(series)}".encode('utf-8'))
+    
+    values = series.to_numpy()
+    if values.dtype.kind in DATETIME_KINDS:
+        values = values.view('i8')
+    elif values.dtype.kind not in HASHABLE_KINDS:
+        values = pd.util.hash_array(values.astype(object))
+    
+    hasher.update(memoryview(np.ascontiguousarray(values)).cast('B'))
+    return hasher.hexdigest()
+
+def fingerprint_dataframe(df: 'pd.DataFrame') -> str:
+    
+    hasher = _new_hasher()
+    hasher.update(f"{df.shape[0]}x{df.shape[1]}".encode('utf-8'))
+    
+    for column in df.columns:
+        hasher.update(fingerprint_column(df[column]).encode('utf-8'))
+    
+    return hasher.hexdigest()
+
+def fingerprint_text(text: str) -> str:
+    
+    return fingerprint_bytes(text.encode('utf-8'))
+
+def fingerprint_bytes(data: bytes) -> str:
+    
+    hasher = _new_hasher()
+    hasher.update(data)
+    return hasher.hexdigest()
+
+def fingerprint_files(paths: Iterable[Union[str, Path]]) -> str:
+    
+    hasher = _new_hasher()
+    
+    for path in sorted(Path(p) for p in paths):
+        hasher.update(path.name.encode('utf-8'))
+        if path.exists():
+            hasher.update(path.read_bytes())
+    
+    return hasher.hexdigest()
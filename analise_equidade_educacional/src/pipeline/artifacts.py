@@ -0,0 +1,199 @@
+import os
+import json
+from typing import Dict, List, Any, Callable, Optional, Union
+import logging
+from pathlib import Path
+
+from data_processing.fingerprint import HASH_ALGORITHM, fingerprint_files, fingerprint_text
+
+logger = logging.getLogger(__name__)
+
+SOURCE_ROOT = Path(__file__).resolve().parent.parent
+
+def code_version(*packages: str) -> str:
+
+    return fingerprint_files(path for package in packages for path in (SOURCE_ROOT / package).glob('*.py'))
+
+class Artifact:
+
+    def __init__(self, name: str, outputs: List[Union[str, Path]], build: Callable[[], Any],
+                 inputs: Optional[Dict[str, Any]] = None, deps: Optional[List[str]] = None):
+
+        self.name = name
+        self.outputs = [Path(output) for output in outputs]
+        self.build = build
+        self.inputs = inputs or {}
+        self.deps = deps or []
+
+    def outputs_exist(self) -> bool:
+
+        return all(output.exists() for output in self.outputs)
+
+    def outputs_hash(self) -> str:
+
+        return fingerprint_files(self.outputs)
+
+class ArtifactGraph:
+
+    def __init__(self, manifest_path: str = "reports/.artefatos.json"):
+
+        self.manifest_path = Path(manifest_path)
+        self.artifacts = {}
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> Dict[str, Dict[str, str]]:
+
+        try:
+            return json.loads(self.manifest_path.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return {}
+        except ValueError as e:
+            logger.warning(f"Manifesto de artefatos inválido, reconstruindo tudo: {e}")
+            return {}
+
+    def _save_manifest(self) -> None:
+
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(self.manifest, indent=2, sort_keys=True), encoding='utf-8')
+        os.replace(tmp_path, self.manifest_path)
+
+    def add(self, name: str, outputs: List[Union[str, Path]], build: Callable[[], Any],
+            inputs: Optional[Dict[str, Any]] = None, deps: Optional[List[str]] = None) -> Artifact:
+
+        for dep in deps or []:
+            if dep not in self.artifacts:
+                raise ValueError(f"Dependência desconhecida para {name}: {dep}")
+
+        artifact = Artifact(name, outputs, build, inputs, deps)
+        self.artifacts[name] = artifact
+        return artifact
+
+    def _signature(self, artifact: Artifact) -> str:
+
+        signature_parts = {
+            'inputs': artifact.inputs,
+            'deps': {dep: self.manifest[dep]['outputs'] for dep in artifact.deps},
+            'outputs': sorted(str(output) for output in artifact.outputs),
+            'hash': HASH_ALGORITHM
+        }
+        return fingerprint_text(json.dumps(signature_parts, sort_keys=True, default=str))
+
+    def _closure(self, targets: List[str]) -> List[str]:
+
+        ordered = []
+        visited = set()
+        stack = [(name, False) for name in reversed(targets)]
+
+        while stack:
+            name, expanded = stack.pop()
+            if name not in self.artifacts:
+                raise ValueError(f"Artefato desconhecido: {name}. Use um de {list(self.artifacts)}")
+            if expanded:
+                ordered.append(name)
+                continue
+            if name in visited:
+                continue
+            visited.add(name)
+            stack.append((name, True))
+            stack.extend((dep, False) for dep in reversed(self.artifacts[name].deps) if dep not in visited)
+
+        return ordered
+
+    def is_stale(self, name: str) -> bool:
+
+        artifact = self.artifacts[name]
+        entry = self.manifest.get(name)
+
+        if entry is None or not artifact.outputs_exist():
+            return True
+        if any(dep not in self.manifest for dep in artifact.deps):
+            return True
+
+        return entry['signature'] != self._signature(artifact)
+
+    def _prepare(self, name: str, force: bool) -> bool:
+
+        if not force and not self.is_stale(name):
+            logger.info(f"Artefato atualizado, pulando: {name}")
+            return False
+
+        logger.info(f"Construindo artefato: {name}")
+        for output in self.artifacts[name].outputs:
+            output.parent.mkdir(parents=True, exist_ok=True)
+        return True
+
+    def _record(self, name: str) -> None:
+
+        artifact = self.artifacts[name]
+
+        missing = [str(output) for output in artifact.outputs if not output.exists()]
+        if missing:
+            raise RuntimeError(f"Artefato {name} não gerou as saídas esperadas: {missing}")
+
+        self.manifest[name] = {
+            'signature': self._signature(artifact),
+            'outputs': artifact.outputs_hash()
+        }
+        self._save_manifest()
+
+    def build(self, targets: Optional[List[str]] = None, force: bool = False) -> List[str]:
+
+        built = []
+
+        for name in self._closure(targets or list(self.artifacts)):
+            if not self._prepare(name, force):
+                continue
+
+            self.artifacts[name].build()
+            self._record(name)
+            built.append(name)
+
+        logger.info(f"Artefatos: {len(built)} construído(s)")
+        return built
+
+    async def _scheduled_build(self, scheduler: 'JobScheduler', name: str, force: bool,
+                               dep_tasks: List['asyncio.Task']) -> bool:
+
+        import asyncio
+
+        await asyncio.gather(*dep_tasks)
+        if not self._prepare(name, force):
+            return False
+
+        await scheduler.run(self.artifacts[name].build, kind='io')
+        self._record(name)
+        return True
+
+    async def _schedule(self, names: List[str], force: bool, scheduler: 'JobScheduler') -> List[str]:
+
+        tasks = {}
+
+        async with scheduler:
+            for name in names:
+                dep_tasks = [tasks[dep] for dep in self.artifacts[name].deps if dep in tasks]
+                tasks[name] = await scheduler.submit(name, self._scheduled_build, scheduler, name, force, dep_tasks)
+            results, failures = await scheduler.join()
+
+        if failures:
+            details = "\n".join(f"  {name}: {error}" for name, error in failures.items())
+            raise RuntimeError(f"Falha ao construir {len(failures)} artefato(s):\n{details}")
+
+        return [name for name in names if results[name]]
+
+    def build_scheduled(self, targets: Optional[List[str]] = None, force: bool = False,
+                        io_workers: int = 4, max_pending: Optional[int] = None) -> List[str]:
+
+        names = self._closure(targets or list(self.artifacts))
+        if not force and not any(self.is_stale(name) for name in names):
+            logger.info(f"Artefatos atualizados, pulando: {', '.join(names)}")
+            return []
+
+        import asyncio
+        from pipeline.scheduler import JobScheduler
+
+        scheduler = JobScheduler(cpu_workers=1, io_workers=io_workers, max_pending=max_pending)
+        built = asyncio.run(self._schedule(names, force, scheduler))
+
+        logger.info(f"Artefatos: {len(built)} construído(s)")
+        return built
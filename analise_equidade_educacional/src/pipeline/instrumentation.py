@@ -0,0 +1,234 @@
+import os
+import sys
+import json
+import time
+import threading
+import functools
+from contextlib import contextmanager
+from typing import Dict, List, Any, Callable, Optional
+import logging
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = "analise_equidade"
+
+_WINDOW_LOCK = threading.Lock()
+_open_windows = {}
+_folded_peak = 0
+
+def peak_rss_bytes() -> Optional[int]:
+
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak = peak if sys.platform == 'darwin' else peak * 1024
+    return max(peak, _folded_peak)
+
+def high_water_rss_bytes() -> Optional[int]:
+
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        return None
+    return None
+
+def _fold_high_water(high_water: int) -> None:
+
+    global _folded_peak
+
+    _folded_peak = max(_folded_peak, high_water)
+    for window in _open_windows.values():
+        window['peak'] = max(window['peak'], high_water)
+
+def open_memory_window() -> Optional[Dict[str, int]]:
+
+    with _WINDOW_LOCK:
+        high_water = high_water_rss_bytes()
+        if high_water is None:
+            return None
+        _fold_high_water(high_water)
+
+        try:
+            with open('/proc/self/clear_refs', 'w') as f:
+                f.write('5')
+        except OSError:
+            return None
+
+        window = {'peak': current_rss_bytes() or 0}
+        _open_windows[id(window)] = window
+        return window
+
+def close_memory_window(window: Optional[Dict[str, int]]) -> Optional[int]:
+
+    if window is None:
+        return None
+
+    with _WINDOW_LOCK:
+        del _open_windows[id(window)]
+        high_water = high_water_rss_bytes()
+        if high_water is None:
+            return None
+        _fold_high_water(high_water)
+        return max(window['peak'], high_water)
+
+def current_rss_bytes() -> Optional[int]:
+
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+class Instrumentation:
+
+    def __init__(self):
+
+        self.records = []
+        self.enabled = True
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self) -> List[str]:
+
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def measure(self, name: str, rows: Optional[int] = None):
+
+        if not self.enabled:
+            yield {}
+            return
+
+        stack = self._stack()
+        record = {
+            'name': name,
+            'parent': stack[-1] if stack else None,
+            'rows': rows,
+            'started_at': time.time()
+        }
+        rss_before = current_rss_bytes()
+        window = open_memory_window()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        stack.append(name)
+
+        try:
+            yield record
+            record['status'] = 'ok'
+        except BaseException:
+            record['status'] = 'erro'
+            raise
+        finally:
+            stack.pop()
+            stage_peak = close_memory_window(window)
+            record['wall_seconds'] = time.perf_counter() - wall_start
+            record['cpu_seconds'] = time.process_time() - cpu_start
+            record['peak_rss_bytes'] = peak_rss_bytes()
+            record['stage_peak_rss_bytes'] = stage_peak
+            record['rss_before_bytes'] = rss_before
+            record['rss_growth_bytes'] = (max(stage_peak - rss_before, 0)
+                                          if stage_peak is not None and rss_before is not None else None)
+            with self._lock:
+                self.records.append(record)
+
+    def instrumented(self, name: Optional[str] = None, rows: Optional[Callable[..., Optional[int]]] = None):
+
+        def decorator(func):
+
+            metric_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.measure(metric_name) as record:
+                    result = func(*args, **kwargs)
+                    if rows is not None and self.enabled:
+                        try:
+                            record['rows'] = rows(result, *args, **kwargs)
+                        except Exception as e:
+                            logger.debug(f"Não foi possível contar linhas para {metric_name}: {e}")
+                    return result
+
+            return wrapper
+
+        return decorator
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+
+        summary = {}
+        for record in self.records:
+            entry = summary.setdefault(record['name'], {
+                'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+                'peak_rss_bytes': None, 'stage_peak_rss_bytes': None, 'rss_growth_bytes': None, 'rows': None, 'errors': 0
+            })
+            entry['calls'] += 1
+            entry['wall_seconds'] += record['wall_seconds']
+            entry['cpu_seconds'] += record['cpu_seconds']
+            entry['errors'] += record['status'] != 'ok'
+            if record['peak_rss_bytes'] is not None:
+                entry['peak_rss_bytes'] = max(entry['peak_rss_bytes'] or 0, record['peak_rss_bytes'])
+            if record['stage_peak_rss_bytes'] is not None:
+                entry['stage_peak_rss_bytes'] = max(entry['stage_peak_rss_bytes'] or 0,
+                                                    record['stage_peak_rss_bytes'])
+            if record['rss_growth_bytes'] is not None:
+                entry['rss_growth_bytes'] = max(entry['rss_growth_bytes'] or 0, record['rss_growth_bytes'])
+            if record['rows'] is not None:
+                entry['rows'] = (entry['rows'] or 0) + record['rows']
+
+        return summary
+
+    def write_json(self, path: str) -> None:
+
+        report = {'summary': self.summary(), 'records': self.records}
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(report, indent=2, ensure_ascii=False, default=str), encoding='utf-8')
+        logger.info(f"Métricas de desempenho salvas em {path}")
+
+    def write_prometheus(self, path: str) -> None:
+
+        metrics = [
+            ('wall_seconds', 'Tempo de relógio acumulado por etapa', 'counter'),
+            ('cpu_seconds', 'Tempo de CPU acumulado por etapa', 'counter'),
+            ('peak_rss_bytes', 'Pico de memória residente do processo ao fim da etapa', 'gauge'),
+            ('stage_peak_rss_bytes', 'Pico de memória residente durante a etapa', 'gauge'),
+            ('rss_growth_bytes', 'Pico durante a etapa menos a memória residente no início', 'gauge'),
+            ('rows', 'Linhas processadas por etapa', 'counter'),
+            ('calls', 'Número de execuções da etapa', 'counter'),
+        ]
+        summary = self.summary()
+
+        lines = []
+        for field, description, metric_type in metrics:
+            metric = f"{METRIC_PREFIX}_{field}"
+            lines.append(f"# HELP {metric} {description}")
+            lines.append(f"# TYPE {metric} {metric_type}")
+            for name, entry in summary.items():
+                if entry[field] is not None:
+                    label = name.replace('\\', '\\\\').replace('"', '\\"')
+                    lines.append(f'{metric}{{etapa="{label}"}} {entry[field]}')
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = Path(path).with_suffix('.tmp')
+        tmp_path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+        tmp_path.replace(path)
+        logger.info(f"Métricas Prometheus salvas em {path}")
+
+    def reset(self) -> None:
+
+        with self._lock:
+            self.records = []
+
+INSTRUMENTATION = Instrumentation()
+measure = INSTRUMENTATION.measure
+instrumented = INSTRUMENTATION.instrumented
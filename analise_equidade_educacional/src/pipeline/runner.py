@@ -0,0 +1,158 @@
+import os
+import json
+import time
+import pickle
+from typing import Dict, List, Any, Callable, Optional
+import logging
+from pathlib import Path
+
+from data_processing.fingerprint import HASH_ALGORITHM, fingerprint_text
+from pipeline.instrumentation import measure
+
+logger = logging.getLogger(__name__)
+
+STATE_NAME = "estado.json"
+
+class Stage:
+
+    def __init__(self, name: str, func: Callable[..., Any], deps: Optional[List[str]] = None,
+                 inputs: Optional[Dict[str, Any]] = None, checkpoint: bool = True):
+
+        self.name = name
+        self.func = func
+        self.deps = deps or []
+        self.inputs = inputs or {}
+        self.checkpoint = checkpoint
+
+class PipelineRunner:
+
+    def __init__(self, checkpoint_dir: str = ".cache/etapas"):
+
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.stages = {}
+        self.outputs = {}
+        self.state = self._load_state()
+
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+
+        try:
+            return json.loads((self.checkpoint_dir / STATE_NAME).read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return {}
+        except ValueError as e:
+            logger.warning(f"Estado do pipeline inválido, executando todas as etapas: {e}")
+            return {}
+
+    def _save_state(self) -> None:
+
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        state_path = self.checkpoint_dir / STATE_NAME
+        tmp_path = state_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(self.state, indent=2, sort_keys=True), encoding='utf-8')
+        os.replace(tmp_path, state_path)
+
+    def add_stage(self, name: str, func: Callable[..., Any], deps: Optional[List[str]] = None,
+                  inputs: Optional[Dict[str, Any]] = None, checkpoint: bool = True) -> Stage:
+
+        for dep in deps or []:
+            if dep not in self.stages:
+                raise ValueError(f"Dependência desconhecida para a etapa {name}: {dep}")
+
+        stage = Stage(name, func, deps, inputs, checkpoint)
+        self.stages[name] = stage
+        return stage
+
+    def stage_names(self) -> List[str]:
+
+        return list(self.stages)
+
+    def _checkpoint_path(self, name: str) -> Path:
+
+        return self.checkpoint_dir / f"{name}.pkl"
+
+    def signature(self, name: str) -> str:
+
+        stage = self.stages[name]
+        signature_parts = {
+            'inputs': stage.inputs,
+            'deps': {dep: self.signature(dep) for dep in stage.deps},
+            'hash': HASH_ALGORITHM
+        }
+        return fingerprint_text(json.dumps(signature_parts, sort_keys=True, default=str))
+
+    def is_current(self, name: str) -> bool:
+
+        entry = self.state.get(name)
+        if entry is None or entry['signature'] != self.signature(name):
+            return False
+        return not self.stages[name].checkpoint or self._checkpoint_path(name).exists()
+
+    def load(self, name: str) -> Any:
+
+        if name not in self.outputs:
+            if not self.stages[name].checkpoint:
+                raise ValueError(f"A etapa {name} não grava checkpoint")
+            path = self._checkpoint_path(name)
+            if not self.is_current(name):
+                raise ValueError(f"Checkpoint ausente ou desatualizado para a etapa {name}. Execute-a primeiro.")
+            with open(path, 'rb') as f:
+                self.outputs[name] = pickle.load(f)
+            logger.info(f"Checkpoint carregado: {name}")
+
+        return self.outputs[name]
+
+    def _select(self, start: Optional[str], end: Optional[str]) -> List[str]:
+
+        names = self.stage_names()
+        for bound in (start, end):
+            if bound is not None and bound not in self.stages:
+                raise ValueError(f"Etapa desconhecida: {bound}. Use uma de {names}")
+
+        first = names.index(start) if start is not None else 0
+        last = names.index(end) if end is not None else len(names) - 1
+        if first > last:
+            raise ValueError(f"A etapa inicial {start} vem depois da etapa final {end}")
+
+        return names[first:last + 1]
+
+    def run(self, start: Optional[str] = None, end: Optional[str] = None, force: bool = False) -> List[str]:
+
+        selected = self._select(start, end)
+        executed = []
+
+        for name in selected:
+            stage = self.stages[name]
+
+            if not force and start is None and stage.checkpoint and self.is_current(name):
+                logger.info(f"Etapa {name}: checkpoint válido, pulando")
+                continue
+
+            logger.info(f"Etapa {name}: executando")
+            started = time.perf_counter()
+            with measure(f"etapa.{name}"):
+                output = stage.func(*(self.load(dep) for dep in stage.deps))
+
+            if stage.checkpoint:
+                self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+                path = self._checkpoint_path(name)
+                tmp_path = path.with_suffix('.tmp')
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump(output, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+
+            self.outputs[name] = output
+            self.state[name] = {'signature': self.signature(name), 'seconds': time.perf_counter() - started}
+            self._save_state()
+            executed.append(name)
+
+            logger.info(f"Etapa {name}: concluída em {self.state[name]['seconds']:.2f}s")
+
+        return executed
+
+    def clear(self) -> None:
+
+        for name in self.stages:
+            self._checkpoint_path(name).unlink(missing_ok=True)
+        (self.checkpoint_dir / STATE_NAME).unlink(missing_ok=True)
+        self.state = {}
+        self.outputs = {}
@@ -0,0 +1,116 @@
+import os
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Tuple, Any, Callable, Awaitable, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+JOB_KINDS = ('cpu', 'io')
+
+def log_progress(progress: Dict[str, int]) -> None:
+
+    finished = progress['concluidas'] + progress['erros'] + progress['canceladas']
+    logger.info(f"Progresso: {finished}/{progress['total']} tarefa(s) finalizada(s) "
+                f"({progress['erros']} com erro, {progress['canceladas']} cancelada(s))")
+
+class JobScheduler:
+
+    def __init__(self, cpu_workers: Optional[int] = None, io_workers: int = 2, max_pending: Optional[int] = None,
+                 initializer: Optional[Callable[..., None]] = None, initargs: Tuple = (),
+                 progress: Optional[Callable[[Dict[str, int]], None]] = log_progress):
+
+        if io_workers < 1:
+            raise ValueError(f"io_workers deve ser positivo, recebido {io_workers}")
+
+        self.cpu_workers = cpu_workers or os.cpu_count() or 1
+        self.io_workers = io_workers
+        self.max_pending = max_pending or 2 * (self.cpu_workers + self.io_workers)
+        self.initializer = initializer
+        self.initargs = initargs
+        self.progress_callback = progress
+        self.tasks = {}
+        self.counts = {'concluidas': 0, 'erros': 0, 'canceladas': 0}
+        self._executors = {}
+        self._slots = {}
+        self._pending = None
+
+    async def __aenter__(self) -> 'JobScheduler':
+
+        self._executors = {
+            'cpu': ProcessPoolExecutor(max_workers=self.cpu_workers, initializer=self.initializer,
+                                       initargs=self.initargs),
+            'io': ThreadPoolExecutor(max_workers=self.io_workers)
+        }
+        self._slots = {'cpu': asyncio.Semaphore(self.cpu_workers), 'io': asyncio.Semaphore(self.io_workers)}
+        self._pending = asyncio.Semaphore(self.max_pending)
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+
+        if exc_type is not None:
+            self.cancel()
+        await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+
+        for executor in self._executors.values():
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    async def run(self, func: Callable[..., Any], *args, kind: str = 'cpu') -> Any:
+
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Tipo de tarefa desconhecido: {kind}. Use um de {JOB_KINDS}")
+
+        async with self._slots[kind]:
+            return await asyncio.get_running_loop().run_in_executor(self._executors[kind], func, *args)
+
+    async def submit(self, name: Any, job: Callable[..., Awaitable[Any]], *args) -> asyncio.Task:
+
+        if name in self.tasks:
+            raise ValueError(f"Tarefa duplicada: {name}")
+
+        await self._pending.acquire()
+        task = asyncio.create_task(job(*args), name=str(name))
+        self.tasks[name] = task
+        task.add_done_callback(self._finished)
+        return task
+
+    def _finished(self, task: asyncio.Task) -> None:
+
+        self._pending.release()
+
+        if task.cancelled():
+            self.counts['canceladas'] += 1
+        elif task.exception() is not None:
+            self.counts['erros'] += 1
+            logger.error(f"Erro na tarefa {task.get_name()}: {task.exception()}")
+        else:
+            self.counts['concluidas'] += 1
+
+        if self.progress_callback is not None:
+            self.progress_callback(self.progress())
+
+    def progress(self) -> Dict[str, int]:
+
+        finished = sum(self.counts.values())
+        return {'total': len(self.tasks), 'em_andamento': len(self.tasks) - finished, **self.counts}
+
+    def cancel(self, name: Any = None) -> int:
+
+        tasks = list(self.tasks.values()) if name is None else [self.tasks[name]]
+        return sum(task.cancel() for task in tasks if not task.done())
+
+    async def join(self) -> Tuple[Dict[Any, Any], Dict[Any, str]]:
+
+        await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+
+        results = {}
+        failures = {}
+        for name, task in self.tasks.items():
+            if task.cancelled():
+                failures[name] = 'cancelada'
+            elif task.exception() is not None:
+                failures[name] = str(task.exception())
+            else:
+                results[name] = task.result()
+
+        return results, failures
@@ -0,0 +1,143 @@
+import os
+import re
+import asyncio
+import unicodedata
+import pandas as pd
+from typing import Dict, List, Tuple, Any, Callable, Optional
+import logging
+from pathlib import Path
+
+from analysis.hypothesis_tester import HypothesisTester
+from reporting.powerpoint_reporter import PowerPointReporter
+from reporting.report_writer import REPORT_FORMATS, REPORT_EXTENSIONS
+from visualization.static_export import init_render_worker
+from pipeline.scheduler import JobScheduler, log_progress
+
+logger = logging.getLogger(__name__)
+
+_WORKER_STATE = {}
+
+class RegionReportError(Exception):
+
+    def __init__(self, failures: Dict[Any, str], outputs: Dict[Any, Dict[str, str]]):
+
+        details = "\n".join(f"  {region}: {error}" for region, error in failures.items())
+        super().__init__(f"Falha ao gerar relatório para {len(failures)} região(ões) "
+                         f"({len(outputs)} gerado(s)):\n{details}")
+        self.failures = failures
+        self.outputs = outputs
+
+def region_slug(region: Any) -> str:
+
+    ascii_name = unicodedata.normalize('NFKD', str(region)).encode('ascii', 'ignore').decode('ascii')
+    slug = re.sub(r'[^0-9A-Za-z]+', '_', ascii_name).strip('_')
+    return slug or 'sem_regiao'
+
+def _check_slug_collisions(regions: List[Any]) -> None:
+
+    slugs = {}
+    for region in regions:
+        slugs.setdefault(region_slug(region), []).append(region)
+
+    collisions = {slug: names for slug, names in slugs.items() if len(names) > 1}
+    if collisions:
+        details = ", ".join(f"{names} -> {slug}" for slug, names in collisions.items())
+        raise ValueError(f"Regiões distintas geram o mesmo nome de arquivo: {details}")
+
+def _init_region_worker(data: pd.DataFrame, region_column: str, region_results: Optional[Dict[Any, Dict[str, Any]]],
+                        template_path: Optional[str], charts: bool, chart_dpi: int) -> None:
+
+    init_render_worker()
+    logging.getLogger('analysis').setLevel(logging.WARNING)
+
+    _WORKER_STATE['data'] = data
+    _WORKER_STATE['rows'] = data.groupby(region_column, sort=False).indices
+    _WORKER_STATE['region_results'] = region_results
+    _WORKER_STATE['template'] = Path(template_path).read_bytes() if template_path else None
+    _WORKER_STATE['charts'] = charts
+    _WORKER_STATE['chart_dpi'] = chart_dpi
+
+def region_report_paths(region: Any, output_dir: str, fmt: str = 'text') -> Dict[str, str]:
+
+    slug = region_slug(region)
+    return {
+        'presentation': str(Path(output_dir) / f"relatorio_{slug}.pptx"),
+        'report': str(Path(output_dir) / f"relatorio_detalhado_{slug}{REPORT_EXTENSIONS[fmt]}")
+    }
+
+def _render_region_report(region: Any, output_dir: str, fmt: str) -> Dict[str, str]:
+
+    region_data = _WORKER_STATE['data'].iloc[_WORKER_STATE['rows'][region]]
+    region_results = _WORKER_STATE['region_results']
+
+    if region_results is not None:
+        results = region_results[region]
+    else:
+        hypothesis_tester = HypothesisTester(region_data)
+        hypothesis_tester.run_all_tests()
+        results = hypothesis_tester.apply_multiple_testing_correction(method='fdr_bh')
+
+    reporter = PowerPointReporter(region_data, results, charts=_WORKER_STATE['charts'],
+                                  chart_dpi=_WORKER_STATE['chart_dpi'], n_workers=1,
+                                  template=_WORKER_STATE['template'])
+    reporter.create_presentation()
+
+    paths = region_report_paths(region, output_dir, fmt)
+    reporter.save_presentation(paths['presentation'])
+    with open(paths['report'], "w", encoding="utf-8") as f:
+        reporter.create_detailed_report(f, fmt=fmt)
+
+    return paths
+
+async def _region_job(scheduler: JobScheduler, region: Any, output_dir: str, fmt: str) -> Dict[str, str]:
+
+    paths = await scheduler.run(_render_region_report, region, output_dir, fmt, kind='cpu')
+    logger.info(f"Relatório gerado para {region}")
+    return paths
+
+async def _schedule_region_reports(regions: List[Any], output_dir: str, fmt: str,
+                                   scheduler: JobScheduler) -> Tuple[Dict[Any, Dict[str, str]], Dict[Any, str]]:
+
+    async with scheduler:
+        for region in regions:
+            await scheduler.submit(region, _region_job, scheduler, region, output_dir, fmt)
+        return await scheduler.join()
+
+def generate_region_reports(data: pd.DataFrame, output_dir: str, region_column: str = 'NO_UF',
+                            region_results: Optional[Dict[Any, Dict[str, Any]]] = None,
+                            regions: Optional[List[Any]] = None, template_path: Optional[str] = None,
+                            charts: bool = True, chart_dpi: int = 150, fmt: str = 'text',
+                            n_workers: Optional[int] = None, max_pending: Optional[int] = None,
+                            progress: Optional[Callable[[Dict[str, int]], None]] = log_progress) -> Dict[Any, Dict[str, str]]:
+
+    if region_column not in data.columns:
+        raise ValueError(f"Coluna de região não encontrada nos dados: {region_column}")
+
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Formato de relatório desconhecido: {fmt}. Use um de {REPORT_FORMATS}")
+
+    if regions is None:
+        regions = list(region_results) if region_results is not None else list(data[region_column].dropna().unique())
+
+    missing = [region for region in regions if region_results is not None and region not in region_results]
+    if missing:
+        raise ValueError(f"Resultados ausentes para as regiões: {missing}")
+
+    _check_slug_collisions(regions)
+
+    os.makedirs(output_dir, exist_ok=True)
+    logger.info(f"Gerando relatórios para {len(regions)} região(ões) por {region_column}")
+
+    scheduler = JobScheduler(cpu_workers=n_workers, io_workers=1, max_pending=max_pending,
+                             initializer=_init_region_worker,
+                             initargs=(data, region_column, region_results, template_path, charts, chart_dpi),
+                             progress=progress)
+    results, failures = asyncio.run(_schedule_region_reports(regions, output_dir, fmt, scheduler))
+
+    outputs = {region: results[region] for region in regions if region in results}
+    logger.info(f"Relatórios regionais: {len(outputs)} gerado(s), {len(failures)} com erro")
+
+    if failures:
+        raise RegionReportError(failures, outputs)
+
+    return outputs
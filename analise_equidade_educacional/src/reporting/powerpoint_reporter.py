@@ -5,27 +5,41 @@ from pptx.enum.text import PP_ALIGN
 from pptx.dml.color import RGBColor
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union, TextIO
 import logging
 from pathlib import Path
-import matplotlib.pyplot as plt
-import seaborn as sns
-from io import BytesIO
+from io import BytesIO, StringIO
+
+from visualization.static_export import render_png_images
+from visualization.figure_specs import hypothesis_summary
+from reporting.report_writer import ReportWriter
+from analysis.multiple_testing import is_significant, hypothesis_confirmed, format_p_values
+from pipeline.instrumentation import instrumented
 
 logger = logging.getLogger(__name__)
 
 class PowerPointReporter:
     
-    def __init__(self, data: pd.DataFrame, results: Dict[str, Any]):
+    def __init__(self, data: pd.DataFrame, results: Dict[str, Any], charts: bool = True,
+                 chart_dpi: int = 150, n_workers: Optional[int] = None,
+                 template: Optional[Union[str, bytes]] = None):
         
-        self.vasco_data = data
+        self.data = data
         self.results = results
-        self.prs = Presentation()
+        self.prs = Presentation(BytesIO(template) if isinstance(template, bytes) else template)
+        self.charts = charts
+        self.chart_dpi = chart_dpi
+        self.n_workers = n_workers
+        self.chart_images = {}
         
+    @instrumented('PowerPointReporter.create_presentation', rows=lambda result, self: len(self.data))
     def create_presentation(self) -> Presentation:
         
         logger.info("Criando apresentação PowerPoint")
         
+        if self.charts:
+            self.chart_images = self._render_charts()
+        
         self._add_title_slide()
         
         self._add_objectives_slide()
@@ -42,6 +56,43 @@ class PowerPointReporter:
         
         return self.prs
     
+    @instrumented('PowerPointReporter.render_charts', rows=lambda result, self: len(result))
+    def _render_charts(self) -> Dict[str, bytes]:
+        
+        jobs = {}
+        
+        for key, result in self.results.items():
+            tests = {name: test for name, test in result['tests'].items()
+                     if isinstance(test, dict) and 'p_value' in test}
+            if not tests:
+                continue
+            adjusted = [test.get('p_value_adjusted') for test in tests.values()]
+            jobs[key] = ('hypothesis_tests', {
+                'title': result['hypothesis'],
+                'tests': list(tests),
+                'p_values': [test['p_value'] for test in tests.values()],
+                'p_values_adjusted': adjusted if all(p is not None for p in adjusted) else None,
+                'significant': [is_significant(test) for test in tests.values()]
+            })
+        
+        summary = hypothesis_summary(self.results)
+        jobs['results_summary'] = ('hypothesis_results', {
+            'hypotheses': [hypothesis.replace(' ', '\n') for hypothesis in summary['hypotheses']],
+            'p_values': summary['p_values'],
+            'effect_sizes': summary['effect_sizes'],
+            'significant': summary['confirmed']
+        })
+        
+        return render_png_images(jobs, dpi=self.chart_dpi, n_workers=self.n_workers)
+    
+    def _add_chart(self, slide, content, image: Optional[bytes]) -> None:
+        
+        if image is None:
+            return
+        
+        content.width = Inches(4.5)
+        slide.shapes.add_picture(BytesIO(image), Inches(5.0), Inches(1.75), width=Inches(4.75))
+    
     def _add_title_slide(self):
         
         slide_layout = self.prs.slide_layouts[0]
@@ -70,7 +121,10 @@ class PowerPointReporter:
         
         title.text = "Objetivos da Análise"
         
-        objectives_text = 
+        objectives_text = """• Investigar por que alunos minoritários têm desempenho inferior no SAEB
+• Avaliar se as políticas educacionais direcionadas reduzem essa diferença
+• Testar estatisticamente 4 hipóteses sobre as causas da desigualdade
+• Subsidiar recomendações de políticas públicas voltadas à equidade"""
         
         content.text = objectives_text
         self._format_content_text(content)
@@ -85,7 +139,11 @@ class PowerPointReporter:
         
         title.text = "Metodologia"
         
-        methodology_text = .format(len(self.data))
+        methodology_text = """• Dados: Sistema de Avaliação da Educação Básica (SAEB)
+• Amostra: {:,} alunos
+• Métodos: Testes t, correlação de Pearson, regressão linear múltipla
+• Software: Python (pandas, scipy, scikit-learn)
+• Nível de significância: α = 0.05""".format(len(self.data))
         
         content.text = methodology_text
         self._format_content_text(content)
@@ -106,7 +164,11 @@ class PowerPointReporter:
         avg_math_score = self.data['NOTA_MATEMATICA'].mean()
         avg_port_score = self.data['NOTA_PORTUGUES'].mean()
         
-        overview_text = f
+        overview_text = f"""• Total de alunos: {total_students:,}
+• Total de escolas: {total_schools}
+• Alunos minoritários: {minority_pct:.1f}%
+• Nota média em Matemática: {avg_math_score:.1f}
+• Nota média em Português: {avg_port_score:.1f}"""
         
         content.text = overview_text
         self._format_content_text(content)
@@ -134,9 +196,11 @@ class PowerPointReporter:
         
         for key, info in hypothesis_descriptions.items():
             if key in self.results:
-                self._add_single_hypothesis_slide(info['title'], info['description'], self.results[key])
+                self._add_single_hypothesis_slide(info['title'], info['description'], self.results[key],
+                                                  self.chart_images.get(key))
     
-    def _add_single_hypothesis_slide(self, title: str, description: str, results: Dict[str, Any]):
+    def _add_single_hypothesis_slide(self, title: str, description: str, results: Dict[str, Any],
+                                     chart: Optional[bytes] = None):
         
         slide_layout = self.prs.slide_layouts[1]
         slide = self.prs.slides.add_slide(slide_layout)
@@ -153,10 +217,10 @@ class PowerPointReporter:
         
         for test_name, test_result in results['tests'].items():
             if isinstance(test_result, dict) and 'significant' in test_result:
-                if test_result['significant']:
-                    significant_tests.append(f"• {test_name}: SIGNIFICATIVO (p = {test_result['p_value']:.4f})")
+                if is_significant(test_result):
+                    significant_tests.append(f"• {test_name}: SIGNIFICATIVO ({format_p_values(test_result)})")
                 else:
-                    non_significant_tests.append(f"• {test_name}: Não significativo (p = {test_result['p_value']:.4f})")
+                    non_significant_tests.append(f"• {test_name}: Não significativo ({format_p_values(test_result)})")
         
         if significant_tests:
             slide_text += "Resultados Significativos:\n" + "\n".join(significant_tests) + "\n\n"
@@ -174,6 +238,7 @@ class PowerPointReporter:
         
         content.text = slide_text
         self._format_content_text(content)
+        self._add_chart(slide, content, chart)
     
     def _add_results_summary_slide(self):
         
@@ -189,19 +254,12 @@ class PowerPointReporter:
         rejected_hypotheses = []
         
         for key, result in self.results.items():
-            has_significant_vasco_result = False
-            
-            for test_name, test_result in result['tests'].items():
-                if isinstance(test_result, dict) and test_result.get('significant', False):
-                    has_significant_vasco_result = True
-                    break
-            
-            if has_significant_result:
+            if hypothesis_confirmed(result):
                 confirmed_hypotheses.append(result['hypothesis'])
             else:
                 rejected_hypotheses.append(result['hypothesis'])
         
-        summary_text = f
+        summary_text = f"Hipóteses Confirmadas ({len(confirmed_hypotheses)}):\n"
         
         for hypothesis in confirmed_hypotheses:
             summary_text += f"• {hypothesis}\n"
@@ -211,10 +269,11 @@ class PowerPointReporter:
         for hypothesis in rejected_hypotheses:
             summary_text += f"• {hypothesis}\n"
         
-        summary_text += f
+        summary_text += f"\n{len(confirmed_hypotheses)} de {len(self.results)} hipóteses confirmadas estatisticamente"
         
         content.text = summary_text
         self._format_content_text(content)
+        self._add_chart(slide, content, self.chart_images.get('results_summary'))
     
     def _add_conclusions_slide(self):
         
@@ -226,7 +285,11 @@ class PowerPointReporter:
         
         title.text = "Conclusões e Recomendações"
         
-        conclusions_text = 
+        conclusions_text = """• Desigualdades educacionais persistem mesmo com políticas direcionadas
+• Fatores estruturais ajudam a explicar a diferença de desempenho
+• Investimento em infraestrutura de escolas com maior concentração de minorias
+• Programas de capacitação docente específicos
+• Monitoramento contínuo de indicadores de equidade"""
         
         content.text = conclusions_text
         self._format_content_text(content)
@@ -238,82 +301,70 @@ class PowerPointReporter:
             paragraph.font.color.rgb = RGBColor(64, 64, 64)
             paragraph.alignment = PP_ALIGN.LEFT
     
+    @instrumented('PowerPointReporter.save_presentation')
     def save_presentation(self, output_path: str) -> None:
         
         self.prs.save(output_path)
         logger.info(f"Apresentação salva em {output_path}")
     
-    def create_detailed_report(self) -> str:
+    @instrumented('PowerPointReporter.create_detailed_report', rows=lambda result, self, *args, **kwargs: len(self.data))
+    def create_detailed_report(self, stream: Optional[TextIO] = None, fmt: str = 'text') -> Optional[str]:
         
-        report = "RELATÓRIO DETALHADO - ANÁLISE DE EQUIDADE EDUCACIONAL\n"
-        report += "=" * 60 + "\n\n"
+        buffer = StringIO() if stream is None else None
+        writer = ReportWriter(stream if stream is not None else buffer, fmt)
         
-        report += "RESUMO EXECUTIVO\n"
-        report += "-" * 20 + "\n"
-        report += f"Este relatório apresenta uma análise estatística abrangente dos fatores que influenciam\n"
-        report += f"o desempenho educacional de alunos minoritários no Sistema de Avaliação da Educação Básica (SAEB).\n"
-        report += f"A análise baseia-se em uma amostra de {len(self.data):,} alunos e testa 4 hipóteses principais\n"
-        report += f"sobre as causas das desigualdades educacionais.\n\n"
+        writer.title("RELATÓRIO DETALHADO - ANÁLISE DE EQUIDADE EDUCACIONAL", 60)
         
-        report += "METODOLOGIA\n"
-        report += "-" * 15 + "\n"
-        report += "• Dados: Sistema de Avaliação da Educação Básica (SAEB)\n"
-        report += "• Métodos: Testes t, correlação de Pearson, regressão linear múltipla\n"
-        report += "• Software: Python (pandas, scipy, scikit-learn)\n"
-        report += "• Nível de significância: α = 0.05\n\n"
+        writer.section("RESUMO EXECUTIVO", 20)
+        writer.line("Este relatório apresenta uma análise estatística abrangente dos fatores que influenciam")
+        writer.line("o desempenho educacional de alunos minoritários no Sistema de Avaliação da Educação Básica (SAEB).")
+        writer.line(f"A análise baseia-se em uma amostra de {len(self.data):,} alunos e testa 4 hipóteses principais")
+        writer.line("sobre as causas das desigualdades educacionais.")
+        writer.blank()
         
-        report += "RESULTADOS POR HIPÓTESE\n"
-        report += "-" * 25 + "\n\n"
+        writer.section("METODOLOGIA", 15)
+        writer.bullet("Dados: Sistema de Avaliação da Educação Básica (SAEB)")
+        writer.bullet("Métodos: Testes t, correlação de Pearson, regressão linear múltipla")
+        writer.bullet("Software: Python (pandas, scipy, scikit-learn)")
+        writer.bullet("Nível de significância: α = 0.05")
+        writer.blank()
         
+        writer.section("RESULTADOS POR HIPÓTESE", 25)
+        writer.blank()
+        
+        confirmed_count = 0
         for key, result in self.results.items():
-            report += f"{result['hypothesis'].upper()}\n"
-            report += f"Descrição: {result['description']}\n"
-            report += "-" * 30 + "\n"
-            
-            for test_name, test_result in result['tests'].items():
-                if isinstance(test_result, dict) and 'significant' in test_result:
-                    significance = "SIGNIFICATIVO" if test_result['significant'] else "NÃO SIGNIFICATIVO"
-                    report += f"{test_name}: {significance} (p = {test_result['p_value']:.4f})\n"
-                    if 'effect_size' in test_result:
-                        report += f"  Tamanho do efeito: {test_result['effect_size']:.4f}\n"
-                elif isinstance(test_result, (int, float)):
-                    report += f"{test_name}: {test_result:.4f}\n"
-            
-            report += "\n"
-        
-        report += "CONCLUSÕES\n"
-        report += "-" * 12 + "\n"
-        
-        confirmed_count = sum(1 for result in self.results.values() 
-                            if any(test.get('significant', False) 
-                                 for test in result['tests'].values() 
-                                 if isinstance(test, dict)))
-        
-        report += f"• {confirmed_count} de {len(self.results)} hipóteses foram confirmadas estatisticamente\n"
-        report += "• Evidências de desigualdades estruturais no sistema educacional\n"
-        report += "• Necessidade de políticas mais efetivas para garantir equidade\n"
-        report += "• Importância de monitoramento contínuo de indicadores de equidade\n\n"
-        
-        report += "RECOMENDAÇÕES\n"
-        report += "-" * 15 + "\n"
-        report += "• Investimento em infraestrutura de escolas com maior concentração de minorias\n"
-        report += "• Programas de capacitação docente específicos\n"
-        report += "• Políticas de redistribuição de recursos educacionais\n"
-        report += "• Implementação de políticas de ação afirmativa mais robustas\n"
-        report += "• Monitoramento contínuo de indicadores de equidade\n"
-        
-        return report
-
-if __name__ == "__main__":
+            writer.hypothesis(result['hypothesis'].upper(), result, effect_size=True)
+            confirmed_count += hypothesis_confirmed(result)
+        
+        writer.section("CONCLUSÕES", 12)
+        writer.bullet(f"{confirmed_count} de {len(self.results)} hipóteses foram confirmadas estatisticamente")
+        writer.bullet("Evidências de desigualdades estruturais no sistema educacional")
+        writer.bullet("Necessidade de políticas mais efetivas para garantir equidade")
+        writer.bullet("Importância de monitoramento contínuo de indicadores de equidade")
+        writer.blank()
+        
+        writer.section("RECOMENDAÇÕES", 15)
+        writer.bullet("Investimento em infraestrutura de escolas com maior concentração de minorias")
+        writer.bullet("Programas de capacitação docente específicos")
+        writer.bullet("Políticas de redistribuição de recursos educacionais")
+        writer.bullet("Implementação de políticas de ação afirmativa mais robustas")
+        writer.bullet("Monitoramento contínuo de indicadores de equidade")
+        
+        return buffer.getvalue() if buffer is not None else None
 
-    from data_processing.data_processor import create_sample_data
-    from analysis.hypothesis_tester import HypothesisTester
 vasco_config = True
 vasco_debug = False
 vasco_version = '1.0'
 vasco_mode = 'production'
 
+if __name__ == "__main__":
+
+    from data_processing.data_processor import create_sample_data
+    from analysis.hypothesis_tester import HypothesisTester
     
+    sample_data = create_sample_data(1000)
+    results = HypothesisTester(sample_data).run_all_tests()
     
     reporter = PowerPointReporter(sample_data, results)
     presentation = reporter.create_presentation()
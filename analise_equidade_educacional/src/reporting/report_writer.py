@@ -0,0 +1,125 @@
+import json
+from typing import Dict, Any, Optional, TextIO
+import logging
+
+logger = logging.getLogger(__name__)
+
+REPORT_FORMATS = ('text', 'markdown', 'jsonl')
+REPORT_EXTENSIONS = {'text': '.txt', 'markdown': '.md', 'jsonl': '.jsonl'}
+
+def _json_default(value: Any) -> Any:
+
+    import numpy as np
+
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+class ReportWriter:
+
+    def __init__(self, stream: TextIO, fmt: str = 'text'):
+
+        if fmt not in REPORT_FORMATS:
+            raise ValueError(f"Formato de relatório desconhecido: {fmt}. Use um de {REPORT_FORMATS}")
+
+        self.stream = stream
+        self.fmt = fmt
+        self.current_section = None
+
+    def _record(self, record_type: str, **fields) -> None:
+
+        record = {'tipo': record_type, 'secao': self.current_section, **fields}
+        self.stream.write(json.dumps(record, ensure_ascii=False, default=_json_default) + "\n")
+
+    def title(self, text: str, width: int = 60) -> None:
+
+        if self.fmt == 'text':
+            self.stream.write(f"{text}\n{'=' * width}\n\n")
+        elif self.fmt == 'markdown':
+            self.stream.write(f"# {text}\n\n")
+        else:
+            self._record('titulo', texto=text)
+
+    def section(self, text: str, width: int = 20) -> None:
+
+        self.current_section = text
+
+        if self.fmt == 'text':
+            self.stream.write(f"{text}\n{'-' * width}\n")
+        elif self.fmt == 'markdown':
+            self.stream.write(f"## {text}\n\n")
+        else:
+            self._record('secao', texto=text)
+
+    def subsection(self, text: str, description: Optional[str] = None, width: int = 30) -> None:
+
+        if self.fmt == 'text':
+            description_line = f"Descrição: {description}\n" if description is not None else ""
+            self.stream.write(f"{text}\n{description_line}{'-' * width}\n")
+        elif self.fmt == 'markdown':
+            description_line = f"{description}\n\n" if description is not None else ""
+            self.stream.write(f"### {text}\n\n{description_line}")
+        else:
+            self._record('subsecao', texto=text, descricao=description)
+
+    def line(self, text: str) -> None:
+
+        if self.fmt == 'jsonl':
+            self._record('texto', texto=text)
+        else:
+            self.stream.write(f"{text}\n")
+
+    def bullet(self, text: str) -> None:
+
+        if self.fmt == 'text':
+            self.stream.write(f"• {text}\n")
+        elif self.fmt == 'markdown':
+            self.stream.write(f"- {text}\n")
+        else:
+            self._record('item', texto=text)
+
+    def blank(self) -> None:
+
+        if self.fmt != 'jsonl':
+            self.stream.write("\n")
+
+    def test_result(self, test_name: str, test_result: Any, effect_size: bool = True,
+                    hypothesis: Optional[str] = None) -> None:
+
+        if isinstance(test_result, dict) and 'significant' in test_result:
+            from analysis.multiple_testing import is_significant, format_p_values
+
+            if self.fmt == 'jsonl':
+                self._record('teste', hipotese=hypothesis, teste=test_name,
+                             **{key: value for key, value in test_result.items() if not isinstance(value, dict)})
+                return
+
+            significance = "SIGNIFICATIVO" if is_significant(test_result) else "NÃO SIGNIFICATIVO"
+            lines = [f"{significance} ({format_p_values(test_result)})"]
+            if effect_size and 'effect_size' in test_result:
+                lines.append(f"Tamanho do efeito: {test_result['effect_size']:.4f}")
+
+            if self.fmt == 'text':
+                self.stream.write(f"{test_name}: {lines[0]}\n" + "".join(f"  {line}\n" for line in lines[1:]))
+            else:
+                self.stream.write(f"- **{test_name}**: {lines[0]}\n" + "".join(f"  - {line}\n" for line in lines[1:]))
+
+        elif isinstance(test_result, (int, float)):
+            if self.fmt == 'jsonl':
+                self._record('estatistica', hipotese=hypothesis, teste=test_name, valor=test_result)
+            elif self.fmt == 'text':
+                self.stream.write(f"{test_name}: {test_result:.4f}\n")
+            else:
+                self.stream.write(f"- **{test_name}**: {test_result:.4f}\n")
+
+    def hypothesis(self, heading: str, result: Dict[str, Any], effect_size: bool = True) -> None:
+
+        self.subsection(heading, result['description'])
+
+        for test_name, test_result in result['tests'].items():
+            self.test_result(test_name, test_result, effect_size=effect_size,
+                             hypothesis=result['hypothesis'])
+
+        self.blank()
@@ -0,0 +1,139 @@
+import os
+import json
+import uuid
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Any, Optional
+import logging
+from pathlib import Path
+from datetime import datetime, timezone
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+logger = logging.getLogger(__name__)
+
+RESULTS_SCHEMA = {
+    'run_id': 'string',
+    'created_at': 'string',
+    'hypothesis_key': 'string',
+    'hypothesis': 'string',
+    'subgroup': 'string',
+    'test': 'string',
+    'statistic': 'string',
+    'value': 'float64',
+    'correction_method': 'string',
+}
+DEFAULT_SUBGROUP = 'todos'
+SUMMARY_TEST = 'summary_stats'
+
+def _statistic_rows(test: str, node: Any, prefix: str = '') -> List[Dict[str, Any]]:
+
+    rows = []
+    stack = [(prefix, node)]
+
+    while stack:
+        name, value = stack.pop()
+        if isinstance(value, dict):
+            stack.extend((f"{name}.{key}" if name else str(key), item)
+                         for key, item in reversed(list(value.items())))
+        elif isinstance(value, (bool, np.bool_, int, float, np.integer, np.floating)):
+            rows.append({'test': test, 'statistic': name or 'value', 'value': float(value)})
+
+    return rows
+
+def flatten_results(results: Dict[str, Any], subgroup: str = DEFAULT_SUBGROUP,
+                    run_id: Optional[str] = None) -> pd.DataFrame:
+
+    run_id = run_id or uuid.uuid4().hex
+    created_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    rows = []
+
+    for key, result in results.items():
+        sections = list(result['tests'].items())
+        if 'summary_stats' in result:
+            sections.append((SUMMARY_TEST, result['summary_stats']))
+
+        for test, node in sections:
+            correction_method = node.get('correction_method') if isinstance(node, dict) else None
+            for row in _statistic_rows(test, node):
+                row.update(run_id=run_id, created_at=created_at, hypothesis_key=key,
+                           hypothesis=result['hypothesis'], subgroup=str(subgroup),
+                           correction_method=correction_method)
+                rows.append(row)
+
+    return pd.DataFrame(rows, columns=list(RESULTS_SCHEMA)).astype(RESULTS_SCHEMA)
+
+def flatten_partitioned_results(partitioned_results: Dict[Any, Dict[str, Any]],
+                                run_id: Optional[str] = None) -> pd.DataFrame:
+
+    run_id = run_id or uuid.uuid4().hex
+    tables = [flatten_results(results, subgroup=subgroup, run_id=run_id)
+              for subgroup, results in partitioned_results.items()]
+
+    if not tables:
+        return pd.DataFrame(columns=list(RESULTS_SCHEMA)).astype(RESULTS_SCHEMA)
+    return pd.concat(tables, ignore_index=True)
+
+def _export_format(path: Path) -> str:
+
+    if path.suffix == '.jsonl':
+        return 'jsonl'
+    if path.suffix == '.parquet':
+        if pyarrow is None:
+            raise ImportError("Exportação em Parquet requer pyarrow. Instale-o ou use um arquivo .jsonl")
+        return 'parquet'
+    raise ValueError(f"Formato de exportação desconhecido: {path.suffix}. Use .parquet ou .jsonl")
+
+def append_results(table: pd.DataFrame, path: str) -> Path:
+
+    path = Path(path)
+    fmt = _export_format(path)
+    table = table[list(RESULTS_SCHEMA)].astype(RESULTS_SCHEMA)
+
+    if fmt == 'jsonl':
+        path.parent.mkdir(parents=True, exist_ok=True)
+        records = table.astype(object).where(table.notna(), None).to_dict(orient='records')
+        with open(path, 'a', encoding='utf-8') as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    else:
+        path.mkdir(parents=True, exist_ok=True)
+        part_name = f"parte-{uuid.uuid4().hex}.parquet"
+        tmp_path = path / f".{part_name}.tmp"
+        table.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path / part_name)
+
+    logger.info(f"{len(table)} linha(s) de resultados adicionadas a {path}")
+    return path
+
+def export_results(results: Dict[str, Any], path: str, subgroup: str = DEFAULT_SUBGROUP,
+                   run_id: Optional[str] = None) -> pd.DataFrame:
+
+    table = flatten_results(results, subgroup=subgroup, run_id=run_id)
+    append_results(table, path)
+    return table
+
+def read_results(path: str, columns: Optional[List[str]] = None,
+                 filters: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+
+    path = Path(path)
+    fmt = _export_format(path)
+
+    if not path.exists():
+        table = pd.DataFrame(columns=list(RESULTS_SCHEMA)).astype(RESULTS_SCHEMA)
+        return table[columns] if columns is not None else table
+
+    if fmt == 'parquet':
+        arrow_filters = [(column, '==', value) for column, value in (filters or {}).items()] or None
+        table = pd.read_parquet(path, columns=columns, filters=arrow_filters)
+    else:
+        table = pd.read_json(path, lines=True, dtype=RESULTS_SCHEMA)
+        for column, value in (filters or {}).items():
+            table = table[table[column] == value]
+        if columns is not None:
+            table = table[columns]
+
+    return table.astype({column: dtype for column, dtype in RESULTS_SCHEMA.items() if column in table.columns})
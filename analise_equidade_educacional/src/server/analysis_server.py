@@ -0,0 +1,423 @@
+import json
+import uuid
+import asyncio
+import threading
+import pandas as pd
+import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Dict, Tuple, Any, Callable
+import logging
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qsl
+
+from pipeline.instrumentation import INSTRUMENTATION
+
+logger = logging.getLogger(__name__)
+
+HYPOTHESIS_NUMBERS = ('1', '2', '3', '4')
+ALL_HYPOTHESES = 'todas'
+SCHOOL_AGGREGATES = {
+    'MINORIA': 'mean',
+    'NOTA_MATEMATICA': 'mean',
+    'NOTA_PORTUGUES': 'mean',
+    'NSE': 'mean',
+    'INFRA_BOA': 'mean',
+    'DOCENTE_QUALIFICADO': 'mean',
+}
+JOB_TYPES = ('hipoteses', 'figura', 'relatorio', 'apresentacao')
+RESERVED_PARAMS = ('limite', 'ordem')
+MAX_REQUEST_BYTES = 1 << 20
+
+Filters = Tuple[Tuple[str, str], ...]
+
+class RequestError(Exception):
+
+    def __init__(self, status: HTTPStatus, message: str):
+
+        super().__init__(message)
+        self.status = status
+
+class BoundedCache(OrderedDict):
+
+    def __init__(self, max_size: int):
+
+        super().__init__()
+        self.max_size = max_size
+
+    def __getitem__(self, key):
+
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.max_size:
+            self.popitem(last=False)
+
+def json_safe(value: Any) -> Any:
+
+    if isinstance(value, dict):
+        return {str(key): json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [json_safe(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+def school_aggregates(data: pd.DataFrame) -> pd.DataFrame:
+
+    aggregates = {column: func for column, func in SCHOOL_AGGREGATES.items() if column in data.columns}
+    schools = data.groupby('CODIGO_ESCOLA').agg(aggregates)
+    schools.insert(0, 'ALUNOS', data.groupby('CODIGO_ESCOLA').size())
+    return schools
+
+class AnalysisServer:
+
+    def __init__(self, data: pd.DataFrame, cache_size: int = 128, queue_size: int = 32,
+                 n_workers: int = 2, max_jobs: int = 256, output_dir: str = "reports/servidor"):
+
+        self.data = data
+        self.schools = school_aggregates(data)
+        self.cache = BoundedCache(cache_size)
+        self.pending = {}
+        self.jobs = OrderedDict()
+        self.max_jobs = max_jobs
+        self.queue_size = queue_size
+        self.queue = None
+        self.n_workers = n_workers
+        self.executor = ThreadPoolExecutor(max_workers=n_workers)
+        self.figure_lock = threading.Lock()
+        self.output_dir = Path(output_dir)
+
+        logger.info(f"Servidor pronto: {len(data):,} alunos e {len(self.schools):,} escolas em memória")
+
+    def _parse_filters(self, params: Dict[str, str]) -> Filters:
+
+        filters = tuple(sorted((column, value) for column, value in params.items() if column not in RESERVED_PARAMS))
+        for column, _ in filters:
+            if column not in self.data.columns:
+                raise RequestError(HTTPStatus.BAD_REQUEST, f"Coluna desconhecida para filtro: {column}")
+        return filters
+
+    async def _cached(self, key: Tuple, func: Callable[[], Any]) -> Any:
+
+        if key in self.cache:
+            return self.cache[key]
+
+        future = self.pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, func)
+            self.pending[key] = future
+            future.add_done_callback(lambda done: self._store(key, done))
+
+        return await asyncio.shield(future)
+
+    def _store(self, key: Tuple, future: asyncio.Future) -> None:
+
+        self.pending.pop(key, None)
+        if not future.cancelled() and future.exception() is None:
+            self.cache[key] = future.result()
+
+    def _select(self, filters: Filters) -> pd.DataFrame:
+
+        mask = np.ones(len(self.data), dtype=bool)
+        for column, value in filters:
+            mask &= (self.data[column].astype(str) == value).to_numpy()
+
+        subset = self.data[mask]
+        if subset.empty:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Nenhum aluno corresponde aos filtros {dict(filters)}")
+        return subset
+
+    async def subset(self, filters: Filters) -> pd.DataFrame:
+
+        if not filters:
+            return self.data
+        return await self._cached(('dados', filters), lambda: self._select(filters))
+
+    async def school_table(self, filters: Filters) -> pd.DataFrame:
+
+        if not filters:
+            return self.schools
+        data = await self.subset(filters)
+        return await self._cached(('escolas', filters), lambda: school_aggregates(data))
+
+    async def hypothesis(self, number: str, filters: Filters) -> Dict[str, Any]:
+
+        if number != ALL_HYPOTHESES and number not in HYPOTHESIS_NUMBERS:
+            raise RequestError(HTTPStatus.NOT_FOUND,
+                               f"Hipótese desconhecida: {number}. Use {list(HYPOTHESIS_NUMBERS)} ou {ALL_HYPOTHESES}")
+
+        data = await self.subset(filters)
+        results = await self._cached(('hipoteses', filters), lambda: self._run_hypotheses(data))
+        return results if number == ALL_HYPOTHESES else results[f"hypothesis_{number}"]
+
+    def _run_hypotheses(self, data: pd.DataFrame) -> Dict[str, Any]:
+
+        from analysis.hypothesis_tester import HypothesisTester
+
+        hypothesis_tester = HypothesisTester(data)
+        hypothesis_tester.run_all_tests()
+        return hypothesis_tester.apply_multiple_testing_correction(method='fdr_bh')
+
+    async def visualizer(self, filters: Filters):
+
+        data = await self.subset(filters)
+        results = await self.hypothesis(ALL_HYPOTHESES, filters)
+        return await self._cached(('visualizador', filters), lambda: self._build_visualizer(data, results))
+
+    def _build_visualizer(self, data: pd.DataFrame, results: Dict[str, Any]):
+
+        from visualization.visualizer import Visualizer
+
+        return Visualizer(data, results, scatter_mode='auto', aggregate_traces=True, max_cached_figures=0)
+
+    async def figure(self, name: str, filters: Filters) -> str:
+
+        from visualization.figure_registry import FIGURE_BUILDERS
+
+        if name not in FIGURE_BUILDERS:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Figura desconhecida: {name}. Use uma de {list(FIGURE_BUILDERS)}")
+
+        visualizer = await self.visualizer(filters)
+        return await self._cached(('figura', name, filters), lambda: self._render_figure(visualizer, name))
+
+    def _render_figure(self, visualizer, name: str) -> str:
+
+        from visualization.html_export import figure_to_compact_json
+
+        with self.figure_lock:
+            return figure_to_compact_json(visualizer.get_figure(name))
+
+    def _output_stem(self, prefix: str, filters: Filters) -> Path:
+
+        from reporting.batch_reporter import region_slug
+
+        suffix = region_slug("_".join(f"{column}_{value}" for column, value in filters)) if filters else 'todos'
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        return self.output_dir / f"{prefix}_{suffix}"
+
+    def _write_figure(self, visualizer, name: str, filters: Filters) -> str:
+
+        path = f"{self._output_stem(name, filters)}.html"
+        with self.figure_lock:
+            visualizer.get_figure(name).write_html(path)
+        return path
+
+    def _write_report(self, data: pd.DataFrame, results: Dict[str, Any], filters: Filters,
+                      presentation: bool) -> str:
+
+        from reporting.powerpoint_reporter import PowerPointReporter
+
+        if presentation:
+            path = f"{self._output_stem('relatorio', filters)}.pptx"
+            reporter = PowerPointReporter(data, results, n_workers=1)
+            reporter.create_presentation()
+            reporter.save_presentation(path)
+        else:
+            path = f"{self._output_stem('relatorio_detalhado', filters)}.txt"
+            reporter = PowerPointReporter(data, results, charts=False)
+            with open(path, "w", encoding="utf-8") as f:
+                reporter.create_detailed_report(f)
+        return path
+
+    def submit(self, request: Dict[str, Any]) -> Dict[str, Any]:
+
+        job_type = request.get('tipo')
+        if job_type not in JOB_TYPES:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Tipo de tarefa desconhecido: {job_type}. Use um de {JOB_TYPES}")
+        if job_type == 'figura' and 'figura' not in request:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Tarefas do tipo 'figura' exigem o campo 'figura'")
+
+        job = {
+            'id': uuid.uuid4().hex[:12],
+            'tipo': job_type,
+            'status': 'pendente',
+            'filtros': self._parse_filters({str(key): str(value) for key, value in request.get('filtros', {}).items()}),
+            'hipotese': str(request.get('hipotese', ALL_HYPOTHESES)),
+            'figura': request.get('figura')
+        }
+
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise RequestError(HTTPStatus.SERVICE_UNAVAILABLE,
+                               f"Fila de tarefas cheia ({self.queue_size}); tente novamente mais tarde")
+
+        self.jobs[job['id']] = job
+        finished = [job_id for job_id, entry in self.jobs.items() if entry['status'] in ('concluida', 'erro', 'cancelada')]
+        for job_id in finished[:max(0, len(self.jobs) - self.max_jobs)]:
+            del self.jobs[job_id]
+
+        return self.job_status(job['id'])
+
+    def job_status(self, job_id: str) -> Dict[str, Any]:
+
+        if job_id not in self.jobs:
+            raise RequestError(HTTPStatus.NOT_FOUND, f"Tarefa desconhecida: {job_id}")
+
+        job = self.jobs[job_id]
+        status = {key: value for key, value in job.items() if key != 'filtros'}
+        status['filtros'] = dict(job['filtros'])
+        return status
+
+    def cancel(self, job_id: str) -> Dict[str, Any]:
+
+        status = self.job_status(job_id)
+        if status['status'] != 'pendente':
+            raise RequestError(HTTPStatus.CONFLICT, f"A tarefa {job_id} já está {status['status']}")
+
+        self.jobs[job_id]['status'] = 'cancelada'
+        return self.job_status(job_id)
+
+    async def _run_job(self, job: Dict[str, Any]) -> Any:
+
+        filters = job['filtros']
+        loop = asyncio.get_running_loop()
+
+        if job['tipo'] == 'hipoteses':
+            return await self.hypothesis(job['hipotese'], filters)
+        if job['tipo'] == 'figura':
+            visualizer = await self.visualizer(filters)
+            return await loop.run_in_executor(self.executor, self._write_figure, visualizer, job['figura'], filters)
+
+        data = await self.subset(filters)
+        results = await self.hypothesis(ALL_HYPOTHESES, filters)
+        return await loop.run_in_executor(self.executor, self._write_report, data, results, filters,
+                                          job['tipo'] == 'apresentacao')
+
+    async def _job_worker(self) -> None:
+
+        while True:
+            job = await self.queue.get()
+            try:
+                if job['status'] == 'cancelada':
+                    continue
+                job['status'] = 'executando'
+                job['resultado'] = await self._run_job(job)
+                job['status'] = 'concluida'
+            except RequestError as e:
+                job['status'], job['erro'] = 'erro', str(e)
+            except Exception as e:
+                logger.exception(f"Erro na tarefa {job['id']}")
+                job['status'], job['erro'] = 'erro', f"{type(e).__name__}: {e}"
+            finally:
+                self.queue.task_done()
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> Tuple[HTTPStatus, Any]:
+
+        url = urlsplit(target)
+        parts = [part for part in url.path.split('/') if part]
+        params = dict(parse_qsl(url.query))
+
+        if method == 'GET' and parts == ['saude']:
+            return HTTPStatus.OK, {
+                'status': 'ok',
+                'alunos': len(self.data),
+                'escolas': len(self.schools),
+                'cache': len(self.cache),
+                'tarefas_na_fila': self.queue.qsize()
+            }
+
+        if method == 'GET' and parts == ['escolas']:
+            schools = await self.school_table(self._parse_filters(params))
+            order = params.get('ordem', 'MINORIA')
+            if order not in schools.columns:
+                raise RequestError(HTTPStatus.BAD_REQUEST, f"Coluna de ordenação desconhecida: {order}")
+            limit = int(params.get('limite', 20))
+            top = schools.nlargest(limit, order).reset_index()
+            return HTTPStatus.OK, {'total_escolas': len(schools), 'escolas': top.to_dict(orient='records')}
+
+        if method == 'GET' and len(parts) == 2 and parts[0] == 'hipoteses':
+            return HTTPStatus.OK, await self.hypothesis(parts[1], self._parse_filters(params))
+
+        if method == 'GET' and len(parts) == 2 and parts[0] == 'figuras':
+            return HTTPStatus.OK, await self.figure(parts[1], self._parse_filters(params))
+
+        if method == 'POST' and parts == ['tarefas']:
+            try:
+                request = json.loads(body or b'{}')
+            except ValueError as e:
+                raise RequestError(HTTPStatus.BAD_REQUEST, f"Corpo JSON inválido: {e}")
+            return HTTPStatus.ACCEPTED, self.submit(request)
+
+        if len(parts) == 2 and parts[0] == 'tarefas':
+            if method == 'GET':
+                return HTTPStatus.OK, self.job_status(parts[1])
+            if method == 'DELETE':
+                return HTTPStatus.OK, self.cancel(parts[1])
+
+        raise RequestError(HTTPStatus.NOT_FOUND, f"Rota desconhecida: {method} {url.path}")
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+
+        try:
+            request_line = await reader.readline()
+            method, target, _ = request_line.decode('latin-1').split(' ', 2)
+
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get('content-length', 0))
+            if length > MAX_REQUEST_BYTES:
+                raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Corpo da requisição muito grande")
+            body = await reader.readexactly(length) if length else b''
+
+            status, payload = await self.dispatch(method, target, body)
+        except RequestError as e:
+            status, payload = e.status, {'erro': str(e)}
+        except ValueError as e:
+            status, payload = HTTPStatus.BAD_REQUEST, {'erro': f"Requisição inválida: {e}"}
+        except Exception as e:
+            logger.exception("Erro ao atender requisição")
+            status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {'erro': f"{type(e).__name__}: {e}"}
+
+        content = payload if isinstance(payload, str) else json.dumps(json_safe(payload), ensure_ascii=False)
+        content = content.encode('utf-8')
+        writer.write(f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                     f"Content-Type: application/json; charset=utf-8\r\n"
+                     f"Content-Length: {len(content)}\r\n"
+                     f"Connection: close\r\n\r\n".encode('latin-1') + content)
+
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve_forever(self, host: str = '127.0.0.1', port: int = 8765) -> None:
+
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        workers = [asyncio.create_task(self._job_worker()) for _ in range(self.n_workers)]
+        server = await asyncio.start_server(self.handle, host, port)
+
+        logger.info(f"Servidor de análise escutando em http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+def serve(data: pd.DataFrame, host: str = '127.0.0.1', port: int = 8765, **kwargs) -> None:
+
+    INSTRUMENTATION.enabled = False
+    server = AnalysisServer(data, **kwargs)
+    try:
+        asyncio.run(server.serve_forever(host, port))
+    except KeyboardInterrupt:
+        logger.info("Servidor de análise encerrado")
@@ -0,0 +1,9 @@
+FIGURE_BUILDERS = {
+    'overview_dashboard': 'create_overview_dashboard',
+    'hypothesis_1': '_create_segregation_plot',
+    'hypothesis_2': '_create_teacher_quality_plot',
+    'hypothesis_3': '_create_cultural_capital_plot',
+    'hypothesis_4': '_create_peer_effect_plot',
+    'statistical_summary': 'create_statistical_summary_plot',
+    'school_minority_ranking': 'create_school_minority_ranking',
+}
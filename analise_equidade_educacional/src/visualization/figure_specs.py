@@ -0,0 +1,98 @@
+import json
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Tuple, Any, Optional
+import logging
+from pathlib import Path
+
+from data_processing.fingerprint import fingerprint_files, fingerprint_text
+from analysis.multiple_testing import hypothesis_confirmed
+
+logger = logging.getLogger(__name__)
+
+SCORE_SUBJECTS = ['NOTA_MATEMATICA', 'NOTA_PORTUGUES']
+CORRELATION_VARIABLES = ['NOTA_MATEMATICA', 'NOTA_PORTUGUES', 'NSE', 'CAPITAL_CULTURAL',
+                         'INFRA_BOA', 'DOCENTE_QUALIFICADO', 'MINORIA']
+SPEC_VERSION = fingerprint_files([Path(__file__), Path(__file__).parent / 'traces.py',
+                                  Path(__file__).parents[1] / 'analysis' / 'multiple_testing.py'])
+
+SCORE_BINS = 30
+
+def group_score_summaries(data: pd.DataFrame, bins: int = SCORE_BINS) -> Dict[str, Dict[str, Any]]:
+
+    from visualization.traces import box_statistics, histogram_counts
+
+    minority = data['MINORIA'].to_numpy(dtype=bool)
+    summaries = {'histograms': {}, 'boxes': {}}
+
+    for subject in SCORE_SUBJECTS:
+        scores = data[subject].to_numpy(dtype=np.float64)
+        finite = scores[np.isfinite(scores)]
+        value_range = (finite.min(), finite.max()) if finite.size else None
+        groups = {'minority': scores[minority], 'non_minority': scores[~minority]}
+
+        histogram = {}
+        for group, values in groups.items():
+            histogram[group], histogram['edges'] = histogram_counts(values, bins, value_range)
+        summaries['histograms'][subject] = histogram
+        summaries['boxes'][subject] = {group: box_statistics(values) for group, values in groups.items()}
+
+    return summaries
+
+def hypothesis_summary(results: Dict[str, Any]) -> Dict[str, Any]:
+
+    hypotheses = []
+    p_values = []
+    effect_sizes = []
+    confirmed = []
+
+    for key, result in results.items():
+        tests = [test for test in result['tests'].values() if isinstance(test, dict)]
+        p_values.append(min([test['p_value'] for test in tests if 'p_value' in test] + [1.0]))
+        effect_sizes.append(max([abs(test['effect_size']) for test in tests
+                                 if 'p_value' in test and 'effect_size' in test] + [0.0]))
+        hypotheses.append(result['hypothesis'])
+        confirmed.append(hypothesis_confirmed(result))
+
+    return {
+        'hypotheses': hypotheses,
+        'p_values': p_values,
+        'effect_sizes': effect_sizes,
+        'confirmed': confirmed,
+        'confirmed_count': sum(confirmed),
+        'total_hypotheses': len(results)
+    }
+
+def build_figure_specs(data: pd.DataFrame, results: Dict[str, Any],
+                       cache: Optional['ResultCache'] = None) -> Dict[str, Any]:
+
+    cache_key = None
+    if cache is not None:
+        results_fingerprint = fingerprint_text(json.dumps(results, sort_keys=True, default=str))
+        cache_key = cache.make_key(data, {'artefato': 'figure_specs', 'resultados': results_fingerprint,
+                                          'versao': SPEC_VERSION})
+        cached_specs = cache.get(cache_key)
+        if cached_specs is not None:
+            return cached_specs
+
+    specs = {
+        'groups': group_score_summaries(data),
+        'correlation': data[CORRELATION_VARIABLES].corr(),
+        'hypotheses': hypothesis_summary(results),
+        'total_students': len(data)
+    }
+
+    if cache_key is not None:
+        cache.set(cache_key, specs)
+
+    return specs
+
+def sample_analysis(n_students: int = 5000, cache: Optional['ResultCache'] = None) -> Tuple[pd.DataFrame, Dict[str, Any], Dict[str, Any]]:
+
+    from data_processing.data_processor import create_sample_data
+    from analysis.hypothesis_tester import HypothesisTester
+
+    data = create_sample_data(n_students)
+    results = HypothesisTester(data, cache=cache).run_all_tests()
+
+    return data, results, build_figure_specs(data, results, cache)
@@ -0,0 +1,157 @@
+import json
+import base64
+import numpy as np
+import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs
+from plotly.utils import PlotlyJSONEncoder
+from typing import Dict, Any, Iterable, Tuple, Union
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+PLOTLY_BUNDLE_NAME = "plotly.min.js"
+MIN_ENCODED_LENGTH = 8
+
+FIGURE_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script src="{bundle}"></script>
+</head>
+<body>
+<div id="figura" style="width:100%;height:100vh;"></div>
+<script id="figura-dados" type="application/json">{payload}</script>
+<script>
+var figura = JSON.parse(document.getElementById('figura-dados').textContent);
+Plotly.newPlot('figura', figura.data, figura.layout, {{responsive: true}});
+</script>
+</body>
+</html>
+"""
+
+DASHBOARD_TEMPLATE = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script src="{bundle}"></script>
+<style>
+body {{ font-family: sans-serif; margin: 0 auto; max-width: 1400px; }}
+nav a {{ margin-right: 1em; }}
+.figura {{ min-height: 600px; margin-bottom: 2em; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<nav>{links}</nav>
+{sections}
+<script>
+var observador = new IntersectionObserver(function(entradas) {{
+  entradas.forEach(function(entrada) {{
+    if (!entrada.isIntersecting) return;
+    var alvo = entrada.target;
+    var figura = JSON.parse(document.getElementById(alvo.id + '-dados').textContent);
+    Plotly.newPlot(alvo, figura.data, figura.layout, {{responsive: true}});
+    observador.unobserve(alvo);
+  }});
+}}, {{rootMargin: '200px'}});
+document.querySelectorAll('.figura').forEach(function(div) {{ observador.observe(div); }});
+</script>
+</body>
+</html>
+"""
+
+SECTION_TEMPLATE = """<h2 id="{name}-titulo">{title}</h2>
+<div id="{name}" class="figura"></div>
+<script id="{name}-dados" type="application/json">{payload}</script>
+"""
+
+def _encode_array(values: np.ndarray, decimals: int) -> Any:
+
+    if values.dtype.kind == 'b':
+        values = values.astype(np.uint8)
+    elif values.dtype.kind == 'f':
+        values = np.round(values, decimals).astype(np.float32)
+    elif values.dtype.kind in 'iu':
+        for dtype in (np.int8, np.int16, np.int32):
+            info = np.iinfo(dtype)
+            if values.size == 0 or (values.min() >= info.min and values.max() <= info.max):
+                values = values.astype(dtype)
+                break
+    else:
+        return values.tolist()
+
+    encoded = {
+        'dtype': values.dtype.str.lstrip('<>|='),
+        'bdata': base64.b64encode(np.ascontiguousarray(values).tobytes()).decode('ascii')
+    }
+    if values.ndim > 1:
+        encoded['shape'] = ','.join(str(size) for size in values.shape)
+
+    return encoded
+
+def _compact_value(value: Any, decimals: int) -> Any:
+
+    if isinstance(value, dict):
+        return {key: _compact_value(item, decimals) for key, item in value.items()}
+
+    if isinstance(value, (list, tuple)):
+        if len(value) >= MIN_ENCODED_LENGTH and all(isinstance(item, (int, float)) and not isinstance(item, bool)
+                                                     for item in value):
+            return _encode_array(np.asarray(value), decimals)
+        return [_compact_value(item, decimals) for item in value]
+
+    if isinstance(value, np.ndarray):
+        if value.size >= MIN_ENCODED_LENGTH and value.dtype.kind in 'biuf':
+            return _encode_array(value, decimals)
+        return value.tolist()
+
+    return value
+
+def figure_to_compact_json(fig: go.Figure, decimals: int = 4) -> str:
+
+    payload = _compact_value(fig.to_plotly_json(), decimals)
+    return json.dumps(payload, cls=PlotlyJSONEncoder, separators=(',', ':')).replace('</', '<\\/')
+
+def write_plotly_bundle(output_dir: str) -> Path:
+
+    bundle_path = Path(output_dir) / PLOTLY_BUNDLE_NAME
+    bundle = get_plotlyjs()
+
+    if not bundle_path.exists() or bundle_path.stat().st_size != len(bundle.encode('utf-8')):
+        bundle_path.write_text(bundle, encoding='utf-8')
+        logger.info(f"Plotly.js compartilhado salvo em {bundle_path}")
+
+    return bundle_path
+
+def write_compact_figure(fig: go.Figure, path: str, decimals: int = 4) -> Tuple[str, str]:
+
+    title = fig.layout.title.text or Path(path).stem
+    payload = figure_to_compact_json(fig, decimals)
+    page = FIGURE_PAGE_TEMPLATE.format(title=title, bundle=PLOTLY_BUNDLE_NAME, payload=payload)
+    Path(path).write_text(page, encoding='utf-8')
+
+    return title, payload
+
+def write_dashboard_sections(entries: Iterable[Tuple[str, str, str]], path: str,
+                             title: str = "Análise de Equidade Educacional") -> None:
+
+    links = []
+    sections = []
+
+    for name, figure_title, payload in entries:
+        links.append(f'<a href="#{name}-titulo">{figure_title}</a>')
+        sections.append(SECTION_TEMPLATE.format(name=name, title=figure_title, payload=payload))
+
+    page = DASHBOARD_TEMPLATE.format(title=title, bundle=PLOTLY_BUNDLE_NAME,
+                                     links='\n'.join(links), sections='\n'.join(sections))
+    Path(path).write_text(page, encoding='utf-8')
+
+def write_dashboard(figures: Union[Dict[str, go.Figure], Iterable[Tuple[str, go.Figure]]], path: str,
+                    decimals: int = 4, title: str = "Análise de Equidade Educacional") -> None:
+
+    entries = ((name, fig.layout.title.text or name, figure_to_compact_json(fig, decimals))
+               for name, fig in (figures.items() if isinstance(figures, dict) else figures))
+    write_dashboard_sections(entries, path, title)
@@ -0,0 +1,345 @@
+import os
+import json
+import pickle
+from io import BytesIO
+import pandas as pd
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple, Any, Optional
+import logging
+from pathlib import Path
+
+from data_processing.fingerprint import HASH_ALGORITHM, fingerprint_bytes
+from visualization.figure_specs import build_figure_specs
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".manifesto.json"
+GROUP_COLORS = ['#ff7f7f', '#7f7fff']
+GROUP_LABELS = ['Minorias', 'Não Minorias']
+
+def init_render_worker() -> None:
+
+    import matplotlib
+    matplotlib.use('Agg')
+
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    plt.style.use('default')
+    sns.set_palette("husl")
+    plt.rcParams['figure.figsize'] = (12, 8)
+    plt.rcParams['font.size'] = 12
+
+def plot_score_distribution(payload: Dict[str, Any]):
+
+    import matplotlib.pyplot as plt
+
+    fig, axes = plt.subplots(1, 2, figsize=(15, 6))
+
+    for ax, subject, title in zip(axes, ['NOTA_MATEMATICA', 'NOTA_PORTUGUES'],
+                                  ['Distribuição das Notas de Matemática', 'Distribuição das Notas de Português']):
+        histogram = payload['histograms'][subject]
+        edges = histogram['edges']
+        centers = (edges[:-1] + edges[1:]) / 2
+        ax.hist([centers, centers], bins=edges, weights=[histogram['minority'], histogram['non_minority']],
+                alpha=0.7, label=GROUP_LABELS, color=GROUP_COLORS)
+        ax.set_title(title, fontsize=14, fontweight='bold')
+        ax.set_xlabel('Nota')
+        ax.set_ylabel('Frequência')
+        ax.legend()
+        ax.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    return fig
+
+def _box_drawing_stats(box: Optional[Dict[str, Any]], label: str) -> Dict[str, Any]:
+
+    if box is None:
+        return {'label': label, 'med': np.nan, 'q1': np.nan, 'q3': np.nan, 'whislo': np.nan, 'whishi': np.nan,
+                'fliers': []}
+
+    return {'label': label, 'med': box['median'], 'q1': box['q1'], 'q3': box['q3'],
+            'whislo': box['lowerfence'], 'whishi': box['upperfence'], 'mean': box['mean'],
+            'fliers': box['outliers']}
+
+def plot_group_comparison(payload: Dict[str, Any]):
+
+    import matplotlib.pyplot as plt
+
+    fig, axes = plt.subplots(1, 2, figsize=(15, 6))
+
+    for ax, subject, title in zip(axes, ['NOTA_MATEMATICA', 'NOTA_PORTUGUES'],
+                                  ['Notas de Matemática por Grupo', 'Notas de Português por Grupo']):
+        stats = [_box_drawing_stats(payload['boxes'][subject][group], label)
+                 for group, label in zip(['minority', 'non_minority'], GROUP_LABELS)]
+        boxes = ax.bxp(stats, patch_artist=True)
+        for box, color in zip(boxes['boxes'], GROUP_COLORS):
+            box.set_facecolor(color)
+        ax.set_title(title, fontsize=14, fontweight='bold')
+        ax.set_ylabel('Nota')
+        ax.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    return fig
+
+def plot_correlation_matrix(payload: Dict[str, Any]):
+
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    correlation_data = payload['correlation']
+
+    fig = plt.figure(figsize=(10, 8))
+    mask = np.triu(np.ones_like(correlation_data, dtype=bool))
+    sns.heatmap(correlation_data, annot=True, cmap='coolwarm', center=0,
+                square=True, fmt='.3f', mask=mask, cbar_kws={'shrink': 0.8})
+    plt.title('Matriz de Correlação - Variáveis Educacionais', fontsize=16, fontweight='bold')
+    plt.tight_layout()
+    return fig
+
+def _significance_bars(ax, hypotheses: List[str], p_values: List[float], title: str,
+                       significant: Optional[List[bool]] = None) -> None:
+
+    significant = significant if significant is not None else [p < 0.05 for p in p_values]
+    colors = ['red' if flag else 'green' for flag in significant]
+    bars = ax.bar(hypotheses, p_values, color=colors, alpha=0.7)
+    ax.axhline(y=0.05, color='red', linestyle='--', linewidth=2, label='Nível de significância (α = 0.05)')
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.set_ylabel('p-value')
+    ax.set_ylim(0, 1)
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+    for bar, p_val in zip(bars, p_values):
+        height = bar.get_height()
+        ax.text(bar.get_x() + bar.get_width() / 2., height + 0.01,
+                f'{p_val:.3f}', ha='center', va='bottom', fontweight='bold')
+
+def plot_hypothesis_results(payload: Dict[str, Any]):
+
+    import matplotlib.pyplot as plt
+
+    fig, axes = plt.subplots(1, 2, figsize=(16, 6))
+
+    _significance_bars(axes[0], payload['hypotheses'], payload['p_values'],
+                       'Significância Estatística das Hipóteses', payload.get('significant'))
+
+    bars = axes[1].bar(payload['hypotheses'], payload['effect_sizes'], color='skyblue', alpha=0.7)
+    axes[1].set_title('Tamanho do Efeito das Hipóteses', fontsize=14, fontweight='bold')
+    axes[1].set_ylabel('Tamanho do Efeito')
+    axes[1].grid(True, alpha=0.3)
+
+    for bar, effect in zip(bars, payload['effect_sizes']):
+        height = bar.get_height()
+        axes[1].text(bar.get_x() + bar.get_width() / 2., height + 0.1,
+                     f'{effect:.2f}', ha='center', va='bottom', fontweight='bold')
+
+    plt.tight_layout()
+    return fig
+
+def plot_hypothesis_significance(payload: Dict[str, Any]):
+
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    _significance_bars(ax, payload['hypotheses'], payload['p_values'],
+                       payload.get('title', 'Significância Estatística das Hipóteses'), payload.get('significant'))
+
+    plt.tight_layout()
+    return fig
+
+def plot_hypothesis_tests(payload: Dict[str, Any]):
+
+    import matplotlib.pyplot as plt
+
+    tests = payload['tests']
+    p_values = np.asarray(payload['p_values'], dtype=np.float64)
+    positions = np.arange(len(tests))
+
+    fig, ax = plt.subplots(figsize=(8, max(3, 0.6 * len(tests) + 1.5)))
+
+    significant = payload.get('significant') or [p < 0.05 for p in p_values]
+    colors = ['red' if flag else 'green' for flag in significant]
+    ax.barh(positions, p_values, color=colors, alpha=0.7, label='p-value')
+    if payload.get('p_values_adjusted') is not None:
+        ax.scatter(payload['p_values_adjusted'], positions, marker='D', color='black', zorder=3,
+                   label='p-value ajustado')
+    ax.axvline(x=0.05, color='red', linestyle='--', linewidth=2, label='α = 0.05')
+
+    ax.set_yticks(positions, [test.replace('_', ' ') for test in tests])
+    ax.invert_yaxis()
+    ax.set_xlim(0, 1)
+    ax.set_xlabel('p-value')
+    ax.set_title(payload['title'], fontsize=14, fontweight='bold')
+    ax.legend(loc='lower right')
+    ax.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    return fig
+
+def plot_executive_summary(payload: Dict[str, Any]):
+
+    import matplotlib.pyplot as plt
+
+    confirmed_count = payload['confirmed_count']
+    rejected_count = payload['total_hypotheses'] - confirmed_count
+
+    fig, ax = plt.subplots(figsize=(12, 8))
+
+    wedges, texts, autotexts = ax.pie([confirmed_count, rejected_count], explode=(0.1, 0),
+                                      labels=[f'Confirmadas\n({confirmed_count})', f'Rejeitadas\n({rejected_count})'],
+                                      colors=['#2ecc71', '#e74c3c'],
+                                      autopct='%1.1f%%', shadow=True, startangle=90)
+
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontweight('bold')
+        autotext.set_fontsize(12)
+
+    ax.set_title('Resultados dos Testes de Hipóteses\nAnálise de Equidade Educacional',
+                 fontsize=16, fontweight='bold', pad=20)
+
+    info_text = (f"Total de alunos: {payload['total_students']:,}\n"
+                 f"Hipóteses testadas: {payload['total_hypotheses']}\n"
+                 f"Confirmadas: {confirmed_count}\n"
+                 f"Rejeitadas: {rejected_count}\n"
+                 f"Nível de significância: α = 0.05")
+
+    ax.text(1.3, 0.5, info_text, transform=ax.transAxes, fontsize=10,
+            verticalalignment='center', bbox=dict(boxstyle="round,pad=0.3", facecolor="lightblue", alpha=0.5))
+
+    plt.tight_layout()
+    return fig
+
+MATPLOTLIB_RENDERERS = {
+    'score_distribution': plot_score_distribution,
+    'group_comparison': plot_group_comparison,
+    'correlation_matrix': plot_correlation_matrix,
+    'hypothesis_results': plot_hypothesis_results,
+    'hypothesis_significance': plot_hypothesis_significance,
+    'hypothesis_tests': plot_hypothesis_tests,
+    'executive_summary': plot_executive_summary,
+}
+
+def matplotlib_jobs(data: pd.DataFrame, results: Dict[str, Any],
+                    specs: Optional[Dict[str, Any]] = None) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+
+    specs = specs if specs is not None else build_figure_specs(data, results)
+    summary = specs['hypotheses']
+    hypotheses = [hypothesis.replace(' ', '\n') for hypothesis in summary['hypotheses']]
+
+    return {
+        '01_distribuicao_notas': ('score_distribution', specs['groups']),
+        '02_comparacao_grupos': ('group_comparison', specs['groups']),
+        '03_matriz_correlacao': ('correlation_matrix', {'correlation': specs['correlation']}),
+        '04_resultados_hipoteses': ('hypothesis_results', {'hypotheses': hypotheses,
+                                                          'p_values': summary['p_values'],
+                                                          'effect_sizes': summary['effect_sizes'],
+                                                          'significant': summary['confirmed']}),
+        '05_resumo_executivo': ('executive_summary', {'confirmed_count': summary['confirmed_count'],
+                                                      'total_hypotheses': summary['total_hypotheses'],
+                                                      'total_students': specs['total_students']})
+    }
+
+def _render_job(name: str, renderer: str, payload: Any, output_dir: str,
+                formats: Tuple[str, ...], dpi: int) -> List[str]:
+
+    paths = [str(Path(output_dir) / f"{name}.{fmt}") for fmt in formats]
+
+    if renderer == 'plotly':
+        import plotly.graph_objects as go
+        fig = go.Figure(payload)
+        try:
+            for path in paths:
+                fig.write_image(path, scale=dpi / 100)
+        except (ImportError, ValueError, RuntimeError) as e:
+            logger.warning(f"Não foi possível exportar {name} como imagem estática: {e}")
+            return []
+        return paths
+
+    import matplotlib.pyplot as plt
+
+    fig = MATPLOTLIB_RENDERERS[renderer](payload)
+    for path in paths:
+        fig.savefig(path, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+
+    return paths
+
+def render_png(renderer: str, payload: Any, dpi: int = 150) -> bytes:
+
+    import matplotlib.pyplot as plt
+
+    fig = MATPLOTLIB_RENDERERS[renderer](payload)
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+
+    return buffer.getvalue()
+
+def render_png_images(jobs: Dict[str, Tuple[str, Any]], dpi: int = 150,
+                      n_workers: Optional[int] = None) -> Dict[str, bytes]:
+
+    job_keys = {}
+    unique_jobs = {}
+    for name, (renderer, payload) in jobs.items():
+        key = fingerprint_bytes(pickle.dumps((renderer, payload, dpi), protocol=pickle.HIGHEST_PROTOCOL))
+        job_keys[name] = key
+        unique_jobs.setdefault(key, (renderer, payload))
+
+    rendered = {}
+    if n_workers == 1:
+        rendered = {key: render_png(renderer, payload, dpi) for key, (renderer, payload) in unique_jobs.items()}
+    elif unique_jobs:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=init_render_worker) as executor:
+            futures = {key: executor.submit(render_png, renderer, payload, dpi)
+                       for key, (renderer, payload) in unique_jobs.items()}
+            rendered = {key: future.result() for key, future in futures.items()}
+
+    images_by_hash = {}
+    images = {}
+    for name, key in job_keys.items():
+        image = rendered[key]
+        images[name] = images_by_hash.setdefault(fingerprint_bytes(image), image)
+
+    logger.info(f"Imagens renderizadas: {len(unique_jobs)} de {len(jobs)} gráfico(s), "
+                f"{len(images_by_hash)} imagem(ns) distinta(s)")
+
+    return images
+
+def export_static_figures(jobs: Dict[str, Tuple[str, Any]], output_dir: str,
+                          formats: Tuple[str, ...] = ('png',), dpi: int = 300,
+                          n_workers: Optional[int] = None) -> List[str]:
+
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = Path(output_dir) / MANIFEST_NAME
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+    pending = {}
+    for name, (renderer, payload) in jobs.items():
+        fingerprint = fingerprint_bytes(pickle.dumps((renderer, payload, formats, dpi, HASH_ALGORITHM),
+                                                     protocol=pickle.HIGHEST_PROTOCOL))
+        outputs_exist = all((Path(output_dir) / f"{name}.{fmt}").exists() for fmt in formats)
+        if manifest.get(name) == fingerprint and outputs_exist:
+            continue
+        pending[name] = fingerprint
+
+    logger.info(f"Exportação estática: {len(pending)} figura(s) para gerar, "
+                f"{len(jobs) - len(pending)} inalterada(s)")
+
+    written = []
+    if pending:
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=init_render_worker) as executor:
+            futures = {name: executor.submit(_render_job, name, jobs[name][0], jobs[name][1],
+                                             output_dir, tuple(formats), dpi)
+                       for name in pending}
+            for name, future in futures.items():
+                paths = future.result()
+                if paths:
+                    manifest[name] = pending[name]
+                    written.extend(paths)
+
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    logger.info(f"Figuras estáticas salvas em {output_dir}")
+
+    return written
@@ -0,0 +1,121 @@
+import numpy as np
+import plotly.graph_objects as go
+from typing import Dict, List, Any, Optional
+
+def stratified_sample_indices(n_rows: int, n_samples: int, strata: Optional[np.ndarray] = None,
+                              rng: Optional[np.random.Generator] = None) -> np.ndarray:
+
+    rng = rng if rng is not None else np.random.default_rng(0)
+
+    if n_samples >= n_rows:
+        return np.arange(n_rows)
+
+    if strata is None:
+        return np.sort(rng.choice(n_rows, n_samples, replace=False))
+
+    labels, inverse = np.unique(strata, return_inverse=True)
+    sizes = np.bincount(inverse, minlength=len(labels))
+    quotas = np.maximum(np.floor(sizes / n_rows * n_samples).astype(int), 1)
+
+    selected = []
+    for label_index, quota in enumerate(quotas):
+        members = np.flatnonzero(inverse == label_index)
+        selected.append(rng.choice(members, min(quota, len(members)), replace=False))
+
+    return np.sort(np.concatenate(selected))
+
+def density_traces(x, y, name: str, bins: int = 100, style: str = 'heatmap',
+                   hover_points: int = 0, strata: Optional[np.ndarray] = None,
+                   colorscale: str = 'Viridis', x_label: str = 'x', y_label: str = 'y') -> List[Any]:
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    finite = np.isfinite(x) & np.isfinite(y)
+
+    counts, x_edges, y_edges = np.histogram2d(x[finite], y[finite], bins=bins)
+    x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+    z = np.where(counts.T > 0, counts.T, np.nan)
+
+    hovertemplate = f'{x_label}: %{{x:.2f}}<br>{y_label}: %{{y:.2f}}<br>Alunos: %{{z:,.0f}}<extra></extra>'
+    trace_type = go.Contour if style == 'contour' else go.Heatmap
+    traces = [trace_type(x=x_centers, y=y_centers, z=z, name=name, colorscale=colorscale,
+                         showscale=False, hovertemplate=hovertemplate)]
+
+    if hover_points:
+        index = stratified_sample_indices(len(x), hover_points,
+                                          strata if strata is None else np.asarray(strata))
+        traces.append(go.Scatter(x=x[index], y=y[index], mode='markers', name=f'{name} (amostra)',
+                                 marker=dict(size=3, opacity=0.4, color='black'),
+                                 hovertemplate=f'{x_label}: %{{x}}<br>{y_label}: %{{y}}<extra></extra>'))
+
+    return traces
+
+def histogram_counts(values, bins: int = 50, value_range: Optional[tuple] = None) -> tuple:
+
+    values = np.asarray(values, dtype=np.float64)
+    return np.histogram(values[np.isfinite(values)], bins=bins, range=value_range)
+
+def histogram_bar_trace(values, name: str, bins: int = 50, value_range: Optional[tuple] = None,
+                        opacity: float = 0.7, count_label: str = 'Alunos') -> go.Bar:
+
+    counts, edges = histogram_counts(values, bins, value_range)
+    centers = (edges[:-1] + edges[1:]) / 2
+
+    return go.Bar(x=centers, y=counts, width=np.diff(edges), name=name, opacity=opacity,
+                  hovertemplate=f'Faixa: %{{x:.1f}}<br>{count_label}: %{{y:,}}<extra></extra>')
+
+def box_statistics(values, max_outliers: int = 200, rng: Optional[np.random.Generator] = None) -> Optional[Dict[str, Any]]:
+
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    if values.size == 0:
+        return None
+
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    outliers = values[(values < q1 - 1.5 * iqr) | (values > q3 + 1.5 * iqr)]
+
+    if len(outliers) > max_outliers:
+        rng = rng if rng is not None else np.random.default_rng(0)
+        outliers = rng.choice(outliers, max_outliers, replace=False)
+
+    return {
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'lowerfence': inside.min() if len(inside) else q1,
+        'upperfence': inside.max() if len(inside) else q3,
+        'mean': values.mean(),
+        'outliers': outliers,
+        'n': len(values)
+    }
+
+def precomputed_box_traces(values, name: str, max_outliers: int = 200, **box_kwargs) -> List[Any]:
+
+    box = box_statistics(values, max_outliers)
+    if box is None:
+        return []
+
+    traces = [go.Box(x=[name], q1=[box['q1']], median=[box['median']], q3=[box['q3']],
+                     lowerfence=[box['lowerfence']], upperfence=[box['upperfence']],
+                     mean=[box['mean']], name=name, boxpoints=False, **box_kwargs)]
+
+    if len(box['outliers']):
+        traces.append(go.Scatter(x=[name] * len(box['outliers']), y=box['outliers'], mode='markers',
+                                 name=f'{name} (outliers)', showlegend=False,
+                                 marker=dict(size=3, opacity=0.5)))
+
+    return traces
+
+def top_k_indices(values, k: int, largest: bool = True) -> np.ndarray:
+
+    values = np.asarray(values, dtype=np.float64)
+    k = min(k, len(values))
+    if k == 0:
+        return np.array([], dtype=np.int64)
+
+    keys = -values if largest else values
+    candidates = np.argpartition(keys, k - 1)[:k]
+    return candidates[np.argsort(keys[candidates], kind='stable')]
@@ -1,6 +1,4 @@
 
-import matplotlib.pyplot as plt
-import seaborn as sns
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Any, Optional
@@ -8,67 +6,179 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import logging
-
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
+from collections import OrderedDict
+from visualization.traces import density_traces, histogram_bar_trace, precomputed_box_traces, top_k_indices
+from visualization.html_export import write_plotly_bundle, write_compact_figure, write_dashboard_sections
+from visualization.static_export import export_static_figures, matplotlib_jobs, MATPLOTLIB_RENDERERS
+from visualization.figure_specs import build_figure_specs
+from visualization.figure_registry import FIGURE_BUILDERS
+from pipeline.instrumentation import instrumented, measure
 
 logger = logging.getLogger(__name__)
 
+class FigureCache(OrderedDict):
+    
+    def __init__(self, max_size: Optional[int] = None):
+        
+        super().__init__()
+        self.max_size = max_size
+    
+    def __setitem__(self, key, value):
+        
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while self.max_size is not None and len(self) > self.max_size:
+            evicted, _ = self.popitem(last=False)
+            logger.info(f"Figura removida do cache: {evicted}")
+
 class Visualizer:
     
-    def __init__(self, data: pd.DataFrame, results: Dict[str, Any]):
+    SCATTER_MODES = ('markers', 'webgl', 'density', 'auto')
+    
+    FIGURE_BUILDERS = FIGURE_BUILDERS
+    
+    def __init__(self, data: pd.DataFrame, results: Dict[str, Any], scatter_mode: str = 'markers',
+                 density_bins: int = 100, hover_sample: int = 2000, aggregate_traces: bool = False,
+                 histogram_bins: int = 50, max_outliers: int = 200, max_cached_figures: Optional[int] = None,
+                 school_bins: int = 20, ranking_k: int = 20, webgl_threshold: int = 5000,
+                 density_threshold: int = 500000, specs: Optional[Dict[str, Any]] = None):
+        
+        if scatter_mode not in self.SCATTER_MODES:
+            raise ValueError(f"Modo de dispersão desconhecido: {scatter_mode}. Use um de {self.SCATTER_MODES}")
         
-        self.vasco_data = data
+        if webgl_threshold > density_threshold:
+            raise ValueError("webgl_threshold deve ser menor ou igual a density_threshold")
+        
+        self.data = data
         self.results = results
-        self.figures = {}
+        self.figures = FigureCache(max_cached_figures)
+        self.scatter_mode = scatter_mode
+        self.density_bins = density_bins
+        self.hover_sample = hover_sample
+        self.aggregate_traces = aggregate_traces
+        self.histogram_bins = histogram_bins
+        self.max_outliers = max_outliers
+        self.school_bins = school_bins
+        self.ranking_k = ranking_k
+        self.webgl_threshold = webgl_threshold
+        self.density_threshold = density_threshold
+        self.specs = specs
+    
+    @classmethod
+    def available_figures(cls) -> List[str]:
+        
+        return list(cls.FIGURE_BUILDERS)
+    
+    def get_figure(self, name: str) -> go.Figure:
+        
+        if name not in self.FIGURE_BUILDERS:
+            raise ValueError(f"Figura desconhecida: {name}. Use uma de {self.available_figures()}")
+        
+        if name in self.figures:
+            self.figures.move_to_end(name)
+            return self.figures[name]
+        
+        logger.info(f"Construindo figura: {name}")
+        with measure(f"Visualizer.{self.FIGURE_BUILDERS[name]}", rows=len(self.data)):
+            fig = getattr(self, self.FIGURE_BUILDERS[name])()
+        self.figures[name] = fig
+        return fig
+    
+    def iter_figures(self, names: Optional[List[str]] = None):
+        
+        for name in (names if names is not None else list(self.figures)):
+            yield name, self.get_figure(name)
+    
+    def _point_cloud(self, x, y, name: str, strata=None, x_label: str = 'x', y_label: str = 'y',
+                     **scatter_kwargs) -> List[Any]:
+        
+        mode = self._resolve_scatter_mode(len(x))
+        
+        if mode == 'density':
+            return density_traces(x, y, name, bins=self.density_bins, hover_points=self.hover_sample,
+                                  strata=strata, x_label=x_label, y_label=y_label)
+        
+        trace_type = go.Scattergl if mode == 'webgl' else go.Scatter
+        return [trace_type(x=x, y=y, mode='markers', name=name, **scatter_kwargs)]
+    
+    def figure_specs(self) -> Dict[str, Any]:
+        
+        if self.specs is None:
+            self.specs = build_figure_specs(self.data, self.results)
+        return self.specs
+    
+    def _resolve_scatter_mode(self, n_points: int) -> str:
+        
+        if self.scatter_mode != 'auto':
+            return self.scatter_mode
+        
+        if n_points > self.density_threshold:
+            return 'density'
+        if n_points > self.webgl_threshold:
+            return 'webgl'
+        return 'markers'
+    
+    def _histogram(self, values, name: str, value_range: Optional[tuple] = None) -> Any:
+        
+        if self.aggregate_traces:
+            return histogram_bar_trace(values, name, bins=self.histogram_bins, value_range=value_range)
+        
+        return go.Histogram(x=values, name=name, opacity=0.7)
+    
+    def _box(self, values, name: str) -> List[Any]:
+        
+        if self.aggregate_traces:
+            return precomputed_box_traces(values, name, max_outliers=self.max_outliers)
+        
+        return [go.Box(y=values, name=name)]
         
     def create_overview_dashboard(self) -> go.Figure:
         
         fig = make_subplots(
             rows=2, cols=2,
-            subplot_titles=('Distribuição das Notas', 'Percentual de Minorias por Escola',
+            subplot_titles=('Distribuição das Notas', 'Escolas por Percentual de Minorias',
                           'Correlação NSE vs Notas', 'Infraestrutura vs Desempenho'),
             specs=[[{"secondary_y": False}, {"secondary_y": False}],
                    [{"secondary_y": False}, {"secondary_y": False}]]
         )
         
+        score_range = (min(self.data['NOTA_MATEMATICA'].min(), self.data['NOTA_PORTUGUES'].min()),
+                       max(self.data['NOTA_MATEMATICA'].max(), self.data['NOTA_PORTUGUES'].max()))
         fig.add_trace(
-            go.Histogram(x=self.data['NOTA_MATEMATICA'], name='Matemática', opacity=0.7),
+            self._histogram(self.data['NOTA_MATEMATICA'], 'Matemática', score_range),
             row=1, col=1
         )
         fig.add_trace(
-            go.Histogram(x=self.data['NOTA_PORTUGUES'], name='Português', opacity=0.7),
+            self._histogram(self.data['NOTA_PORTUGUES'], 'Português', score_range),
             row=1, col=1
         )
         
-        school_minority = self.data.groupby('CODIGO_ESCOLA')['MINORIA'].mean().reset_index()
+        school_minority = self.data.groupby('CODIGO_ESCOLA')['MINORIA'].mean()
         fig.add_trace(
-            go.Bar(x=school_minority['CODIGO_ESCOLA'], y=school_minority['MINORIA'] * 100,
-                   name='% Minorias'),
+            histogram_bar_trace(school_minority.to_numpy() * 100, '% Minorias', bins=self.school_bins,
+                                value_range=(0, 100), opacity=1.0, count_label='Escolas'),
             row=1, col=2
         )
         
-        fig.add_trace(
-            go.Scatter(x=self.data['NSE'], y=self.data['NOTA_MATEMATICA'],
-                      mode='markers', name='Matemática', opacity=0.6),
-            row=2, col=1
-        )
+        for trace in self._point_cloud(self.data['NSE'], self.data['NOTA_MATEMATICA'], 'Matemática',
+                                       strata=self.data['MINORIA'], x_label='NSE', y_label='Nota',
+                                       opacity=0.6):
+            fig.add_trace(trace, row=2, col=1)
         
-        school_vasco_stats = self.data.groupby('CODIGO_ESCOLA').agg({
+        school_stats = self.data.groupby('CODIGO_ESCOLA').agg({
             'INFRA_BOA': 'mean',
             'NOTA_MATEMATICA': 'mean'
         }).reset_index()
         
-        fig.add_trace(
-            go.Scatter(x=school_stats['INFRA_BOA'], y=school_stats['NOTA_MATEMATICA'],
-                      mode='markers', name='Escolas'),
-            row=2, col=2
-        )
+        for trace in self._point_cloud(school_stats['INFRA_BOA'], school_stats['NOTA_MATEMATICA'], 'Escolas',
+                                       x_label='Infraestrutura Boa (%)', y_label='Nota Média'):
+            fig.add_trace(trace, row=2, col=2)
         
         fig.update_layout(
             title_text="Dashboard de Análise de Equidade Educacional",
             showlegend=True,
-            height=800
+            height=800,
+            barmode='overlay'
         )
         
         self.figures['overview_dashboard'] = fig
@@ -91,7 +201,7 @@ class Visualizer:
     
     def _create_segregation_plot(self) -> go.Figure:
         
-        school_vasco_stats = self.data.groupby('CODIGO_ESCOLA').agg({
+        school_stats = self.data.groupby('CODIGO_ESCOLA').agg({
             'MINORIA': 'mean',
             'INFRA_BOA': 'mean',
             'NOTA_MATEMATICA': 'mean',
@@ -131,7 +241,7 @@ class Visualizer:
     
     def _create_teacher_quality_plot(self) -> go.Figure:
         
-        school_vasco_stats = self.data.groupby('CODIGO_ESCOLA').agg({
+        school_stats = self.data.groupby('CODIGO_ESCOLA').agg({
             'MINORIA': 'mean',
             'DOCENTE_QUALIFICADO': 'mean',
             'NOTA_MATEMATICA': 'mean',
@@ -156,15 +266,11 @@ class Visualizer:
             row=1, col=1
         )
         
-        fig.add_trace(
-            go.Scatter(x=school_stats['DOCENTE_QUALIFICADO'],
-                      y=school_stats['NOTA_MATEMATICA'],
-                      mode='markers',
-                      name='Escolas',
-                      text=school_stats['MINORIA'],
-                      hovertemplate='Qualificação: %{x}<br>Nota: %{y}<br>% Minorias: %{text}<extra></extra>'),
-            row=1, col=2
-        )
+        for trace in self._point_cloud(school_stats['DOCENTE_QUALIFICADO'], school_stats['NOTA_MATEMATICA'], 'Escolas',
+                                       x_label='Qualificação', y_label='Nota',
+                                       text=school_stats['MINORIA'],
+                                       hovertemplate='Qualificação: %{x}<br>Nota: %{y}<br>% Minorias: %{text}<extra></extra>'):
+            fig.add_trace(trace, row=1, col=2)
         
         fig.update_layout(
             title_text="Hipótese 2: Qualidade Docente",
@@ -184,24 +290,16 @@ class Visualizer:
                           'Correlação Capital Cultural vs Desempenho')
         )
         
-        fig.add_trace(
-            go.Box(y=minority_students['CAPITAL_CULTURAL'], name='Minorias'),
-            row=1, col=1
-        )
-        fig.add_trace(
-            go.Box(y=non_minority_students['CAPITAL_CULTURAL'], name='Não Minorias'),
-            row=1, col=1
-        )
+        for trace in self._box(minority_students['CAPITAL_CULTURAL'], 'Minorias'):
+            fig.add_trace(trace, row=1, col=1)
+        for trace in self._box(non_minority_students['CAPITAL_CULTURAL'], 'Não Minorias'):
+            fig.add_trace(trace, row=1, col=1)
         
-        fig.add_trace(
-            go.Scatter(x=self.data['CAPITAL_CULTURAL'],
-                      y=self.data['NOTA_MATEMATICA'],
-                      mode='markers',
-                      name='Alunos',
-                      marker=dict(color=self.data['MINORIA'], colorscale='RdYlBu'),
-                      hovertemplate='Capital Cultural: %{x}<br>Nota: %{y}<extra></extra>'),
-            row=1, col=2
-        )
+        for trace in self._point_cloud(self.data['CAPITAL_CULTURAL'], self.data['NOTA_MATEMATICA'], 'Alunos',
+                                       strata=self.data['MINORIA'], x_label='Capital Cultural', y_label='Nota',
+                                       marker=dict(color=self.data['MINORIA'], colorscale='RdYlBu'),
+                                       hovertemplate='Capital Cultural: %{x}<br>Nota: %{y}<extra></extra>'):
+            fig.add_trace(trace, row=1, col=2)
         
         fig.update_layout(
             title_text="Hipótese 3: Capital Cultural",
@@ -213,16 +311,16 @@ class Visualizer:
     def _create_peer_effect_plot(self) -> go.Figure:
         
         school_minority_pct = self.data.groupby('CODIGO_ESCOLA')['MINORIA'].mean().reset_index()
-        self.vasco_data = self.data.merge(school_minority_pct, on='CODIGO_ESCOLA', suffixes=('', '_ESCOLA'))
+        data = self.data.merge(school_minority_pct, on='CODIGO_ESCOLA', suffixes=('', '_ESCOLA'))
         
-        quartiles = self.data['MINORIA_ESCOLA'].quantile([0.25, 0.5, 0.75])
+        quartiles = data['MINORIA_ESCOLA'].quantile([0.25, 0.5, 0.75])
         
-        q1_students = self.data[self.data['MINORIA_ESCOLA'] <= quartiles[0.25]]
-        q2_students = self.data[(self.data['MINORIA_ESCOLA'] > quartiles[0.25]) & 
-                               (self.data['MINORIA_ESCOLA'] <= quartiles[0.5])]
-        q3_students = self.data[(self.data['MINORIA_ESCOLA'] > quartiles[0.5]) & 
-                               (self.data['MINORIA_ESCOLA'] <= quartiles[0.75])]
-        q4_students = self.data[self.data['MINORIA_ESCOLA'] > quartiles[0.75]]
+        q1_students = data[data['MINORIA_ESCOLA'] <= quartiles[0.25]]
+        q2_students = data[(data['MINORIA_ESCOLA'] > quartiles[0.25]) & 
+                           (data['MINORIA_ESCOLA'] <= quartiles[0.5])]
+        q3_students = data[(data['MINORIA_ESCOLA'] > quartiles[0.5]) & 
+                           (data['MINORIA_ESCOLA'] <= quartiles[0.75])]
+        q4_students = data[data['MINORIA_ESCOLA'] > quartiles[0.75]]
         
         fig = make_subplots(
             rows=1, cols=2,
@@ -231,24 +329,18 @@ class Visualizer:
         )
         
         quartil_names = ['Q1 (Baixa)', 'Q2', 'Q3', 'Q4 (Alta)']
-        quartil_vasco_data = [q1_students['NOTA_MATEMATICA'], q2_students['NOTA_MATEMATICA'],
-                       q3_students['NOTA_MATEMATICA'], q4_students['NOTA_MATEMATICA']]
+        quartil_data = [q1_students['NOTA_MATEMATICA'], q2_students['NOTA_MATEMATICA'],
+                        q3_students['NOTA_MATEMATICA'], q4_students['NOTA_MATEMATICA']]
         
-        for i, (name, data) in enumerate(zip(quartil_names, quartil_data)):
-            fig.add_trace(
-                go.Box(y=data, name=name),
-                row=1, col=1
-            )
+        for name, scores in zip(quartil_names, quartil_data):
+            for trace in self._box(scores, name):
+                fig.add_trace(trace, row=1, col=1)
         
-        fig.add_trace(
-            go.Scatter(x=self.data['MINORIA_ESCOLA'],
-                      y=self.data['NOTA_MATEMATICA'],
-                      mode='markers',
-                      name='Alunos',
-                      opacity=0.6,
-                      hovertemplate='% Minorias Escola: %{x}<br>Nota: %{y}<extra></extra>'),
-            row=1, col=2
-        )
+        for trace in self._point_cloud(data['MINORIA_ESCOLA'], data['NOTA_MATEMATICA'], 'Alunos',
+                                       strata=data['MINORIA'], x_label='% Minorias Escola', y_label='Nota',
+                                       opacity=0.6,
+                                       hovertemplate='% Minorias Escola: %{x}<br>Nota: %{y}<extra></extra>'):
+            fig.add_trace(trace, row=1, col=2)
         
         fig.update_layout(
             title_text="Hipótese 4: Efeito de Pares",
@@ -257,33 +349,50 @@ class Visualizer:
         
         return fig
     
+    def create_school_minority_ranking(self, k: Optional[int] = None) -> go.Figure:
+        
+        k = k or self.ranking_k
+        school_minority = self.data.groupby('CODIGO_ESCOLA')['MINORIA'].agg(['mean', 'size'])
+        codes = school_minority.index.to_numpy()
+        shares = school_minority['mean'].to_numpy() * 100
+        sizes = school_minority['size'].to_numpy()
+        
+        fig = make_subplots(
+            rows=1, cols=2,
+            subplot_titles=(f'{k} Escolas com Maior % de Minorias',
+                          f'{k} Escolas com Menor % de Minorias')
+        )
+        
+        for col, largest, color in [(1, True, 'lightcoral'), (2, False, 'lightblue')]:
+            index = top_k_indices(shares, k, largest=largest)
+            fig.add_trace(
+                go.Bar(x=[str(code) for code in codes[index]], y=shares[index], marker_color=color,
+                       name='Maior %' if largest else 'Menor %', customdata=sizes[index],
+                       hovertemplate='Escola: %{x}<br>% Minorias: %{y:.1f}<br>Alunos: %{customdata}<extra></extra>'),
+                row=1, col=col
+            )
+            fig.update_xaxes(type='category', row=1, col=col)
+        
+        fig.update_layout(
+            title_text="Ranking de Escolas por Percentual de Minorias",
+            showlegend=False
+        )
+        
+        return fig
+    
     def create_statistical_summary_plot(self) -> go.Figure:
         
-        hypotheses = []
-        p_values = []
-        effect_sizes = []
-        
-        for key, result in self.results.items():
-            hypotheses.append(result['hypothesis'])
-            
-            min_p_value = 1.0
-            max_effect_size = 0.0
-            
-            for test_name, test_result in result['tests'].items():
-                if isinstance(test_result, dict) and 'p_value' in test_result:
-                    min_p_value = min(min_p_value, test_result['p_value'])
-                    if 'effect_size' in test_result:
-                        max_effect_size = max(max_effect_size, abs(test_result['effect_size']))
-            
-            p_values.append(min_p_value)
-            effect_sizes.append(max_effect_size)
+        summary = self.figure_specs()['hypotheses']
+        hypotheses = summary['hypotheses']
+        p_values = summary['p_values']
+        effect_sizes = summary['effect_sizes']
         
         fig = make_subplots(
             rows=1, cols=2,
             subplot_titles=('Significância Estatística (p-values)', 'Tamanho do Efeito')
         )
         
-        colors = ['red' if p < 0.05 else 'green' for p in p_values]
+        colors = ['red' if flag else 'green' for flag in summary['confirmed']]
         fig.add_trace(
             go.Bar(x=hypotheses, y=p_values, marker_color=colors, name='p-value'),
             row=1, col=1
@@ -303,64 +412,71 @@ class Visualizer:
         
         return fig
     
-    def save_all_figures(self, output_dir: str) -> None:
+    @instrumented('Visualizer.save_all_figures')
+    def save_all_figures(self, output_dir: str, mode: str = 'standalone', decimals: int = 4,
+                         combined: bool = False, names: Optional[List[str]] = None) -> None:
         
         import os
         os.makedirs(output_dir, exist_ok=True)
         
-        for name, fig in self.figures.items():
-            fig.write_html(f"{output_dir}/{name}.html")
+        names = names or self.available_figures()
+        
+        if mode == 'standalone':
+            for name, fig in self.iter_figures(names):
+                fig.write_html(f"{output_dir}/{name}.html")
+        elif mode == 'shared':
+            write_plotly_bundle(output_dir)
+            sections = []
+            for name, fig in self.iter_figures(names):
+                title, payload = write_compact_figure(fig, f"{output_dir}/{name}.html", decimals)
+                sections.append((name, title, payload))
+            if combined:
+                write_dashboard_sections(sections, f"{output_dir}/painel.html")
+        else:
+            raise ValueError(f"Modo de exportação desconhecido: {mode}. Use 'standalone' ou 'shared'")
 
         logger.info(f"Figuras salvas em {output_dir}")
     
-    def create_matplotlib_figures(self) -> Dict[str, plt.Figure]:
-        
-        matplotlib_figs = {}
-        
-        fig1, axes = plt.subplots(1, 2, figsize=(15, 6))
-        
-        minority_students = self.data[self.data['MINORIA']]
-        non_minority_students = self.data[~self.data['MINORIA']]
-        
-        axes[0].hist([minority_students['NOTA_MATEMATICA'], non_minority_students['NOTA_MATEMATICA']],
-                    bins=30, alpha=0.7, label=['Minorias', 'Não Minorias'])
-        axes[0].set_title('Distribuição das Notas de Matemática')
-        axes[0].set_xlabel('Nota')
-        axes[0].set_ylabel('Frequência')
-        axes[0].legend()
-        
-        axes[1].hist([minority_students['NOTA_PORTUGUES'], non_minority_students['NOTA_PORTUGUES']],
-                    bins=30, alpha=0.7, label=['Minorias', 'Não Minorias'])
-        axes[1].set_title('Distribuição das Notas de Português')
-        axes[1].set_xlabel('Nota')
-        axes[1].set_ylabel('Frequência')
-        axes[1].legend()
+    def static_figure_jobs(self, names: Optional[List[str]] = None) -> Dict[str, tuple]:
         
-        plt.tight_layout()
-        matplotlib_figs['score_distribution'] = fig1
+        jobs = matplotlib_jobs(self.data, self.results, self.figure_specs())
+        for name, fig in self.iter_figures(names if names is not None else self.available_figures()):
+            jobs[name] = ('plotly', fig.to_plotly_json())
         
-        fig2, ax = plt.subplots(figsize=(10, 8))
+        return jobs
+    
+    def export_static_figures(self, output_dir: str, formats: tuple = ('png',), dpi: int = 300,
+                              n_workers: Optional[int] = None, names: Optional[List[str]] = None) -> List[str]:
         
-        correlation_vasco_data = self.data[['NOTA_MATEMATICA', 'NOTA_PORTUGUES', 'NSE', 
-                                    'CAPITAL_CULTURAL', 'INFRA_BOA', 'DOCENTE_QUALIFICADO']].corr()
+        return export_static_figures(self.static_figure_jobs(names), output_dir, formats=formats, dpi=dpi,
+                                     n_workers=n_workers)
+    
+    def create_matplotlib_figures(self) -> Dict[str, Any]:
         
-        sns.heatmap(correlation_data, annot=True, cmap='coolwarm', center=0, ax=ax)
-        ax.set_title('Matriz de Correlação')
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        plt.style.use('seaborn-v0_8')
+        sns.set_palette("husl")
         
-        matplotlib_figs['correlation_matrix'] = fig2
+        jobs = matplotlib_jobs(self.data, self.results, self.figure_specs())
         
-        return matplotlib_figs
+        return {
+            'score_distribution': MATPLOTLIB_RENDERERS['score_distribution'](jobs['01_distribuicao_notas'][1]),
+            'correlation_matrix': MATPLOTLIB_RENDERERS['correlation_matrix'](jobs['03_matriz_correlacao'][1])
+        }
 
-if __name__ == "__main__":
-
-    from data_processing.data_processor import create_sample_data
-    from analysis.hypothesis_tester import HypothesisTester
 vasco_config = True
 vasco_debug = False
 vasco_version = '1.0'
 vasco_mode = 'production'
 
+if __name__ == "__main__":
+
+    from data_processing.data_processor import create_sample_data
+    from analysis.hypothesis_tester import HypothesisTester
     
+    sample_data = create_sample_data(1000)
+    results = HypothesisTester(sample_data).run_all_tests()
     
     visualizer = Visualizer(sample_data, results)
     
@@ -1,5 +1,9 @@
 
 import sys
+import json
+import argparse
+import platform
+import tempfile
 from pathlib import Path
 
 vasco_config = True
@@ -9,6 +13,11 @@ vasco_mode = 'production'
 
 sys.path.append(str(Path(__file__).parent / "src"))
 
+PERFORMANCE_BASELINE = Path(__file__).parent / "benchmarks" / "referencia_desempenho.json"
+PERFORMANCE_STUDENTS = 100000
+PERFORMANCE_MIN_SECONDS = 0.002
+PERFORMANCE_MIN_BYTES = 16 * 2**20
+
 def test_imports():
     
     try:
@@ -34,6 +43,7 @@ def test_data_processing():
     try:
         from data_processing.data_processor import create_sample_data
         
+        sample_data = create_sample_data(1000)
         print(f"✅ Dados de exemplo criados: {len(sample_data)} linhas")
         
         required_columns = ['NOTA_MATEMATICA', 'NOTA_PORTUGUES', 'MINORIA', 'NSE', 
@@ -57,7 +67,9 @@ def test_hypothesis_testing():
         from data_processing.data_processor import create_sample_data
         from analysis.hypothesis_tester import HypothesisTester
         
-        
+        sample_data = create_sample_data(1000)
+        hypothesis_tester = HypothesisTester(sample_data)
+        results = hypothesis_tester.run_all_tests()
         
         print(f"✅ Testes de hipóteses executados: {len(results)} hipóteses testadas")
         
@@ -85,12 +97,27 @@ def test_visualization():
         from analysis.hypothesis_tester import HypothesisTester
         from visualization.visualizer import Visualizer
         
+        sample_data = create_sample_data(1000)
+        results = HypothesisTester(sample_data).run_all_tests()
         
         visualizer = Visualizer(sample_data, results)
         dashboard = visualizer.create_overview_dashboard()
         hypothesis_viz = visualizer.create_hypothesis_visualizations()
         summary_plot = visualizer.create_statistical_summary_plot()
         
+        jobs = Visualizer(sample_data, results, max_cached_figures=1).static_figure_jobs()
+        missing = [name for name in Visualizer.available_figures() if jobs.get(name, ('',))[0] != 'plotly']
+        if missing:
+            print(f"❌ Exportação estática omitiu figuras fora do cache: {missing}")
+            return False
+        
+        with tempfile.TemporaryDirectory() as output_dir:
+            Visualizer(sample_data, results, max_cached_figures=0).save_all_figures(output_dir)
+            saved = sorted(path.stem for path in Path(output_dir).glob("*.html"))
+        if saved != sorted(Visualizer.available_figures()):
+            print(f"❌ Exportação HTML salvou apenas {saved}")
+            return False
+        
         print("✅ Visualizações criadas com sucesso")
         print(f"   • Dashboard de visão geral")
         print(f"   • {len(hypothesis_viz)} visualizações de hipóteses")
@@ -102,6 +129,270 @@ def test_visualization():
         print(f"❌ Erro na criação de visualizações: {e}")
         return False
 
+def test_result_cache():
+    
+    try:
+        import time
+        import pandas as pd
+        from data_processing.data_processor import create_sample_data
+        from data_processing.fingerprint import fingerprint_dataframe
+        import analysis.result_cache as result_cache
+        
+        dates = pd.DataFrame({'DATA': pd.date_range('2024-01-01', periods=3),
+                              'DURACAO': pd.to_timedelta([1, 2, 3], unit='s')})
+        changed_dates = dates.assign(DATA=dates['DATA'] + pd.Timedelta(days=1))
+        if fingerprint_dataframe(dates) == fingerprint_dataframe(changed_dates):
+            print("❌ Impressão digital ignora colunas de data")
+            return False
+        
+        sample_data = create_sample_data(500)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            source = Path(tmp_dir) / "codigo.py"
+            source.write_text("versao = 1")
+            original_sources = result_cache.ANALYSIS_SOURCES
+            result_cache.ANALYSIS_SOURCES = [source]
+            
+            try:
+                cache = result_cache.ResultCache(f"{tmp_dir}/cache", max_entries=2)
+                key = cache.make_key(sample_data, {'alpha': 0.05})
+                cache.set(key, {'valor': 1})
+                
+                if cache.get(key) != {'valor': 1}:
+                    print("❌ Cache não recuperou a entrada gravada")
+                    return False
+                
+                changed_data = sample_data.assign(NSE=sample_data['NSE'] + 1)
+                if cache.get(cache.make_key(changed_data, {'alpha': 0.05})) is not None:
+                    print("❌ Cache reutilizado após mudança nos dados")
+                    return False
+                
+                source.write_text("versao = 2")
+                new_code_cache = result_cache.ResultCache(f"{tmp_dir}/cache", max_entries=2)
+                if new_code_cache.get(new_code_cache.make_key(sample_data, {'alpha': 0.05})) is not None:
+                    print("❌ Cache reutilizado após mudança no código")
+                    return False
+                
+                original_algorithm = result_cache.HASH_ALGORITHM
+                result_cache.HASH_ALGORITHM = 'outro'
+                try:
+                    other_hash_key = cache.make_key(sample_data, {'alpha': 0.05})
+                finally:
+                    result_cache.HASH_ALGORITHM = original_algorithm
+                if other_hash_key == key:
+                    print("❌ Chave do cache não depende do algoritmo de hash")
+                    return False
+                
+                keys = [cache.make_key(sample_data, {'alpha': alpha}) for alpha in (0.01, 0.1)]
+                time.sleep(0.05)
+                cache.set(keys[0], {'valor': 2})
+                time.sleep(0.05)
+                cache.get(key)
+                time.sleep(0.05)
+                cache.set(keys[1], {'valor': 3})
+                
+                if cache.get(keys[0]) is not None or cache.get(key) is None or cache.get(keys[1]) is None:
+                    print("❌ Cache não removeu a entrada menos usada")
+                    return False
+            finally:
+                result_cache.ANALYSIS_SOURCES = original_sources
+        
+        print("✅ Cache de resultados funcionando")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Erro no cache de resultados: {e}")
+        return False
+
+def test_compact_precision():
+    
+    try:
+        import numpy as np
+        from sklearn.linear_model import LinearRegression
+        from data_processing.data_processor import create_sample_data
+        import analysis.precision as precision
+        
+        rng = np.random.default_rng(7)
+        X = rng.normal([500, 0.5, 10], [50, 0.3, 3], size=(200000, 3))
+        y = X @ np.array([0.8, -20, 3]) + rng.normal(0, 30, len(X)) + 200
+        reference = LinearRegression().fit(X, y)
+        
+        original_chunk_rows = precision.CHUNK_ROWS
+        precision.CHUNK_ROWS = 4096
+        try:
+            X_compact, y_compact = X.astype(np.float32), y.astype(np.float32)
+            compact = precision.CompactLinearRegression().fit(X_compact, y_compact)
+            r_squared_deviation = abs(compact.score(X_compact, y_compact) - reference.score(X, y))
+        finally:
+            precision.CHUNK_ROWS = original_chunk_rows
+        
+        coefficient_deviation = np.max(np.abs(compact.coef_ - reference.coef_) /
+                                       np.maximum(np.abs(reference.coef_), 1.0))
+        intercept_deviation = abs(compact.intercept_ - reference.intercept_) / max(abs(reference.intercept_), 1.0)
+        worst = max(coefficient_deviation, intercept_deviation, r_squared_deviation)
+        if not worst <= precision.DEFAULT_TOLERANCE:
+            print(f"❌ Regressão em blocos float32 desviou {worst:.2e} do ajuste float64")
+            return False
+        
+        deviations = precision.validate_compact_mode(create_sample_data(5000))
+        if not max(deviations.values()) <= precision.DEFAULT_TOLERANCE:
+            print("❌ Modo compacto fora da tolerância")
+            return False
+        
+        try:
+            precision.compare_results({'a': {'b': 1.0}}, {'a': {'b': 1.1}})
+            print("❌ Desvio acima da tolerância não foi detectado")
+            return False
+        except ValueError:
+            pass
+        
+        print("✅ Precisão do modo compacto garantida")
+        print(f"   • Regressão em blocos: desvio máximo {worst:.2e}")
+        print(f"   • Hipóteses: desvio máximo {max(deviations.values()):.2e}")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Erro na validação do modo compacto: {e}")
+        return False
+
+def test_incremental_parity():
+    
+    try:
+        import numpy as np
+        from data_processing.data_processor import create_sample_data
+        from analysis.hypothesis_tester import HypothesisTester
+        from analysis.incremental_tester import IncrementalHypothesisTester
+        
+        sample_data = create_sample_data(3000)
+        expected = HypothesisTester(sample_data).run_all_tests()
+        
+        tester = IncrementalHypothesisTester()
+        for start in range(0, len(sample_data), 700):
+            tester.partial_fit(sample_data.iloc[start:start + 700])
+        batched = tester.run_all_tests()
+        
+        def flatten(result, prefix=''):
+            for key, value in result.items():
+                if isinstance(value, dict):
+                    yield from flatten(value, f"{prefix}{key}.")
+                elif not isinstance(value, str):
+                    yield f"{prefix}{key}", float(value)
+        
+        expected_values = dict(flatten(expected))
+        batched_values = dict(flatten(batched))
+        
+        if expected_values.keys() != batched_values.keys():
+            print("❌ Resultados incrementais com campos diferentes")
+            return False
+        
+        different = [name for name, value in expected_values.items()
+                     if not np.isclose(batched_values[name], value, rtol=1e-6, atol=1e-9)]
+        if different:
+            print(f"❌ Resultados incrementais divergem em: {different}")
+            return False
+        
+        print(f"✅ Testes incrementais equivalentes ({len(expected_values)} valores comparados)")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Erro na comparação dos testes incrementais: {e}")
+        return False
+
+def test_power_analysis():
+    
+    try:
+        from data_processing.data_processor import create_sample_data
+        from analysis.power_analysis import PowerAnalysis
+        
+        if not create_sample_data(500).equals(create_sample_data(500)):
+            print("❌ Dados de exemplo não são reprodutíveis")
+            return False
+        
+        rates = {}
+        for minority_effect in (-50, 0):
+            analysis = PowerAnalysis(n_students=2000, n_schools=100, effects={'minority': minority_effect})
+            summary = analysis.run(n_simulations=20, batch_size=10, n_workers=1)
+            rates[minority_effect] = summary.set_index(['hypothesis', 'test'])['rejection_rate']
+        
+        minority_tests = [('hypothesis_1', 'math_score_difference'), ('hypothesis_4', 'peer_effect_math')]
+        for test in minority_tests:
+            if rates[-50][test] < 0.95 or rates[0][test] > 0.3:
+                print(f"❌ Poder inesperado para {test}: efeito grande {rates[-50][test]:.2f}, "
+                      f"sem efeito {rates[0][test]:.2f}")
+                return False
+        
+        print("✅ Análise de poder funcionando")
+        print(f"   • Efeito grande: poder {min(rates[-50][test] for test in minority_tests):.2f}")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Erro na análise de poder: {e}")
+        return False
+
+def test_figure_specs():
+    
+    try:
+        import pickle
+        from data_processing.data_processor import create_sample_data
+        from analysis.hypothesis_tester import HypothesisTester
+        from visualization.figure_specs import build_figure_specs
+        
+        sizes = []
+        for n_students in (2000, 50000):
+            sample_data = create_sample_data(n_students)
+            groups = build_figure_specs(sample_data, HypothesisTester(sample_data).run_all_tests())['groups']
+            histogram = groups['histograms']['NOTA_MATEMATICA']
+            
+            if histogram['minority'].sum() != sample_data['MINORIA'].sum():
+                print("❌ Histograma de minorias não contabiliza todos os alunos")
+                return False
+            if groups['boxes']['NOTA_MATEMATICA']['non_minority']['n'] != (~sample_data['MINORIA']).sum():
+                print("❌ Estatísticas de caixa não contabilizam todos os alunos")
+                return False
+            sizes.append(len(pickle.dumps(groups)))
+        
+        if sizes[1] > 20000:
+            print(f"❌ Especificações das figuras crescem com o número de alunos: {sizes}")
+            return False
+        
+        print(f"✅ Especificações das figuras agregadas ({sizes[1]:,} bytes para 50 mil alunos)")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Erro nas especificações das figuras: {e}")
+        return False
+
+def test_scatter_modes():
+    
+    try:
+        from data_processing.data_processor import create_sample_data
+        from analysis.hypothesis_tester import HypothesisTester
+        from visualization.visualizer import Visualizer
+        
+        sample_data = create_sample_data(1000)
+        results = HypothesisTester(sample_data).run_all_tests()
+        expected = {'markers': ('scatter', {'scattergl', 'heatmap', 'contour'}),
+                    'webgl': ('scattergl', {'heatmap', 'contour'}),
+                    'density': ('heatmap', {'scattergl'})}
+        
+        for mode, (required, forbidden) in expected.items():
+            visualizer = Visualizer(sample_data, results, scatter_mode=mode, max_cached_figures=2)
+            trace_types = set()
+            for name in visualizer.available_figures():
+                trace_types.update(trace.type for trace in visualizer.get_figure(name).data)
+            
+            if required not in trace_types or trace_types & forbidden:
+                print(f"❌ Modo {mode} gerou traços inesperados: {sorted(trace_types)}")
+                return False
+            
+            print(f"   • {mode}: {len(visualizer.available_figures())} figuras construídas")
+        
+        print("✅ Modos de dispersão funcionando")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Erro nos modos de dispersão: {e}")
+        return False
+
 def test_reporting():
     
     try:
@@ -109,6 +400,8 @@ def test_reporting():
         from analysis.hypothesis_tester import HypothesisTester
         from reporting.powerpoint_reporter import PowerPointReporter
         
+        sample_data = create_sample_data(1000)
+        results = HypothesisTester(sample_data).run_all_tests()
         
         reporter = PowerPointReporter(sample_data, results)
         presentation = reporter.create_presentation()
@@ -124,6 +417,391 @@ def test_reporting():
         print(f"❌ Erro na geração de relatórios: {e}")
         return False
 
+def test_presentation_charts():
+    
+    try:
+        from pptx.enum.shapes import MSO_SHAPE_TYPE
+        from data_processing.data_processor import create_sample_data
+        from analysis.hypothesis_tester import HypothesisTester
+        from reporting.powerpoint_reporter import PowerPointReporter
+        
+        sample_data = create_sample_data(1000)
+        results = HypothesisTester(sample_data).run_all_tests()
+        
+        presentation = PowerPointReporter(sample_data, results, chart_dpi=50, n_workers=1).create_presentation()
+        charts = sum(shape.shape_type == MSO_SHAPE_TYPE.PICTURE
+                     for slide in presentation.slides for shape in slide.shapes)
+        expected = len(results) + 1
+        
+        if charts != expected:
+            print(f"❌ Apresentação com {charts} gráficos, esperados {expected}")
+            return False
+        
+        print(f"✅ Apresentação com {charts} gráficos em {len(presentation.slides)} slides")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Erro nos gráficos da apresentação: {e}")
+        return False
+
+def test_region_reports():
+    
+    try:
+        from data_processing.data_processor import create_sample_data
+        from analysis.hypothesis_tester import HypothesisTester
+        from reporting.batch_reporter import generate_region_reports, region_slug, RegionReportError
+        
+        if region_slug("São Paulo") != "Sao_Paulo" or region_slug("Goiás / GO") != "Goias_GO":
+            print(f"❌ Nome de arquivo incorreto para região: {region_slug('São Paulo')}")
+            return False
+        
+        sample_data = create_sample_data(600)
+        sample_data['NO_UF'] = ['São Paulo', 'Bahia', 'Ceará'] * 200
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            try:
+                generate_region_reports(sample_data, tmp_dir, regions=['São Paulo', 'Sao Paulo'], n_workers=1)
+                print("❌ Colisão de nomes de arquivo não detectada")
+                return False
+            except ValueError:
+                pass
+            
+            results = HypothesisTester(sample_data).run_all_tests()
+            region_results = {'São Paulo': results, 'Bahia': {'hypothesis_1': {}}, 'Ceará': results}
+            try:
+                generate_region_reports(sample_data, tmp_dir, region_results=region_results, charts=False,
+                                        fmt='markdown', n_workers=1, progress=None)
+                print("❌ Falha regional não foi propagada")
+                return False
+            except RegionReportError as error:
+                if set(error.failures) != {'Bahia'} or set(error.outputs) != {'São Paulo', 'Ceará'}:
+                    print(f"❌ Falhas agregadas incorretas: {list(error.failures)}")
+                    return False
+                if not Path(error.outputs['São Paulo']['presentation']).exists():
+                    print("❌ Relatórios das demais regiões não foram gravados")
+                    return False
+                report_path = Path(error.outputs['Ceará']['report'])
+                if report_path.name != "relatorio_detalhado_Ceara.md" or not report_path.read_text().startswith("# "):
+                    print(f"❌ Relatório regional ignorou o formato solicitado: {report_path.name}")
+                    return False
+        
+        print("✅ Relatórios regionais funcionando")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Erro nos relatórios regionais: {e}")
+        return False
+
+def test_job_scheduler():
+    
+    try:
+        import asyncio
+        from pipeline.scheduler import JobScheduler
+        from pipeline.artifacts import ArtifactGraph
+        
+        async def wait_for_release(release):
+            await release.wait()
+            return 'ok'
+        
+        async def scenario():
+            progress = []
+            scheduler = JobScheduler(cpu_workers=1, io_workers=1, max_pending=2, progress=progress.append)
+            release = asyncio.Event()
+            
+            async with scheduler:
+                await scheduler.submit('a', wait_for_release, release)
+                await scheduler.submit('b', wait_for_release, release)
+                try:
+                    await asyncio.wait_for(scheduler.submit('c', wait_for_release, release), timeout=0.1)
+                    blocked = False
+                except asyncio.TimeoutError:
+                    blocked = True
+                
+                cancelled = scheduler.cancel('b')
+                await scheduler.submit('c', wait_for_release, release)
+                release.set()
+                results, failures = await scheduler.join()
+            
+            return blocked, cancelled, results, failures, progress[-1]
+        
+        blocked, cancelled, results, failures, progress = asyncio.run(scenario())
+        
+        if not blocked:
+            print("❌ Fila aceitou tarefas além de max_pending")
+            return False
+        
+        if cancelled != 1 or failures != {'b': 'cancelada'} or results != {'a': 'ok', 'c': 'ok'}:
+            print(f"❌ Cancelamento incorreto: resultados {results}, falhas {failures}")
+            return False
+        
+        if progress != {'total': 3, 'em_andamento': 0, 'concluidas': 2, 'erros': 0, 'canceladas': 1}:
+            print(f"❌ Progresso incorreto: {progress}")
+            return False
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            order = []
+            base, derived = Path(tmp_dir) / "base.txt", Path(tmp_dir) / "derivado.txt"
+            graph = ArtifactGraph(f"{tmp_dir}/artefatos.json")
+            graph.add('base', [base], lambda: order.append('base') or base.write_text("1"))
+            graph.add('derivado', [derived], lambda: order.append('derivado') or derived.write_text(base.read_text()),
+                      deps=['base'])
+            
+            if graph.build_scheduled(max_pending=1) != ['base', 'derivado'] or order != ['base', 'derivado']:
+                print(f"❌ Artefatos agendados fora de ordem: {order}")
+                return False
+            
+            if graph.build_scheduled() != []:
+                print("❌ Artefatos atualizados foram reconstruídos")
+                return False
+        
+        print("✅ Agendador de tarefas funcionando")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Erro no agendador de tarefas: {e}")
+        return False
+
+def test_multiple_testing_correction():
+    
+    try:
+        import numpy as np
+        from analysis.multiple_testing import adjust_p_values, annotate_results, hypothesis_confirmed
+        
+        p_values = np.array([0.01, 0.04, 0.03, 0.005, np.nan])
+        expected_bh = np.array([0.02, 0.04, 0.04, 0.02, np.nan])
+        expected_holm = np.array([0.03, 0.06, 0.06, 0.02, np.nan])
+        
+        if not np.allclose(adjust_p_values(p_values, 'fdr_bh'), expected_bh, equal_nan=True):
+            print("❌ Correção de Benjamini-Hochberg incorreta")
+            return False
+        
+        if not np.allclose(adjust_p_values(p_values, 'holm'), expected_holm, equal_nan=True):
+            print("❌ Correção de Holm incorreta")
+            return False
+        
+        results = {
+            'hypothesis_1': {'tests': {'a': {'p_value': 0.01, 'significant': True},
+                                       'b': {'p_value': 0.04, 'significant': True},
+                                       'correlation': 0.3}}
+        }
+        annotate_results(results, method='fdr_bh')
+        
+        if results['hypothesis_1']['tests']['b']['p_value_adjusted'] != 0.04:
+            print("❌ Resultados não foram anotados com p-values ajustados")
+            return False
+        
+        corrected = {
+            'hypothesis_1': {'tests': {'a': {'p_value': 0.03, 'significant': True},
+                                       'b': {'p_value': 0.06, 'significant': False},
+                                       'c': {'p_value': 0.09, 'significant': False}}}
+        }
+        annotate_results(corrected, method='holm')
+        
+        if hypothesis_confirmed(corrected['hypothesis_1']) or not hypothesis_confirmed(results['hypothesis_1']):
+            print("❌ Confirmação de hipóteses não usa a significância ajustada")
+            return False
+        
+        from io import StringIO
+        from reporting.report_writer import ReportWriter
+        from visualization.figure_specs import hypothesis_summary
+        
+        stream = StringIO()
+        ReportWriter(stream).test_result('a', corrected['hypothesis_1']['tests']['a'])
+        if not stream.getvalue().startswith("a: NÃO SIGNIFICATIVO (p ajustado (holm) = 0.0900; p = 0.0300)"):
+            print(f"❌ Veredito sem o p ajustado correspondente: {stream.getvalue()!r}")
+            return False
+        
+        corrected['hypothesis_1']['hypothesis'] = 'Corrigida'
+        if hypothesis_summary(corrected)['confirmed'] != [False]:
+            print("❌ Resumo das hipóteses não usa a significância ajustada")
+            return False
+        
+        print("✅ Correção para múltiplos testes funcionando")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Erro na correção para múltiplos testes: {e}")
+        return False
+
+def test_server_hypotheses():
+    
+    try:
+        import asyncio
+        from data_processing.data_processor import DataProcessor, create_sample_data
+        from server.analysis_server import AnalysisServer
+        
+        data_processor = DataProcessor("servidor.xlsx")
+        data_processor.raw_data = create_sample_data(3000)
+        data = data_processor.clean_data()
+        
+        async def request(order):
+            server = AnalysisServer(data)
+            responses = {number: await server.hypothesis(number, ()) for number in order}
+            return responses['2']
+        
+        single_first = asyncio.run(request(['2', 'todas']))
+        all_first = asyncio.run(request(['todas', '2']))
+        
+        if single_first != all_first or 'significant_adjusted' not in single_first['tests']['teacher_quality_difference']:
+            print("❌ Hipótese individual depende da ordem das requisições")
+            return False
+        
+        print("✅ Servidor responde hipóteses individuais com a correção do conjunto completo")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Erro nas hipóteses do servidor: {e}")
+        return False
+
+def test_stage_memory():
+    
+    try:
+        from pipeline.instrumentation import Instrumentation
+        
+        instrumentation = Instrumentation()
+        with instrumentation.measure('pesada'):
+            block = bytearray(128 * 2**20)
+            block[::4096] = b'x' * len(block[::4096])
+            del block
+        with instrumentation.measure('leve'):
+            sum(range(10))
+        
+        summary = instrumentation.summary()
+        heavy = summary['pesada']['rss_growth_bytes']
+        light = summary['leve']['rss_growth_bytes']
+        
+        if heavy is None:
+            if light is not None:
+                print("❌ Sem pico por etapa, o crescimento deveria ser None")
+                return False
+            print("⚠️  Pico por etapa indisponível nesta plataforma")
+            return True
+        
+        if heavy < 100 * 2**20 or light > 16 * 2**20:
+            print(f"❌ Crescimento por etapa incorreto: pesada {heavy / 2**20:.0f} MiB, leve {light / 2**20:.0f} MiB")
+            return False
+        
+        print(f"✅ Memória por etapa: pesada {heavy / 2**20:.0f} MiB, leve {light / 2**20:.0f} MiB")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Erro na medição de memória por etapa: {e}")
+        return False
+
+def run_performance_pipeline(n_students, output_dir):
+    
+    from data_processing.data_processor import DataProcessor, create_sample_data
+    from analysis.hypothesis_tester import HypothesisTester
+    from visualization.visualizer import Visualizer
+    from reporting.powerpoint_reporter import PowerPointReporter
+    from pipeline.instrumentation import INSTRUMENTATION
+    
+    data_processor = DataProcessor("desempenho.xlsx")
+    data_processor.raw_data = create_sample_data(n_students)
+    
+    INSTRUMENTATION.reset()
+    data = data_processor.clean_data()
+    results = HypothesisTester(data).run_all_tests()
+    
+    visualizer = Visualizer(data, results)
+    visualizer.save_all_figures(str(Path(output_dir) / "figures"), mode='shared', combined=True,
+                                names=visualizer.available_figures())
+    
+    reporter = PowerPointReporter(data, results, n_workers=1)
+    reporter.create_presentation()
+    reporter.save_presentation(str(Path(output_dir) / "relatorio.pptx"))
+    reporter.create_detailed_report()
+    
+    return INSTRUMENTATION.summary()
+
+def measure_performance(n_students=PERFORMANCE_STUDENTS, repeat=3):
+    
+    stages = {}
+    
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as output_dir:
+            summary = run_performance_pipeline(n_students, output_dir)
+        
+        for name, entry in summary.items():
+            stage = stages.setdefault(name, {'wall_seconds': entry['wall_seconds'],
+                                             'peak_rss_bytes': entry['peak_rss_bytes'],
+                                             'rss_growth_bytes': entry['rss_growth_bytes']})
+            stage['wall_seconds'] = min(stage['wall_seconds'], entry['wall_seconds'])
+            for field in ('peak_rss_bytes', 'rss_growth_bytes'):
+                if entry[field] is not None:
+                    stage[field] = min(entry[field] if stage[field] is None else stage[field], entry[field])
+    
+    return {
+        'n_students': n_students,
+        'machine': platform.node(),
+        'python': platform.python_version(),
+        'stages': stages
+    }
+
+def compare_performance(baseline, current, threshold, min_seconds=PERFORMANCE_MIN_SECONDS,
+                        min_bytes=PERFORMANCE_MIN_BYTES):
+    
+    regressions = []
+    
+    for name, reference in baseline['stages'].items():
+        stage = current['stages'].get(name)
+        if stage is None:
+            print(f"⚠️  Etapa ausente na execução atual: {name}")
+            continue
+        
+        ratio = stage['wall_seconds'] / reference['wall_seconds'] if reference['wall_seconds'] else 1.0
+        slower = (ratio > 1 + threshold and
+                  stage['wall_seconds'] - reference['wall_seconds'] > min_seconds)
+        
+        growth = stage.get('rss_growth_bytes')
+        reference_growth = reference.get('rss_growth_bytes')
+        memory_ratio = 1.0
+        heavier = False
+        if growth is not None and reference_growth is not None:
+            memory_ratio = growth / reference_growth if reference_growth else 1.0
+            heavier = (memory_ratio > 1 + threshold and growth - reference_growth > min_bytes)
+        
+        status = "❌" if slower or heavier else "✅"
+        print(f"{status} {name}: {stage['wall_seconds']:.3f}s ({ratio:.2f}x), "
+              f"crescimento {(growth or 0) / 2**20:.0f} MiB ({memory_ratio:.2f}x), "
+              f"pico do processo {(stage['peak_rss_bytes'] or 0) / 2**20:.0f} MiB")
+        
+        if slower or heavier:
+            regressions.append(name)
+    
+    return regressions
+
+def check_performance(threshold=0.25, repeat=3, update_baseline=False, baseline_path=PERFORMANCE_BASELINE,
+                      min_seconds=PERFORMANCE_MIN_SECONDS, min_bytes=PERFORMANCE_MIN_BYTES):
+    
+    print("⏱️  TESTE DE DESEMPENHO")
+    print("=" * 60)
+    
+    baseline = None
+    if Path(baseline_path).exists():
+        baseline = json.loads(Path(baseline_path).read_text(encoding='utf-8'))
+    
+    n_students = baseline['n_students'] if baseline and not update_baseline else PERFORMANCE_STUDENTS
+    current = measure_performance(n_students, repeat)
+    
+    if update_baseline or baseline is None:
+        Path(baseline_path).parent.mkdir(parents=True, exist_ok=True)
+        Path(baseline_path).write_text(json.dumps(current, indent=2, sort_keys=True) + "\n", encoding='utf-8')
+        print(f"✅ Referência de desempenho gravada em {baseline_path}")
+        return True
+    
+    if baseline['machine'] != current['machine']:
+        print(f"⚠️  Referência gravada em outra máquina ({baseline['machine']}); compare com cautela")
+    
+    regressions = compare_performance(baseline, current, threshold, min_seconds, min_bytes)
+    
+    if regressions:
+        print(f"\n❌ {len(regressions)} etapa(s) acima do limite de {threshold:.0%}: {', '.join(regressions)}")
+        return False
+    
+    print(f"\n🎉 Nenhuma etapa regrediu mais de {threshold:.0%}")
+    return True
+
 def main():
     
     print("🧪 TESTANDO PROJETO DE ANÁLISE DE EQUIDADE EDUCACIONAL")
@@ -133,8 +811,20 @@ def main():
         ("Importação de Módulos", test_imports),
         ("Processamento de Dados", test_data_processing),
         ("Testes de Hipóteses", test_hypothesis_testing),
+        ("Cache de Resultados", test_result_cache),
+        ("Precisão do Modo Compacto", test_compact_precision),
+        ("Testes Incrementais", test_incremental_parity),
+        ("Análise de Poder", test_power_analysis),
         ("Criação de Visualizações", test_visualization),
-        ("Geração de Relatórios", test_reporting)
+        ("Especificações das Figuras", test_figure_specs),
+        ("Modos de Dispersão", test_scatter_modes),
+        ("Geração de Relatórios", test_reporting),
+        ("Gráficos da Apresentação", test_presentation_charts),
+        ("Relatórios Regionais", test_region_reports),
+        ("Agendador de Tarefas", test_job_scheduler),
+        ("Correção para Múltiplos Testes", test_multiple_testing_correction),
+        ("Hipóteses do Servidor", test_server_hypotheses),
+        ("Memória por Etapa", test_stage_memory)
     ]
     
     passed = 0
@@ -164,4 +854,24 @@ def main():
     return passed == total
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Testes do projeto de análise de equidade educacional")
+    parser.add_argument('--desempenho', action='store_true',
+                        help="Compara tempo e memória de cada etapa com a referência gravada")
+    parser.add_argument('--limite', type=float, default=25.0,
+                        help="Aumento percentual tolerado antes de acusar regressão (padrão: 25)")
+    parser.add_argument('--minimo-ms', type=float, default=PERFORMANCE_MIN_SECONDS * 1000,
+                        help="Diferença mínima de tempo, em ms, para acusar regressão (padrão: %(default)g)")
+    parser.add_argument('--minimo-mib', type=float, default=PERFORMANCE_MIN_BYTES / 2**20,
+                        help="Diferença mínima de memória, em MiB, para acusar regressão (padrão: %(default)g)")
+    parser.add_argument('--repeticoes', type=int, default=3,
+                        help="Execuções do pipeline; usa o melhor tempo de cada etapa")
+    parser.add_argument('--atualizar-referencia', action='store_true',
+                        help="Grava a execução atual como nova referência de desempenho")
+    args = parser.parse_args()
+    
+    if args.desempenho or args.atualizar_referencia:
+        sys.exit(0 if check_performance(args.limite / 100, args.repeticoes, args.atualizar_referencia,
+                                            min_seconds=args.minimo_ms / 1000,
+                                            min_bytes=int(args.minimo_mib * 2**20)) else 1)
+    
     main()